@@ -3,17 +3,53 @@ a user to control outlets and banks and request information from the PDU.
 """
 
 # Core dependencies
+from array import array
+import asyncio
+from collections.abc import AsyncIterator, Callable, Mapping, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
 from enum import Enum
 import logging
-from typing import override
+import math
+import time
+from typing import Any, override
 
 # Package dependencies
-from puresnmp import V2C, Client, PyWrapper  # type: ignore[import-not-found]
-from puresnmp.types import Integer  # type: ignore[import-not-found]
+from puresnmp.exc import SnmpError, Timeout  # type: ignore[import-not-found]
+
+# Project dependencies
+from cyberpower_pdu.ber import OID, encode_oid
+from cyberpower_pdu.cache import OutletStateCache
+from cyberpower_pdu.circuit_breaker import CircuitBreaker, CircuitBreakerPolicy
+from cyberpower_pdu.metadata import DeviceMetadata, MetadataCache
+from cyberpower_pdu.oids import (
+    BANK_COUNT_OID,
+    BANK_LOAD_OID,
+    FIRMWARE_OID,
+    MODEL_OID,
+    OUTLET_COMMAND_OID,
+    OUTLET_COUNT_OID,
+    OUTLET_CURRENT_OID,
+    OUTLET_ENERGY_OID,
+    OUTLET_NAME_OID,
+    OUTLET_POWER_OID,
+    OUTLET_STATE_OID,
+    SERIAL_NUMBER_OID,
+)
+from cyberpower_pdu.outlet_states import OutletStates
+from cyberpower_pdu.retry import RetryPolicy, RTTEstimator
+from cyberpower_pdu.scheduler import Priority, RequestScheduler, request_priority
+from cyberpower_pdu.single_flight import SingleFlight
+from cyberpower_pdu.snmp import PuresnmpClient, RawSNMPClient, SNMPClient
+from cyberpower_pdu.transport import SNMPTransport
 
 
 logger = logging.getLogger("CyberPowerPDU")
 
+SNMP_COMMUNITY = "private"
+"""The SNMPv2c community used for both reading and writing values on the PDU"""
+
 
 ############################################################
 #### Data types ############################################
@@ -36,6 +72,66 @@ class OutletCommand(Enum):
     """
 
 
+class OutletQueryMode(Enum):
+    """Selects how the hardware PDU requests the state of all outlets"""
+
+    PER_OUTLET = 1
+    """Sends a GET request for each outlet. This is the slowest mode but works with any agent."""
+
+    MULTI_GET = 2
+    """Packs the outlets' OIDs as varbinds into as few GET requests as the agent's maximum message
+    size allows
+    """
+
+    BULK = 3
+    """Reads the whole outlet state column with SNMPv2c GETBULK requests. This does not require the
+    number of outlets to be known and the number of requests does not grow with the number of
+    outlets until the responses exceed the agent's maximum message size.
+    """
+
+
+class SNMPStack(Enum):
+    """Selects the SNMP client the hardware PDU uses to encode and decode its requests"""
+
+    PURESNMP = 1
+    """Uses puresnmp's generic SNMP client"""
+
+    RAW = 2
+    """Uses the package's minimal SNMP client, which only encodes and decodes the requests the
+    library sends and uses less CPU per request than puresnmp
+    """
+
+
+@dataclass(frozen=True)
+class OutletChange:
+    """A change of an outlet's state seen by `CyberPowerPDU.watch_outlets`"""
+
+    outlet: int
+    """The outlet number, which starts at 1"""
+
+    state: bool
+    """The new state of the outlet. `True` means the outlet is enabled."""
+
+    timestamp: datetime
+    """When the outlet states that showed the change were received, in UTC"""
+
+
+@dataclass(frozen=True)
+class OutletMetrics:
+    """The metering of all outlets of a metered-by-outlet PDU. Each array is indexed by outlet,
+    where index 0 corresponds to outlet 1, and outlets that the PDU doesn't meter are `nan`.
+    """
+
+    current: array[float]
+    """The current drawn by each outlet, in amps"""
+
+    power: array[float]
+    """The active power drawn by each outlet, in watts"""
+
+    energy: array[float]
+    """The energy consumed by each outlet since its meter was last reset, in kilowatt hours"""
+
+
 ############################################################
 #### Main class-based API ##################################
 ############################################################
@@ -46,50 +142,362 @@ class CyberPowerPDU:
     interface for both a simulation and hardware implementation.
     """
 
-    def __init__(self, ip_address: str, port: int = 161, simulate: bool = False) -> None:
+    def __init__(
+        self,
+        ip_address: str,
+        port: int = 161,
+        simulate: bool = False,
+        max_message_size: int = 484,
+        outlet_query_mode: OutletQueryMode = OutletQueryMode.MULTI_GET,
+        max_repetitions: int | None = None,
+        max_concurrent_requests: int = 4,
+        cache_ttl: float | None = None,
+        snmp_stack: SNMPStack = SNMPStack.PURESNMP,
+        retry_policy: RetryPolicy | None = None,
+        max_requests_per_second: float | None = None,
+        circuit_breaker_policy: CircuitBreakerPolicy | None = None,
+        metadata_cache: MetadataCache | None = None,
+    ) -> None:
         """Initializes the `CyberPowerPDU` object. If `simulate` is `True`, then the hardware is
-        not connected to and is instead simulated.
+        not connected to and is instead simulated. `max_message_size` is the largest SNMP message,
+        in bytes, that the PDU's SNMP agent accepts and is used to size batched requests.
+        `outlet_query_mode` selects how the state of all outlets is requested, and
+        `max_repetitions` overrides the GETBULK max-repetitions value of the `BULK` mode.
+        `max_concurrent_requests` limits how many SNMP requests can be outstanding to the PDU at
+        once, and `max_requests_per_second`, if given, limits how fast requests are started. Outlet
+        commands are sent ahead of waiting reads, and reads made under
+        `request_priority(Priority.BACKGROUND)` wait for all other requests. If `cache_ttl` is
+        given, outlet states are cached for that many seconds, so that repeated reads within that
+        time do not send requests to the PDU. `snmp_stack` selects the SNMP client used to talk to
+        the PDU. If `retry_policy` is given, the timeouts and retries of requests adapt to the PDU's
+        measured round trip time instead of using puresnmp's fixed defaults. If
+        `circuit_breaker_policy` is given, requests fail immediately with a `CircuitOpenError` once
+        the PDU has stopped answering, until a probe request succeeds. If `metadata_cache` is given,
+        `initialize` loads the PDU's metadata from it instead of querying the PDU, and refreshes
+        expired metadata in the background.
         """
         # Note: Port 161 is the default SNMP port
         self.__session: CyberPowerPDU
+        self.__address = None if simulate else (ip_address, port)
+        self.__cache = OutletStateCache(cache_ttl) if cache_ttl is not None else None
+        self.__rtt_estimator = RTTEstimator(retry_policy) if retry_policy is not None else None
+        self.__circuit_breaker = (
+            CircuitBreaker(circuit_breaker_policy) if circuit_breaker_policy is not None else None
+        )
 
         if simulate:
             self.__session = CyberPowerPDUSimulation()
         else:
-            self.__session = CyberPowerPDUHardware(ip_address=ip_address, port=port)
+            self.__session = CyberPowerPDUHardware(
+                ip_address=ip_address,
+                port=port,
+                max_message_size=max_message_size,
+                outlet_query_mode=outlet_query_mode,
+                max_repetitions=max_repetitions,
+                max_concurrent_requests=max_concurrent_requests,
+                snmp_stack=snmp_stack,
+                rtt_estimator=self.__rtt_estimator,
+                max_requests_per_second=max_requests_per_second,
+                circuit_breaker=self.__circuit_breaker,
+                metadata_cache=metadata_cache,
+            )
 
     @property
     def number_of_outlets(self) -> int:
         """The total number of controllable outlets on the PDU"""
         return self.__session.number_of_outlets
 
+    @property
+    def number_of_banks(self) -> int:
+        """The number of banks on the PDU. Each bank is a group of outlets fed by an independent
+        power supply.
+        """
+        return self.__session.number_of_banks
+
+    @property
+    def address(self) -> tuple[str, int] | None:
+        """The IP address and port of the PDU's SNMP agent, or `None` if the PDU is simulated"""
+        return self.__address
+
+    @property
+    def cache(self) -> OutletStateCache | None:
+        """The outlet state cache, or `None` if caching is disabled"""
+        return self.__cache
+
+    @property
+    def rtt_estimator(self) -> RTTEstimator | None:
+        """The round trip time estimator that adapts the timeouts of the PDU's requests and counts
+        its requests, retransmissions, and timeouts, or `None` if no retry policy was given
+        """
+        return self.__rtt_estimator
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """The circuit breaker that fails requests fast while the PDU is not answering, or `None`
+        if no circuit breaker policy was given
+        """
+        return self.__circuit_breaker
+
+    @property
+    def scheduler(self) -> RequestScheduler | None:
+        """The scheduler that limits and orders the PDU's requests, or `None` if the PDU is
+        simulated
+        """
+        if isinstance(self.__session, CyberPowerPDUHardware):
+            return self.__session.scheduler
+        return None
+
+    @property
+    def metadata(self) -> DeviceMetadata | None:
+        """The PDU's model, firmware, outlet names, and counts, which are read or loaded by
+        `initialize` when a metadata cache is used, or `None` otherwise
+        """
+        if isinstance(self.__session, CyberPowerPDUHardware):
+            return self.__session.metadata
+        return None
+
     async def initialize(self) -> None:
         """Initializes the connection to the PDU"""
+        if self.__cache is not None:
+            self.__cache.invalidate()
+
         await self.__session.initialize()
 
     async def close(self) -> None:
         """Closes the connection to the PDU"""
+        if self.__cache is not None:
+            self.__cache.invalidate()
+
         await self.__session.close()
 
-    async def get_all_outlet_states(self) -> list[bool]:
-        """Get the state of all outlets. Each index of the returned list corresponds to an outlet.
-        The index is one less than the outlet number. For example, index 0 corresponds to outlet 1.
-        `True` means the outlet is enabled. `False` means the outlet is disabled.
+    async def get_all_outlet_states(self) -> OutletStates:
+        """Get the state of all outlets as an immutable `OutletStates`, which can be indexed and
+        iterated like a list. The index is one less than the outlet number. For example, index 0
+        corresponds to outlet 1. `True` means the outlet is enabled. `False` means the outlet is
+        disabled.
         """
-        return await self.__session.get_all_outlet_states()
+        if self.__cache is None:
+            return await self.__session.get_all_outlet_states()
+
+        cached_states = self.__cache.get_all(self.__session.number_of_outlets)
+        if cached_states is not None:
+            return OutletStates.from_states(cached_states)
+
+        outlet_states = await self.__session.get_all_outlet_states()
+        self.__cache.set_all(outlet_states)
+        return outlet_states
+
+    async def refresh_all_outlet_states(self) -> OutletStates:
+        """Get the state of all outlets from the PDU, like `get_all_outlet_states`, but bypass the
+        cache and refresh it with the states that were read. Pollers use this so that each poll
+        sees the PDU's actual states, however long the cache's TTL is.
+        """
+        outlet_states = await self.__session.get_all_outlet_states()
+        if self.__cache is not None:
+            self.__cache.set_all(outlet_states)
+
+        return outlet_states
 
     async def get_outlet_state(self, outlet: int) -> bool:
         """Get the outlet's state. `True` means the outlet is enabled. `False` means that the
         outlet is disabled. The outlet number should range between 1 and the total number of
         outlets on the PDU.
         """
-        return await self.__session.get_outlet_state(outlet)
+        if self.__cache is None:
+            return await self.__session.get_outlet_state(outlet)
+
+        state = self.__cache.get(outlet)
+        if state is None:
+            state = await self.__session.get_outlet_state(outlet)
+            self.__cache.set(outlet, state)
+
+        return state
+
+    async def get_bank_load(self, bank: int) -> float:
+        """Get the bank's load in amps. The bank number should range between 1 and the number of
+        banks on the PDU.
+        """
+        return await self.__session.get_bank_load(bank)
+
+    async def get_all_bank_loads(self) -> list[float]:
+        """Get the load of all banks in amps. Each index of the returned list corresponds to a bank.
+        The index is one less than the bank number. The hardware PDU reads every bank in a single
+        SNMP request.
+        """
+        return await self.__session.get_all_bank_loads()
+
+    async def get_outlet_metrics(self) -> OutletMetrics:
+        """Get the current, power, and energy of all outlets. This requires a PDU that meters each
+        outlet. The hardware PDU reads all three columns for every outlet with GETBULK requests,
+        which is a single request when the PDU's maximum message size allows.
+        """
+        return await self.__session.get_outlet_metrics()
 
     async def send_outlet_command(self, outlet: int, command: OutletCommand) -> None:
         """Send a command to the outlet. The outlet number should range between 1 and the total
         number of outlets on the PDU.
         """
+        if self.__cache is None:
+            await self.__session.send_outlet_command(outlet, command)
+            return
+
+        # The cached state is dropped before sending so that a failed command can't leave a stale
+        # state behind, and is then optimistically updated to the state the command leads to
+        self.__cache.invalidate(outlet)
         await self.__session.send_outlet_command(outlet, command)
+        self.__update_cache(outlet, command)
+
+    async def send_outlet_commands(self, commands: Mapping[int, OutletCommand]) -> None:
+        """Send a command to each of several outlets at once. `commands` maps outlet numbers to the
+        command for that outlet. The hardware PDU packs the commands into as few SNMP SET requests
+        as possible, so commanding every outlet of a PDU takes a single round trip.
+        """
+        if self.__cache is None:
+            await self.__session.send_outlet_commands(commands)
+            return
+
+        for outlet in commands:
+            self.__cache.invalidate(outlet)
+
+        await self.__session.send_outlet_commands(commands)
+
+        for outlet, command in commands.items():
+            self.__update_cache(outlet, command)
+
+    async def watch_outlets(
+        self, interval: float = 1.0, reconciliation_interval: float | None = None
+    ) -> AsyncIterator[OutletChange]:
+        """Polls the state of all outlets every `interval` seconds and yields an `OutletChange` for
+        each outlet whose state differs from the previous poll. The first poll only sets the states
+        that later polls are compared against. A poll that fails with an SNMP error, a timeout, or
+        a network error is logged and skipped, so a PDU that stops responding for a while does not
+        end the stream. Any other error is raised.
+
+        Changes published with `publish_outlet_changes`, such as by a `TrapReceiver`, are yielded
+        as soon as they are published. If `reconciliation_interval` is given, the PDU is then only
+        polled every `reconciliation_interval` seconds to catch changes whose trap was lost, and a
+        poll that finds such a change returns to polling every `interval` seconds.
+
+        ```python
+        async for change in pdu.watch_outlets(interval=0.5):
+            print(f"Outlet {change.outlet} turned {'on' if change.state else 'off'}")
+        ```
+        """
+        loop = asyncio.get_running_loop()
+        previous_states: OutletStates | None = None
+        next_poll_time = loop.time()
+
+        # Published changes are queued until the stream is waiting for its next poll
+        published: asyncio.Queue[Sequence[OutletChange]] = asyncio.Queue()
+        listener = published.put_nowait
+        is_published = False
+
+        self.add_outlet_change_listener(listener)
+        try:
+            while True:
+                try:
+                    # The stream should see the PDU's actual states, so the cache is bypassed. The
+                    # polls are background requests, so they don't hold up the caller's commands.
+                    with request_priority(Priority.BACKGROUND):
+                        outlet_states = await self.refresh_all_outlet_states()
+                except (SnmpError, TimeoutError, OSError) as exception:
+                    logger.warning(f"Polling the outlet states failed: {exception!r}")
+                else:
+                    timestamp = datetime.now(timezone.utc)
+
+                    # The changed outlets are the bits that differ from the previous states, which
+                    # include the published changes, so these are changes that weren't published
+                    if previous_states is not None and len(previous_states) == len(outlet_states):
+                        changed_outlets = outlet_states.changed_outlets(previous_states)
+                        if changed_outlets:
+                            is_published = False
+
+                        for outlet in changed_outlets:
+                            yield OutletChange(
+                                outlet=outlet, state=outlet_states[outlet - 1], timestamp=timestamp
+                            )
+
+                    previous_states = outlet_states
+
+                # Polls are scheduled at a fixed rate, so slow polls and consumers don't make the
+                # schedule drift. Polls that were missed entirely are skipped.
+                if is_published and reconciliation_interval is not None:
+                    next_poll_time += reconciliation_interval
+                else:
+                    next_poll_time += interval
+                if next_poll_time < loop.time():
+                    next_poll_time = loop.time()
+
+                while (delay := next_poll_time - loop.time()) > 0:
+                    try:
+                        changes = await asyncio.wait_for(published.get(), delay)
+                    except TimeoutError:
+                        break
+
+                    is_published = True
+                    for change in changes:
+                        # Changes are only yielded once the first poll has set the states, and
+                        # only if they change them
+                        if (
+                            previous_states is not None
+                            and 0 < change.outlet <= len(previous_states)
+                            and previous_states[change.outlet - 1] != change.state
+                        ):
+                            previous_states = previous_states.replace(change.outlet, change.state)
+                            yield change
+        finally:
+            self.remove_outlet_change_listener(listener)
+
+    def publish_outlet_changes(self, changes: Sequence[OutletChange]) -> None:
+        """Publishes outlet changes that were learned without polling the PDU, such as from SNMP
+        traps. The changes update the outlet state cache and are passed to every running
+        `watch_outlets` stream and `OutletPoller` of the PDU.
+        """
+        cache = self.cache
+        if cache is not None:
+            for change in changes:
+                cache.set(change.outlet, change.state)
+
+        for listener in list(self.__get_change_listeners()):
+            listener(changes)
+
+    def add_outlet_change_listener(
+        self, listener: Callable[[Sequence[OutletChange]], None]
+    ) -> None:
+        """Calls the listener with the changes of every later `publish_outlet_changes` call"""
+        self.__get_change_listeners().add(listener)
+
+    def remove_outlet_change_listener(
+        self, listener: Callable[[Sequence[OutletChange]], None]
+    ) -> None:
+        """Stops calling the listener with published changes"""
+        self.__get_change_listeners().discard(listener)
+
+    def __get_change_listeners(self) -> set[Callable[[Sequence[OutletChange]], None]]:
+        """Returns the listeners of published outlet changes. The backends don't call this class's
+        `__init__`, so the set is created on first use.
+        """
+        try:
+            return self.__change_listeners
+        except AttributeError:
+            self.__change_listeners: set[Callable[[Sequence[OutletChange]], None]] = set()
+            return self.__change_listeners
+
+    def __update_cache(self, outlet: int, command: OutletCommand) -> None:
+        """Caches the state that the command sent to the outlet leads to"""
+        assert self.__cache is not None
+
+        match command:
+            case OutletCommand.IMMEDIATE_ON:
+                self.__cache.set(outlet, True)
+
+            case OutletCommand.IMMEDIATE_OFF:
+                self.__cache.set(outlet, False)
+
+            case OutletCommand.IMMEDIATE_REBOOT:
+                # The outlet is off for a configurable amount of time and then back on, so the
+                # state isn't known until it is read again
+                pass
 
 
 ############################################################
@@ -97,13 +505,35 @@ class CyberPowerPDU:
 ############################################################
 
 
+# The simulated outlets draw their current at a typical North American line voltage and the power
+# factor of a server power supply
+_SIMULATED_VOLTAGE = 120.0
+_SIMULATED_POWER_FACTOR = 0.95
+
+
 class CyberPowerPDUSimulation(CyberPowerPDU):
     """A simulated PDU class primarily intended to enable GUI development without actual hardware"""
 
-    def __init__(self) -> None:
+    def __init__(
+        self, number_of_outlets: int = 16, number_of_banks: int = 2, outlet_load: float = 0.5
+    ) -> None:
+        """Initializes the simulation. The banks take consecutive outlets, the number of outlets
+        divided by the number of banks rounded up, with the last bank taking the rest. Each outlet
+        that is on draws `outlet_load` amps from its bank at 120 volts and a power factor of 0.95.
+        """
+        # The number of outlets and banks isn't reported until `initialize` is called, just like
+        # the hardware
+        self.__simulated_number_of_outlets = number_of_outlets
+        self.__simulated_number_of_banks = number_of_banks
+        self.__outlet_load = outlet_load
         self.__number_of_outlets: int = 0
+        self.__number_of_banks: int = 0
         self.__outlet_states: list[bool] = []
 
+        # The energy meters accumulate the outlets' power between state changes
+        self.__outlet_energy: list[float] = []
+        self.__energy_update_time = 0.0
+
     @property
     def number_of_outlets(self) -> int:
         if self.__number_of_outlets == 0:
@@ -112,10 +542,36 @@ class CyberPowerPDUSimulation(CyberPowerPDU):
             )
         return self.__number_of_outlets
 
+    @property
+    def number_of_banks(self) -> int:
+        if self.__number_of_outlets == 0:
+            raise RuntimeError(
+                "The `initialize` must be called to populate the `number_of_banks` property"
+            )
+        return self.__number_of_banks
+
+    @property
+    def address(self) -> tuple[str, int] | None:
+        """The simulation isn't reached over the network, so it has no address"""
+        return None
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """The simulation always answers, so it has no circuit breaker"""
+        return None
+
+    @property
+    def cache(self) -> OutletStateCache | None:
+        """The simulation's states are read from memory, so it has no cache"""
+        return None
+
     @override
     async def initialize(self) -> None:
-        self.__number_of_outlets = 16
+        self.__number_of_outlets = self.__simulated_number_of_outlets
+        self.__number_of_banks = self.__simulated_number_of_banks
         self.__outlet_states = [False] * self.__number_of_outlets
+        self.__outlet_energy = [0.0] * self.__number_of_outlets
+        self.__energy_update_time = time.monotonic()
         logger.info("Simulated initialization complete")
 
     @override
@@ -124,15 +580,59 @@ class CyberPowerPDUSimulation(CyberPowerPDU):
         pass
 
     @override
-    async def get_all_outlet_states(self) -> list[bool]:
-        return self.__outlet_states
+    async def get_all_outlet_states(self) -> OutletStates:
+        # A snapshot is returned so that later commands don't change the caller's states
+        return OutletStates.from_states(self.__outlet_states)
+
+    @override
+    async def refresh_all_outlet_states(self) -> OutletStates:
+        # The simulation has no cache to bypass
+        return await self.get_all_outlet_states()
 
     @override
     async def get_outlet_state(self, outlet: int) -> bool:
+        self.__check_outlet(outlet)
         return self.__outlet_states[outlet - 1]
 
+    @override
+    async def get_bank_load(self, bank: int) -> float:
+        if not 0 < bank <= self.number_of_banks:
+            raise ValueError(
+                f"Invalid bank value of: {bank}. Valid bank values are 1 to {self.number_of_banks}"
+            )
+
+        # The banks take consecutive outlets, rounding the outlets per bank up, so when the outlets
+        # don't divide evenly, the earlier banks get the extra outlets and the last bank has fewer
+        outlets_per_bank = -(-self.number_of_outlets // self.number_of_banks)
+        bank_states = self.__outlet_states[(bank - 1) * outlets_per_bank : bank * outlets_per_bank]
+
+        # Like the hardware, the load is reported in tenths of amps
+        return round(10 * self.__outlet_load * sum(bank_states)) / 10.0
+
+    @override
+    async def get_all_bank_loads(self) -> list[float]:
+        return [await self.get_bank_load(bank) for bank in range(1, self.number_of_banks + 1)]
+
+    @override
+    async def get_outlet_metrics(self) -> OutletMetrics:
+        self.__update_energy()
+
+        current = array("d", (self.__get_outlet_current(outlet) for outlet in self.__outlets()))
+        return OutletMetrics(
+            current=current,
+            power=array(
+                "d", (amps * _SIMULATED_VOLTAGE * _SIMULATED_POWER_FACTOR for amps in current)
+            ),
+            energy=array("d", self.__outlet_energy),
+        )
+
     @override
     async def send_outlet_command(self, outlet: int, command: OutletCommand) -> None:
+        self.__check_outlet(outlet)
+
+        # The energy used in the outlet's previous state is accounted for before it changes
+        self.__update_energy()
+
         match command:
             case OutletCommand.IMMEDIATE_ON:
                 logger.info(f"Simulated outlet {outlet} turned on")
@@ -146,26 +646,117 @@ class CyberPowerPDUSimulation(CyberPowerPDU):
                 logger.info(f"Simulated outlet {outlet} rebooted")
                 self.__outlet_states[outlet - 1] = True
 
+    @override
+    async def send_outlet_commands(self, commands: Mapping[int, OutletCommand]) -> None:
+        # Like the hardware, every outlet is checked before any command is applied, so an invalid
+        # outlet doesn't leave the commands half applied
+        for outlet in commands:
+            self.__check_outlet(outlet)
+
+        for outlet, command in commands.items():
+            await self.send_outlet_command(outlet, command)
+
+    def __outlets(self) -> range:
+        """Returns the outlet numbers"""
+        return range(1, self.number_of_outlets + 1)
+
+    def __check_outlet(self, outlet: int) -> None:
+        """Raises a `ValueError` if the outlet is out of range"""
+        if not 0 < outlet <= self.number_of_outlets:
+            raise ValueError(
+                f"Invalid outlet value of: {outlet}. Valid outlet values "
+                f"are 1 to {self.number_of_outlets}"
+            )
+
+    def __get_outlet_current(self, outlet: int) -> float:
+        """Returns the current, in amps, drawn by the outlet"""
+        return self.__outlet_load if self.__outlet_states[outlet - 1] else 0.0
+
+    def __update_energy(self) -> None:
+        """Adds the energy used by each outlet since the last update to its energy meter"""
+        now = time.monotonic()
+        hours = (now - self.__energy_update_time) / 3600
+        self.__energy_update_time = now
+
+        for outlet in self.__outlets():
+            watts = self.__get_outlet_current(outlet) * _SIMULATED_VOLTAGE * _SIMULATED_POWER_FACTOR
+            self.__outlet_energy[outlet - 1] += watts * hours / 1000
+
 
 ############################################################
 #### Hardware PDU ##########################################
 ############################################################
 
 
+# Outlet names are display strings of at most 32 characters
+_MAX_OUTLET_NAME_SIZE = 32
+
+
 class CyberPowerPDUHardware(CyberPowerPDU):
     """An interface for interacting with a CyberPower PDU unit. After initialization, the PDU
     automatically handles out of index bank and outlet handling, generating exceptions if a bank
     or outlet was targeted that is out of range of the number of banks or outlets on the PDU.
     """
 
-    def __init__(self, ip_address: str, port: int = 161) -> None:
+    def __init__(
+        self,
+        ip_address: str,
+        port: int = 161,
+        max_message_size: int = 484,
+        outlet_query_mode: OutletQueryMode = OutletQueryMode.MULTI_GET,
+        max_repetitions: int | None = None,
+        max_concurrent_requests: int = 4,
+        snmp_stack: SNMPStack = SNMPStack.PURESNMP,
+        rtt_estimator: RTTEstimator | None = None,
+        max_requests_per_second: float | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        metadata_cache: MetadataCache | None = None,
+    ) -> None:
+        # Every SNMP agent is required to accept messages of at least 484 bytes (RFC 3417), so
+        # this is used as the default when packing several varbinds into a single request
         self.__ip_address = ip_address
+        self.__port = port
+        self.__max_message_size = max_message_size
+        self.__outlet_query_mode = outlet_query_mode
+        self.__max_repetitions = max_repetitions
+        self.__snmp_stack = snmp_stack
+
+        # The estimator outlives the transports, so the round trip time is kept across reconnects
+        self.__rtt_estimator = rtt_estimator
+
+        # Limits the number and rate of requests outstanding to the PDU, since the PDU's SNMP
+        # agent is a small embedded device that should not be flooded with requests, and hands
+        # out requests by priority so that outlet commands don't queue behind telemetry reads
+        self.__scheduler = RequestScheduler(max_concurrent_requests, max_requests_per_second)
+
+        # Like the estimator, the breaker outlives the transports, so that reconnecting to a dead
+        # PDU fails fast as well
+        self.__circuit_breaker = circuit_breaker
+
+        # Concurrent reads of the same OIDs share a single request to the PDU
+        self.__reads_in_flight: SingleFlight[tuple[Any, ...], Any] = SingleFlight()
+
+        # With a metadata cache, the metadata is loaded from the cache when it is available, and
+        # expired metadata is refreshed by a background task
+        self.__metadata_cache = metadata_cache
+        self.__metadata: DeviceMetadata | None = None
+        self.__metadata_refresh: asyncio.Task[None] | None = None
 
         # These aren't initialized until `initialize` is called
         self.__number_of_outlets: int = 0
+        self.__number_of_banks: int = 0
+        self.__outlet_state_oids: list[OID] = []
+        self.__outlet_command_oids: list[OID] = []
+        self.__bank_load_oids: list[OID] = []
+        self.__outlet_state_batches: list[list[OID]] = []
+        self.__bank_load_batches: list[list[OID]] = []
+
+        # Every request to the PDU is sent over this single UDP transport, which is opened in
+        # `initialize` and closed in `close`
+        self.__transport = SNMPTransport(rtt_estimator)
 
         # This is initialized in the `initialize` method
-        self.__client: PyWrapper
+        self.__client: SNMPClient
 
     ############################################################
     #### Properties ############################################
@@ -180,6 +771,40 @@ class CyberPowerPDUHardware(CyberPowerPDU):
             )
         return self.__number_of_outlets
 
+    @property
+    def number_of_banks(self) -> int:
+        """The number of banks on the PDU"""
+        if self.__number_of_outlets == 0:
+            raise RuntimeError(
+                "The `initialize` must be called to populate the `number_of_banks` property"
+            )
+        return self.__number_of_banks
+
+    @property
+    def address(self) -> tuple[str, int] | None:
+        """The IP address and port of the PDU's SNMP agent"""
+        return (self.__ip_address, self.__port)
+
+    @property
+    def circuit_breaker(self) -> CircuitBreaker | None:
+        """The circuit breaker of the PDU's requests, or `None` if requests are always sent"""
+        return self.__circuit_breaker
+
+    @property
+    def cache(self) -> OutletStateCache | None:
+        """The outlet state cache is kept by `CyberPowerPDU`, so the backend has none"""
+        return None
+
+    @property
+    def scheduler(self) -> RequestScheduler:
+        """The scheduler that limits and orders the requests to the PDU"""
+        return self.__scheduler
+
+    @property
+    def metadata(self) -> DeviceMetadata | None:
+        """The PDU's metadata, or `None` if no metadata cache is used"""
+        return self.__metadata
+
     ############################################################
     #### Override methods ######################################
     ############################################################
@@ -188,83 +813,487 @@ class CyberPowerPDUHardware(CyberPowerPDU):
     async def initialize(self) -> None:
         """Initializes communication to the PDU"""
 
-        self.__client = PyWrapper(
-            Client(ip=self.__ip_address, port=161, credentials=V2C("private"))
-        )
+        # Initializing again reconnects to the PDU
+        await self.__cancel_metadata_refresh()
+        await self.__transport.close()
+        self.__transport = SNMPTransport(self.__rtt_estimator)
+        await self.__transport.open(self.__ip_address, self.__port)
+
+        match self.__snmp_stack:
+            case SNMPStack.PURESNMP:
+                self.__client = PuresnmpClient(
+                    self.__ip_address, self.__port, self.__transport, SNMP_COMMUNITY
+                )
+
+            case SNMPStack.RAW:
+                self.__client = RawSNMPClient(self.__transport, SNMP_COMMUNITY)
+
+        # Opening the transport sends nothing, so a PDU whose metadata is cached is initialized
+        # without any network I/O. Expired metadata is used as well, while it is refreshed.
+        if self.__metadata_cache is not None:
+            cached = self.__metadata_cache.load(self.__ip_address, self.__port)
+            if cached is not None:
+                logger.debug(f"Loaded the metadata cached {cached.age:.0f} seconds ago")
+                self.__set_metadata(cached.metadata)
+                if cached.expired:
+                    self.__metadata_refresh = asyncio.create_task(self.__refresh_metadata())
+                return
+
+            metadata = await self.__get_metadata()
+            self.__metadata_cache.store(self.__ip_address, self.__port, metadata)
+            self.__set_metadata(metadata)
+            return
 
         # Grab the number of banks and outlets so that when these are passed in as indices, they
         # can be checked if they are within range or not
-        self.__number_of_outlets = await self.__get_number_of_outlets()
-        logger.debug(f"Successfully connected to {self.__number_of_outlets} outlets")
+        self.__set_counts(*await self.__get_number_of_outlets_and_banks())
 
     @override
     async def close(self) -> None:
-        # There is no close needed for SNMP. This override is here to be explicit.
         logger.debug("Closing connection")
+        await self.__cancel_metadata_refresh()
+        await self.__transport.close()
 
     @override
-    async def get_all_outlet_states(self) -> list[bool]:
-        return [
-            await self.get_outlet_state(outlet) for outlet in range(1, self.number_of_outlets + 1)
-        ]
+    async def refresh_all_outlet_states(self) -> OutletStates:
+        # The backend has no cache to bypass
+        return await self.get_all_outlet_states()
+
+    @override
+    async def get_all_outlet_states(self) -> OutletStates:
+        match self.__outlet_query_mode:
+            case OutletQueryMode.PER_OUTLET:
+                # The requests are sent concurrently, and the number of requests actually in flight
+                # is limited by the request scheduler
+                return OutletStates.from_states(
+                    await asyncio.gather(
+                        *(
+                            self.get_outlet_state(outlet)
+                            for outlet in range(1, self.number_of_outlets + 1)
+                        )
+                    )
+                )
+
+            case OutletQueryMode.MULTI_GET:
+                return await self.__multiget_outlet_states()
+
+            case OutletQueryMode.BULK:
+                return await self.__bulk_get_outlet_states()
 
     @override
     async def get_outlet_state(self, outlet: int) -> bool:
         if self.__valid_outlet_index(outlet):
-            # This OID corresponds to ePDUOutletStatusOutletState in the CyberPower_MIB_v2.11.mib file
-            response = await self.__client.get(oid=f".1.3.6.1.4.1.3808.1.1.3.3.5.1.1.4.{outlet}")
-
-            match int(response):
-                case 1:
-                    return True
-                case 2:
-                    return False
-                case _:
-                    raise ValueError(f"Received unexpected value for outlet state: {response}")
+            response = await self.__get(self.__outlet_state_oids[outlet - 1])
+            return self.__parse_outlet_state(response)
         else:
             raise self.__get_outlet_value_error(outlet)
 
+    @override
+    async def get_bank_load(self, bank: int) -> float:
+        if not self.__valid_bank_index(bank):
+            raise self.__get_bank_value_error(bank)
+
+        return self.__parse_bank_load(await self.__get(self.__bank_load_oids[bank - 1]))
+
+    @override
+    async def get_all_bank_loads(self) -> list[float]:
+        if self.__number_of_outlets == 0:
+            raise RuntimeError("The `initialize` must be called before querying the banks")
+
+        # Every bank of a PDU fits into a single request, but the batches are still sent
+        # concurrently in case a small maximum message size splits them
+        responses = await asyncio.gather(
+            *(self.__multiget(batch) for batch in self.__bank_load_batches)
+        )
+        return [self.__parse_bank_load(value) for batch in responses for value in batch]
+
+    @override
+    async def get_outlet_metrics(self) -> OutletMetrics:
+        columns = (OUTLET_CURRENT_OID, OUTLET_POWER_OID, OUTLET_ENERGY_OID)
+        scales = (0.1, 1.0, 0.1)
+
+        # Outlets that the PDU doesn't report are left as `nan`
+        metrics = [array("d", [math.nan]) * self.number_of_outlets for _ in columns]
+        for column, oid, value in await self.__bulkget_columns(columns, self.number_of_outlets):
+            outlet = oid[-1]
+            if value is not None and 0 < outlet <= self.number_of_outlets:
+                metrics[column][outlet - 1] = int(value) * scales[column]
+
+        return OutletMetrics(current=metrics[0], power=metrics[1], energy=metrics[2])
+
     @override
     async def send_outlet_command(self, outlet: int, command: OutletCommand) -> None:
         if self.__valid_outlet_index(outlet):
             logger.debug(f"Sending {command.name.lower()} to outlet {outlet}")
-            # This OID corresponds to ePDUOutletControlOutletCommand in the CyberPower_MIB_v2.11.mib file
-            oid = f".1.3.6.1.4.1.3808.1.1.3.3.3.1.1.4.{outlet}"
-            await self.__client.set(oid=oid, value=Integer(command.value))
+            await self.__set(self.__outlet_command_oids[outlet - 1], command.value)
 
         else:
             raise self.__get_outlet_value_error(outlet)
 
+    @override
+    async def send_outlet_commands(self, commands: Mapping[int, OutletCommand]) -> None:
+        # Every outlet is checked before anything is sent, so an invalid outlet doesn't leave the
+        # commands half applied
+        for outlet in commands:
+            if not self.__valid_outlet_index(outlet):
+                raise self.__get_outlet_value_error(outlet)
+
+        if not commands:
+            return
+
+        description = ", ".join(
+            f"{command.name.lower()} to outlet {outlet}" for outlet, command in commands.items()
+        )
+        logger.debug(f"Sending {description}")
+
+        # The commands are packed as varbinds into as few SET requests as the agent's maximum
+        # message size allows. The agent applies each request as a whole, and when the commands
+        # don't fit into a single request, the requests are sent concurrently.
+        varbinds = [
+            (self.__outlet_command_oids[outlet - 1], command.value)
+            for outlet, command in commands.items()
+        ]
+        batch_size = self.__get_varbinds_per_request([oid for oid, _ in varbinds])
+        await asyncio.gather(
+            *(
+                self.__multiset(varbinds[start : start + batch_size])
+                for start in range(0, len(varbinds), batch_size)
+            )
+        )
+
     ############################################################
     #### Private methods #######################################
     ############################################################
 
-    async def __get_number_of_outlets(self) -> int:
-        # The OID corresponds to ePDUOutletDevNumCntrlOutlets in the CyberPower_MIB_v2.11.mib file
-        return int(await self.__client.get(oid=".1.3.6.1.4.1.3808.1.1.3.3.1.3.0"))
+    def __set_counts(self, number_of_outlets: int, number_of_banks: int) -> None:
+        """Sets the number of outlets and banks and prepares the OIDs of the outlets and banks"""
+        self.__number_of_outlets = number_of_outlets
+        self.__number_of_banks = number_of_banks
+        logger.debug(
+            f"The PDU has {self.__number_of_outlets} outlets in {self.__number_of_banks} banks"
+        )
+
+        # The outlets' OIDs are built once rather than on every request, and the SNMP client
+        # caches their encoding once they are first sent, so reusing them skips the encoding as well
+        outlets = range(1, self.__number_of_outlets + 1)
+        self.__outlet_state_oids = [(*OUTLET_STATE_OID, outlet) for outlet in outlets]
+        self.__outlet_command_oids = [(*OUTLET_COMMAND_OID, outlet) for outlet in outlets]
+        self.__bank_load_oids = [
+            (*BANK_LOAD_OID, bank) for bank in range(1, self.__number_of_banks + 1)
+        ]
+
+        # The outlets and banks are packed as varbinds into as few GET requests as the agent's
+        # maximum message size allows
+        self.__outlet_state_batches = self.__get_batches(self.__outlet_state_oids)
+        self.__bank_load_batches = self.__get_batches(self.__bank_load_oids)
+
+    def __set_metadata(self, metadata: DeviceMetadata) -> None:
+        """Sets the PDU's metadata and prepares the OIDs of its outlets and banks"""
+        self.__metadata = metadata
+        self.__set_counts(metadata.number_of_outlets, metadata.number_of_banks)
 
-    async def __get_number_of_banks(self) -> int:
-        """Get the number of banks, usually a collection of 8 outlets, on the PDU. A bank corresponds
-        to an independent power supply on the PDU
+    async def __get_metadata(self) -> DeviceMetadata:
+        """Reads the PDU's counts and identification in a single request, followed by the names of
+        its outlets
         """
-        # The OID corresponds to ePDULoadDevNumBanks in the CyberPower_MIB_v2.11.mib file
-        return int(await self.__client.get(oid=".1.3.6.1.4.1.3808.1.1.3.2.1.4.0"))
+        number_of_outlets, number_of_banks, model, firmware, serial_number = await self.__multiget(
+            [OUTLET_COUNT_OID, BANK_COUNT_OID, MODEL_OID, FIRMWARE_OID, SERIAL_NUMBER_OID]
+        )
+        if number_of_outlets is None:
+            raise RuntimeError("The PDU did not report its number of outlets")
+
+        name_oids = [(*OUTLET_NAME_OID, outlet) for outlet in range(1, int(number_of_outlets) + 1)]
+        names = await asyncio.gather(
+            *(
+                self.__multiget(batch)
+                for batch in self.__get_batches(name_oids, 2 + _MAX_OUTLET_NAME_SIZE)
+            )
+        )
 
-    async def __get_bank_load(self, bank: int) -> float:
-        """Get the load, in amps, of the bank"""
-        # The OID corresponds to ePDU2BankStatusLoad in the CyberPower_MIB_v2.11.mib file
-        tenths_of_amps = float(
-            await self.__client.get(oid=f".1.3.6.1.4.1.3808.1.1.6.5.4.1.5.{bank}")
+        return DeviceMetadata(
+            number_of_outlets=int(number_of_outlets),
+            number_of_banks=0 if number_of_banks is None else int(number_of_banks),
+            model=self.__parse_string(model),
+            firmware=self.__parse_string(firmware),
+            serial_number=self.__parse_string(serial_number),
+            outlet_names=tuple(self.__parse_string(name) for batch in names for name in batch),
         )
 
-        # The data is returned as an integer in tenths of amps, so we convert to a float and divide
-        # by 10.0 to convert to decimal amps.
-        return float(tenths_of_amps) / 10.0
+    async def __refresh_metadata(self) -> None:
+        """Reads the PDU's metadata in the background and updates the cache. If the PDU has
+        changed since its metadata was cached, such as after it was replaced, the new metadata is
+        used from then on.
+        """
+        assert self.__metadata_cache is not None
+        try:
+            with request_priority(Priority.BACKGROUND):
+                metadata = await self.__get_metadata()
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            logger.warning(f"Refreshing the PDU's metadata failed: {exception!r}")
+            return
+
+        self.__metadata_cache.store(self.__ip_address, self.__port, metadata)
+        if metadata != self.__metadata:
+            logger.info(f"The PDU's metadata changed since it was cached: {metadata}")
+            self.__set_metadata(metadata)
+
+    async def __cancel_metadata_refresh(self) -> None:
+        """Cancels the background refresh of the metadata, if one is running"""
+        if self.__metadata_refresh is None:
+            return
+
+        self.__metadata_refresh.cancel()
+        try:
+            await self.__metadata_refresh
+        except asyncio.CancelledError:
+            pass
+        self.__metadata_refresh = None
+
+    async def __multiget_outlet_states(self) -> OutletStates:
+        """Gets the state of all outlets using multi-varbind GET requests"""
+        if self.__number_of_outlets == 0:
+            raise RuntimeError("The `initialize` must be called before querying the outlets")
+
+        # Rather than one GET request per outlet, the outlets are packed as varbinds into the
+        # batches prepared by `initialize`. When the outlets don't fit into a single request, the
+        # requests are sent concurrently.
+        responses = await asyncio.gather(
+            *(self.__multiget(batch) for batch in self.__outlet_state_batches)
+        )
+        return OutletStates.from_states(
+            self.__parse_outlet_state(value) for batch in responses for value in batch
+        )
+
+    async def __bulk_get_outlet_states(self) -> OutletStates:
+        """Gets the state of all outlets by walking the outlet state column with GETBULK requests.
+        This does not depend on the number of outlets being known.
+        """
+        # The walk of the ePDUOutletStatusOutletState column returns the outlets in order
+        oid = OUTLET_STATE_OID
+
+        if self.__max_repetitions is not None:
+            max_repetitions = self.__max_repetitions
+        else:
+            # Ask for one more varbind than there are outlets, when they are known, so that the
+            # end of the column is seen within the same response instead of needing another request.
+            # The outlet state values are smaller than the value size assumed when sizing requests,
+            # which leaves room for outlet indices above 127 that need an extra byte.
+            max_repetitions = self.__get_varbinds_per_request([(*oid, 1)])
+            if self.__number_of_outlets > 0:
+                max_repetitions = min(max_repetitions, self.__number_of_outlets + 1)
+
+        return OutletStates.from_states(
+            self.__parse_outlet_state(value)
+            for value in await self.__bulkwalk(oid, max_repetitions)
+        )
+
+    async def __bulkget_columns(
+        self, columns: tuple[OID, ...], rows: int
+    ) -> list[tuple[int, OID, Any]]:
+        """Walks the table columns side by side with GETBULK requests that each repeat every
+        column, and returns the column index, OID, and value of each cell. At most `rows` cells
+        are read from each column. Each request asks for as many rows as the agent's maximum
+        message size allows, so a table that fits is read in a single request.
+        """
+        cells: list[tuple[int, OID, Any]] = []
+        next_oids = list(columns)
+        rows_read = [0] * len(columns)
+        rows_per_request = max(
+            1, self.__get_varbinds_per_request([(*oid, rows) for oid in columns]) // len(columns)
+        )
+
+        while True:
+            # The remaining columns are requested together, and a column is dropped once it is
+            # complete or the walk has moved past its end
+            active = [
+                index
+                for index, oid in enumerate(next_oids)
+                if rows_read[index] < rows and oid[: len(columns[index])] == columns[index]
+            ]
+            if not active:
+                return cells
+
+            max_repetitions = min(
+                rows_per_request, max(rows - rows_read[index] for index in active)
+            )
+            varbinds = await self.__bulkget([next_oids[index] for index in active], max_repetitions)
+            if not varbinds:
+                return cells
+
+            for position, (oid, value) in enumerate(varbinds):
+                index = active[position % len(active)]
+                if rows_read[index] >= rows:
+                    continue
+
+                if oid[: len(columns[index])] != columns[index]:
+                    # The walk has moved past the end of the column, which drops the column from
+                    # the next request
+                    next_oids[index] = oid
+                    continue
+
+                # An agent that doesn't move forward would otherwise be walked forever
+                if oid <= next_oids[index]:
+                    raise ValueError(f"The PDU returned the OID {oid} out of order")
+
+                cells.append((index, oid, value))
+                next_oids[index] = oid
+                rows_read[index] += 1
+
+    async def __get_number_of_outlets_and_banks(self) -> tuple[int, int]:
+        """Gets the number of outlets and the number of banks, usually a collection of 8 outlets,
+        on the PDU in a single request. A bank corresponds to an independent power supply on the
+        PDU.
+        """
+        number_of_outlets, number_of_banks = await self.__multiget(
+            [OUTLET_COUNT_OID, BANK_COUNT_OID]
+        )
+        if number_of_outlets is None:
+            raise RuntimeError("The PDU did not report its number of outlets")
+
+        # PDUs without metered banks don't report a number of banks
+        return int(number_of_outlets), 0 if number_of_banks is None else int(number_of_banks)
+
+    async def __get(self, oid: OID) -> Any:
+        """Sends a GET request for the OID. Concurrent GET requests for the same OID share a single
+        request to the PDU, which is scheduled with the priority of the first caller.
+        """
+
+        async def get() -> Any:
+            async with self.__request_slot():
+                return await self.__client.get(oid)
+
+        return await self.__reads_in_flight.run(("get", oid), get)
+
+    async def __multiget(self, oids: list[OID]) -> list[Any]:
+        """Sends a single GET request for all of the OIDs. Concurrent GET requests for the same OIDs
+        share a single request to the PDU.
+        """
+
+        async def multiget() -> list[Any]:
+            async with self.__request_slot():
+                return await self.__client.multiget(oids)
+
+        return list(await self.__reads_in_flight.run(("multiget", *oids), multiget))
+
+    async def __bulkwalk(self, oid: OID, max_repetitions: int) -> list[Any]:
+        """Walks the values below the OID with GETBULK requests. Concurrent walks of the same OID
+        share a single walk of the PDU.
+        """
+
+        async def bulkwalk() -> list[Any]:
+            # The walk's requests depend on each other and are sent one after the other
+            async with self.__request_slot():
+                return await self.__client.bulkwalk(oid, max_repetitions)
+
+        return list(await self.__reads_in_flight.run(("bulkwalk", oid, max_repetitions), bulkwalk))
+
+    async def __bulkget(self, oids: list[OID], max_repetitions: int) -> list[tuple[OID, Any]]:
+        """Sends a single GETBULK request repeating all of the OIDs. Concurrent requests for the
+        same OIDs share a single request to the PDU.
+        """
+
+        async def bulkget() -> list[tuple[OID, Any]]:
+            async with self.__request_slot():
+                return await self.__client.bulkget(oids, max_repetitions)
+
+        return list(await self.__reads_in_flight.run(("bulkget", max_repetitions, *oids), bulkget))
+
+    async def __set(self, oid: OID, value: int) -> None:
+        """Sends a SET request for the OID. These are never shared between callers."""
+        async with self.__request_slot(Priority.COMMAND):
+            await self.__client.set(oid, value)
+
+    async def __multiset(self, varbinds: list[tuple[OID, int]]) -> None:
+        """Sends a single SET request for all of the OIDs. These are never shared between
+        callers.
+        """
+        async with self.__request_slot(Priority.COMMAND):
+            await self.__client.multiset(varbinds)
+
+    @asynccontextmanager
+    async def __request_slot(self, priority: Priority | None = None) -> AsyncIterator[None]:
+        """Holds a request slot from the scheduler for the duration of the block, and reports the
+        outcome of the request sent within it to the circuit breaker. A `CircuitOpenError` is
+        raised without waiting for a slot if the breaker refuses the request.
+        """
+        breaker = self.__circuit_breaker
+        if breaker is None:
+            async with self.__scheduler.slot(priority):
+                yield
+            return
+
+        probe = breaker.begin_request()
+        try:
+            async with self.__scheduler.slot(priority):
+                yield
+
+        # Timeouts and socket errors mean the PDU didn't answer, while SNMP errors are answers
+        except (Timeout, OSError):
+            breaker.record_failure()
+            raise
+        except SnmpError:
+            breaker.record_success()
+            raise
+        except BaseException:
+            if probe:
+                breaker.release_probe()
+            raise
+
+        breaker.record_success()
+
+    def __get_batches(self, oids: list[OID], value_size: int = 6) -> list[list[OID]]:
+        """Splits the OIDs into batches that each fit into a single GET request"""
+        batch_size = self.__get_varbinds_per_request(oids, value_size) if oids else 1
+        return [oids[start : start + batch_size] for start in range(0, len(oids), batch_size)]
+
+    def __get_varbinds_per_request(self, oids: list[OID], value_size: int = 6) -> int:
+        """Returns how many of the OIDs can be requested as varbinds of a single request such that
+        the response fits within the agent's maximum message size. `value_size` is the largest
+        encoded size of a value, which defaults to that of a 4 byte integer.
+        """
+        # The message header holds the version, community, request ID, error status, error index,
+        # and the sequence headers. Each varbind holds a sequence header, the OID, and a value.
+        header_size = 32 + len(SNMP_COMMUNITY)
+        varbind_size = max(2 + len(encode_oid(oid)) + value_size for oid in oids)
+        return max(1, (self.__max_message_size - header_size) // varbind_size)
+
+    @staticmethod
+    def __parse_outlet_state(response: Any) -> bool:
+        """Converts an ePDUOutletStatusOutletState value to the outlet state"""
+        match int(response):
+            case 1:
+                return True
+            case 2:
+                return False
+            case _:
+                raise ValueError(f"Received unexpected value for outlet state: {response}")
+
+    @staticmethod
+    def __parse_string(response: Any) -> str:
+        """Converts an OCTET STRING value to a string, or to an empty string if it is missing"""
+        if response is None:
+            return ""
+        if isinstance(response, bytes):
+            response = response.decode("utf-8", errors="replace")
+
+        return str(response).strip()
+
+    @staticmethod
+    def __parse_bank_load(response: Any) -> float:
+        """Converts an ePDU2BankStatusLoad value, which is in tenths of amps, to amps"""
+        if response is None:
+            raise ValueError("The PDU did not report the bank's load")
+
+        return int(response) / 10.0
 
     def __valid_outlet_index(self, outlet: int) -> bool:
         """Returns whether the outlet is in range or not"""
         return 0 < outlet <= self.number_of_outlets
 
+    def __valid_bank_index(self, bank: int) -> bool:
+        """Returns whether the bank is in range or not"""
+        return 0 < bank <= self.number_of_banks
+
     def __get_outlet_value_error(self, outlet: int) -> ValueError:
         """Returns a `ValueError` exception to be raised in the event of an outlet being
         out of range
@@ -275,3 +1304,12 @@ class CyberPowerPDUHardware(CyberPowerPDU):
             f"are 1 to {self.number_of_outlets}"
         )
         return ValueError(message)
+
+    def __get_bank_value_error(self, bank: int) -> ValueError:
+        """Returns a `ValueError` exception to be raised in the event of a bank being out of
+        range
+        """
+        message = (
+            f"Invalid bank value of: {bank}. Valid bank values are 1 to {self.number_of_banks}"
+        )
+        return ValueError(message)
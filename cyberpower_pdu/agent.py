@@ -0,0 +1,413 @@
+"""A local SNMPv2c agent that stands in for a CyberPower PDU. The agent serves the CyberPower OIDs
+used by the library from the state of a `CyberPowerPDUSimulation`, so that `CyberPowerPDUHardware`
+can be exercised, benchmarked, and load tested over UDP on localhost without hardware. Latency,
+jitter, and packet loss can be injected to emulate a slow or lossy network path.
+"""
+
+# Core dependencies
+from array import array
+import asyncio
+from bisect import bisect_right
+from collections.abc import Awaitable, Callable
+import random
+from typing import override
+
+# Project dependencies
+from cyberpower_pdu import (
+    SNMP_COMMUNITY,
+    CyberPowerPDUSimulation,
+    OutletCommand,
+    OutletMetrics,
+    logger,
+)
+from cyberpower_pdu.ber import (
+    OID,
+    ErrorStatus,
+    Message,
+    PDUType,
+    Value,
+    VarBindException,
+    decode_message,
+    encode_message,
+)
+from cyberpower_pdu.oids import (
+    BANK_COUNT_OID,
+    BANK_LOAD_OID,
+    FIRMWARE_OID,
+    MODEL_OID,
+    OUTLET_COMMAND_OID,
+    OUTLET_COUNT_OID,
+    OUTLET_CURRENT_OID,
+    OUTLET_ENERGY_OID,
+    OUTLET_NAME_OID,
+    OUTLET_POWER_OID,
+    OUTLET_STATE_OID,
+    SERIAL_NUMBER_OID,
+)
+
+
+# The identification served by the agent
+_MODEL = b"PDU-SIM"
+_FIRMWARE = b"1.0.0"
+_SERIAL_NUMBER = b"SIM0000000"
+
+_TABLE_COLUMNS = (
+    OUTLET_NAME_OID,
+    OUTLET_STATE_OID,
+    BANK_LOAD_OID,
+    OUTLET_CURRENT_OID,
+    OUTLET_POWER_OID,
+    OUTLET_ENERGY_OID,
+)
+
+
+class SimulatedSNMPAgent(asyncio.DatagramProtocol):
+    """An asyncio UDP SNMPv2c agent serving a simulated CyberPower PDU. The agent answers GET,
+    GETNEXT, GETBULK, and SET requests, and each request is delayed by `latency` plus a uniformly
+    random amount of up to `jitter` seconds either way, or dropped with probability
+    `packet_loss`. Responses larger than `max_message_size` bytes are truncated for GETBULK
+    requests and answered with a `tooBig` error otherwise, as a real agent would.
+    """
+
+    def __init__(
+        self,
+        simulation: CyberPowerPDUSimulation | None = None,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        packet_loss: float = 0.0,
+        max_message_size: int = 484,
+        community: str = SNMP_COMMUNITY,
+        seed: int | None = None,
+    ) -> None:
+        """Initializes the agent. If `simulation` is `None`, a 16 outlet simulation is created and
+        initialized when the agent is started. Otherwise, the simulation must already be
+        initialized. The banks and their loads are served from the simulation. `seed` seeds the
+        random generator used for jitter and packet loss so that load tests can be reproduced.
+        """
+        self.__simulation = simulation
+        self.__latency = latency
+        self.__jitter = jitter
+        self.__packet_loss = packet_loss
+        self.__max_message_size = max_message_size
+        self.__community = community.encode()
+        self.__random = random.Random(seed)
+
+        self.__transport: asyncio.DatagramTransport | None = None
+        self.__pending_responses: set[asyncio.Task[None]] = set()
+
+        # These are populated when the agent is started, since they depend on the simulation
+        self.__objects: dict[OID, Callable[[], Awaitable[Value]]] = {}
+        self.__sorted_oids: list[OID] = []
+
+        self.__requests_received = 0
+        self.__requests_dropped = 0
+        self.__responses_sent = 0
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def simulation(self) -> CyberPowerPDUSimulation:
+        """The simulated PDU whose state is served by the agent"""
+        if self.__simulation is None:
+            raise RuntimeError("The agent must be started to create its simulation")
+        return self.__simulation
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The host and port that the agent is listening on"""
+        if self.__transport is None:
+            raise RuntimeError("The agent must be started before it has an address")
+
+        host, port = self.__transport.get_extra_info("sockname")[:2]
+        return host, port
+
+    @property
+    def requests_received(self) -> int:
+        """The number of datagrams received by the agent, including dropped ones"""
+        return self.__requests_received
+
+    @property
+    def requests_dropped(self) -> int:
+        """The number of datagrams dropped to simulate packet loss"""
+        return self.__requests_dropped
+
+    @property
+    def responses_sent(self) -> int:
+        """The number of responses sent by the agent"""
+        return self.__responses_sent
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> None:
+        """Starts serving on the host and port. A port of 0 selects a free port, which can be read
+        back from `address`, so that many agents can run side by side.
+        """
+        if self.__simulation is None:
+            self.__simulation = CyberPowerPDUSimulation()
+            await self.__simulation.initialize()
+
+        self.__register_objects(self.__simulation)
+
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        logger.debug(f"Simulated SNMP agent listening on {self.address}")
+
+    async def close(self) -> None:
+        """Stops serving and drops any responses that are still delayed"""
+        for task in self.__pending_responses:
+            task.cancel()
+        await asyncio.gather(*self.__pending_responses, return_exceptions=True)
+
+        if self.__transport is not None:
+            self.__transport.close()
+            self.__transport = None
+
+    ############################################################
+    #### Protocol methods ######################################
+    ############################################################
+
+    @override
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.DatagramTransport)
+        self.__transport = transport
+
+    @override
+    def datagram_received(self, data: bytes, addr: tuple[str | int, int]) -> None:
+        self.__requests_received += 1
+
+        if self.__random.random() < self.__packet_loss:
+            self.__requests_dropped += 1
+            return
+
+        delay = max(0.0, self.__latency + self.__random.uniform(-self.__jitter, self.__jitter))
+        task = asyncio.ensure_future(self.__respond(data, addr, delay))
+        self.__pending_responses.add(task)
+        task.add_done_callback(self.__pending_responses.discard)
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __register_objects(self, simulation: CyberPowerPDUSimulation) -> None:
+        """Builds the table of served OIDs from the simulation"""
+        number_of_outlets = simulation.number_of_outlets
+        number_of_banks = simulation.number_of_banks
+
+        async def outlet_count() -> Value:
+            return number_of_outlets
+
+        async def bank_count() -> Value:
+            return number_of_banks
+
+        def constant(value: Value) -> Callable[[], Awaitable[Value]]:
+            async def get() -> Value:
+                return value
+
+            return get
+
+        def outlet_state(outlet: int) -> Callable[[], Awaitable[Value]]:
+            async def get() -> Value:
+                return 1 if await simulation.get_outlet_state(outlet) else 2
+
+            return get
+
+        def outlet_metric(
+            outlet: int, column: Callable[[OutletMetrics], array[float]], scale: float
+        ) -> Callable[[], Awaitable[Value]]:
+            async def get() -> Value:
+                return round(column(await simulation.get_outlet_metrics())[outlet - 1] * scale)
+
+            return get
+
+        def bank_load(bank: int) -> Callable[[], Awaitable[Value]]:
+            async def get() -> Value:
+                # The load is served in tenths of amps, as the hardware reports it
+                return round(10 * await simulation.get_bank_load(bank))
+
+            return get
+
+        objects: dict[OID, Callable[[], Awaitable[Value]]] = {
+            OUTLET_COUNT_OID: outlet_count,
+            BANK_COUNT_OID: bank_count,
+            MODEL_OID: constant(_MODEL),
+            FIRMWARE_OID: constant(_FIRMWARE),
+            SERIAL_NUMBER_OID: constant(_SERIAL_NUMBER),
+        }
+        for outlet in range(1, number_of_outlets + 1):
+            objects[(*OUTLET_NAME_OID, outlet)] = constant(f"Outlet{outlet}".encode())
+            objects[(*OUTLET_STATE_OID, outlet)] = outlet_state(outlet)
+
+            # Reading the command column reports the outlet's state as an immediate on or off
+            objects[(*OUTLET_COMMAND_OID, outlet)] = outlet_state(outlet)
+
+            objects[(*OUTLET_CURRENT_OID, outlet)] = outlet_metric(
+                outlet, lambda metrics: metrics.current, 10
+            )
+            objects[(*OUTLET_POWER_OID, outlet)] = outlet_metric(
+                outlet, lambda metrics: metrics.power, 1
+            )
+            objects[(*OUTLET_ENERGY_OID, outlet)] = outlet_metric(
+                outlet, lambda metrics: metrics.energy, 10
+            )
+
+        for bank in range(1, number_of_banks + 1):
+            objects[(*BANK_LOAD_OID, bank)] = bank_load(bank)
+
+        self.__objects = objects
+        self.__sorted_oids = sorted(objects)
+
+    async def __respond(self, data: bytes, addr: tuple[str | int, int], delay: float) -> None:
+        """Handles a request after the simulated delay and sends the response"""
+        if delay > 0:
+            await asyncio.sleep(delay)
+
+        try:
+            request = decode_message(data)
+        except ValueError as exception:
+            logger.debug(f"Simulated SNMP agent dropped a malformed request: {exception}")
+            return
+
+        # Agents silently drop requests of other SNMP versions or with the wrong community
+        if request.version != 1 or request.community != self.__community:
+            return
+
+        response = await self.__handle(request)
+        encoded_response = encode_message(response)
+
+        if len(encoded_response) > self.__max_message_size:
+            encoded_response = self.__shrink_response(request, response)
+
+        if self.__transport is not None:
+            self.__transport.sendto(encoded_response, addr)
+            self.__responses_sent += 1
+
+    async def __handle(self, request: Message) -> Message:
+        """Returns the response to the request"""
+        varbinds: list[tuple[OID, Value]] = []
+        error_status = ErrorStatus.NO_ERROR
+        error_index = 0
+
+        match request.pdu_type:
+            case PDUType.GET_REQUEST:
+                for oid, _ in request.varbinds:
+                    varbinds.append((oid, await self.__get(oid)))
+
+            case PDUType.GET_NEXT_REQUEST:
+                for oid, _ in request.varbinds:
+                    varbinds.append(await self.__get_next(oid))
+
+            case PDUType.GET_BULK_REQUEST:
+                varbinds = await self.__get_bulk(request)
+
+            case PDUType.SET_REQUEST:
+                error_status, error_index = await self.__set(request)
+                varbinds = list(request.varbinds)
+
+            case _:
+                error_status = ErrorStatus.GEN_ERR
+
+        return Message(
+            community=request.community,
+            pdu_type=PDUType.RESPONSE,
+            request_id=request.request_id,
+            error_status=error_status,
+            error_index=error_index,
+            varbinds=tuple(varbinds),
+        )
+
+    async def __get(self, oid: OID) -> Value:
+        """Returns the value of the OID or the exception for an unknown OID"""
+        get = self.__objects.get(oid)
+        if get is not None:
+            return await get()
+
+        # An OID within one of the served columns is a missing instance rather than a missing object
+        if any(oid[: len(column)] == column for column in _TABLE_COLUMNS):
+            return VarBindException.NO_SUCH_INSTANCE
+        return VarBindException.NO_SUCH_OBJECT
+
+    async def __get_next(self, oid: OID) -> tuple[OID, Value]:
+        """Returns the varbind lexicographically following the OID"""
+        index = bisect_right(self.__sorted_oids, oid)
+
+        if index == len(self.__sorted_oids):
+            return oid, VarBindException.END_OF_MIB_VIEW
+
+        next_oid = self.__sorted_oids[index]
+        return next_oid, await self.__objects[next_oid]()
+
+    async def __get_bulk(self, request: Message) -> list[tuple[OID, Value]]:
+        """Returns the varbinds of a GETBULK request as described in RFC 3416"""
+        non_repeaters = max(0, min(request.error_status, len(request.varbinds)))
+        max_repetitions = max(0, request.error_index)
+
+        varbinds = [await self.__get_next(oid) for oid, _ in request.varbinds[:non_repeaters]]
+
+        repeating_oids = [oid for oid, _ in request.varbinds[non_repeaters:]]
+        for _ in range(max_repetitions):
+            row = [await self.__get_next(oid) for oid in repeating_oids]
+            varbinds.extend(row)
+
+            if all(value is VarBindException.END_OF_MIB_VIEW for _, value in row):
+                break
+            repeating_oids = [oid for oid, _ in row]
+
+        return varbinds
+
+    async def __set(self, request: Message) -> tuple[ErrorStatus, int]:
+        """Applies the SET request to the simulation and returns the error status and index. The
+        request is validated as a whole before any outlet is commanded.
+        """
+        commands: list[tuple[int, OutletCommand]] = []
+
+        for index, (oid, value) in enumerate(request.varbinds, start=1):
+            if oid[:-1] != OUTLET_COMMAND_OID or oid not in self.__objects:
+                status = (
+                    ErrorStatus.NOT_WRITABLE if oid in self.__objects else ErrorStatus.NO_CREATION
+                )
+                return status, index
+
+            if not isinstance(value, int):
+                return ErrorStatus.WRONG_TYPE, index
+
+            try:
+                commands.append((oid[-1], OutletCommand(value)))
+            except ValueError:
+                return ErrorStatus.WRONG_VALUE, index
+
+        for outlet, command in commands:
+            await self.simulation.send_outlet_command(outlet, command)
+
+        return ErrorStatus.NO_ERROR, 0
+
+    def __shrink_response(self, request: Message, response: Message) -> bytes:
+        """Returns an encoded response that fits within the maximum message size. GETBULK responses
+        are truncated, and other responses are replaced with a `tooBig` error.
+        """
+        if request.pdu_type == PDUType.GET_BULK_REQUEST:
+            varbinds = response.varbinds
+            while varbinds:
+                varbinds = varbinds[:-1]
+                encoded_response = encode_message(
+                    Message(
+                        community=response.community,
+                        pdu_type=response.pdu_type,
+                        request_id=response.request_id,
+                        varbinds=varbinds,
+                    )
+                )
+                if len(encoded_response) <= self.__max_message_size:
+                    return encoded_response
+
+        return encode_message(
+            Message(
+                community=response.community,
+                pdu_type=PDUType.RESPONSE,
+                request_id=response.request_id,
+                error_status=ErrorStatus.TOO_BIG,
+            )
+        )
@@ -0,0 +1,382 @@
+"""A benchmark suite for the hardware and simulation backends. The hardware backend is benchmarked
+against local `SimulatedSNMPAgent` instances, so no network or PDU is needed. Each benchmark
+measures the per-call latency percentiles, throughput, and CPU time of an operation for a
+combination of SNMP stack, outlet count, caller concurrency, and simulated round trip time, and the
+results are written as JSON so that they can be compared between revisions.
+
+Run the suite with:
+
+    python -m cyberpower_pdu.benchmark --output benchmark.json
+"""
+
+# Core dependencies
+import argparse
+import asyncio
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import json
+import platform
+import sys
+import threading
+import time
+from typing import Any
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU, CyberPowerPDUSimulation, OutletCommand, SNMPStack
+from cyberpower_pdu.agent import SimulatedSNMPAgent
+from cyberpower_pdu.outlet_states import OutletStates
+from cyberpower_pdu.percentile import nearest_rank
+
+
+OPERATIONS = (
+    "initialize",
+    "get_outlet_state",
+    "get_all_outlet_states",
+    "send_outlet_command",
+    "send_outlet_commands",
+)
+"""The operations that can be benchmarked"""
+
+BACKENDS = ("hardware", "simulation")
+"""The backends that can be benchmarked. The hardware backend talks to a local agent."""
+
+SNMP_STACKS = tuple(snmp_stack.name.lower() for snmp_stack in SNMPStack)
+"""The SNMP stacks the hardware backend can be benchmarked with"""
+
+
+############################################################
+#### Data types ############################################
+############################################################
+
+
+@dataclass(frozen=True)
+class BenchmarkCase:
+    """A single combination of the benchmark parameters"""
+
+    backend: str
+    snmp_stack: str
+    operation: str
+    number_of_outlets: int
+    concurrency: int
+    round_trip_time: float
+    """The simulated round trip time, in seconds, added by the agent"""
+
+
+@dataclass(frozen=True)
+class BenchmarkResult:
+    """The measurements of a benchmark case. Latencies are in milliseconds and are `None` if no call
+    succeeded, so that the JSON report only holds standard JSON numbers.
+    """
+
+    case: BenchmarkCase
+    calls: int
+    errors: int
+    duration: float
+    """The wall-clock time, in seconds, taken by all calls"""
+
+    throughput: float | None
+    """Calls per second, or `None` if the calls took no measurable time"""
+
+    cpu_per_call: float
+    """The CPU time, in microseconds, that the calling thread used per call. The agent runs in its
+    own thread, so its CPU time is not included.
+    """
+
+    latency_mean: float | None
+    latency_min: float | None
+    latency_p50: float | None
+    latency_p90: float | None
+    latency_p99: float | None
+    latency_max: float | None
+
+
+############################################################
+#### Benchmarks ############################################
+############################################################
+
+
+async def run_case(case: BenchmarkCase, calls: int) -> BenchmarkResult:
+    """Runs the benchmark case, making `calls` calls of the operation split between `concurrency`
+    concurrent callers
+    """
+    agent: _AgentThread | None = None
+    address = ("", 0)
+
+    if case.backend == "hardware":
+        agent = _AgentThread(case.number_of_outlets, case.round_trip_time)
+        address = await agent.start()
+
+    def create_pdu() -> CyberPowerPDU:
+        if agent is None:
+            return CyberPowerPDUSimulation(number_of_outlets=case.number_of_outlets)
+
+        host, port = address
+        return CyberPowerPDU(
+            ip_address=host,
+            port=port,
+            max_concurrent_requests=max(4, case.concurrency),
+            snmp_stack=SNMPStack[case.snmp_stack.upper()],
+        )
+
+    pdu = create_pdu()
+
+    try:
+        await pdu.initialize()
+        operation = _get_operation(case.operation, pdu, create_pdu)
+        latencies, errors, duration, cpu_time = await _measure(operation, calls, case.concurrency)
+
+    finally:
+        await pdu.close()
+        if agent is not None:
+            await agent.close()
+
+    latencies.sort()
+    return BenchmarkResult(
+        case=case,
+        calls=calls,
+        errors=errors,
+        duration=duration,
+        throughput=calls / duration if duration > 0 else None,
+        cpu_per_call=1_000_000 * cpu_time / calls,
+        latency_mean=1000 * sum(latencies) / len(latencies) if latencies else None,
+        latency_min=1000 * latencies[0] if latencies else None,
+        latency_p50=1000 * nearest_rank(latencies, 0.50) if latencies else None,
+        latency_p90=1000 * nearest_rank(latencies, 0.90) if latencies else None,
+        latency_p99=1000 * nearest_rank(latencies, 0.99) if latencies else None,
+        latency_max=1000 * latencies[-1] if latencies else None,
+    )
+
+
+async def run_suite(
+    backends: Sequence[str] = BACKENDS,
+    snmp_stacks: Sequence[str] = SNMP_STACKS,
+    operations: Sequence[str] = OPERATIONS,
+    outlet_counts: Sequence[int] = (16, 48),
+    concurrencies: Sequence[int] = (1, 8),
+    round_trip_times: Sequence[float] = (0.0, 0.005),
+    calls: int = 200,
+) -> list[BenchmarkResult]:
+    """Runs every combination of the parameters. The simulation backend has no network, so it is
+    only run with the first SNMP stack and a round trip time of 0.
+    """
+    results = []
+
+    for backend in backends:
+        is_hardware = backend == "hardware"
+
+        for snmp_stack in snmp_stacks if is_hardware else snmp_stacks[:1]:
+            for operation in operations:
+                for number_of_outlets in outlet_counts:
+                    for concurrency in concurrencies:
+                        for round_trip_time in round_trip_times if is_hardware else (0.0,):
+                            case = BenchmarkCase(
+                                backend=backend,
+                                snmp_stack=snmp_stack,
+                                operation=operation,
+                                number_of_outlets=number_of_outlets,
+                                concurrency=concurrency,
+                                round_trip_time=round_trip_time,
+                            )
+                            result = await run_case(case, calls)
+                            results.append(result)
+                            print(_format_result(result), file=sys.stderr)
+
+    return results
+
+
+############################################################
+#### Private functions #####################################
+############################################################
+
+
+class _AgentThread:
+    """Runs a `SimulatedSNMPAgent` on its own event loop in a background thread, which keeps the
+    agent's CPU time out of the CPU time measured for the benchmarked calls
+    """
+
+    def __init__(self, number_of_outlets: int, latency: float) -> None:
+        self.__number_of_outlets = number_of_outlets
+        self.__latency = latency
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(target=self.__loop.run_forever, daemon=True)
+        self.__agent: SimulatedSNMPAgent
+
+    async def start(self) -> tuple[str, int]:
+        """Starts the agent and returns its address"""
+        self.__thread.start()
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self.__start(), self.__loop)
+        )
+
+    async def close(self) -> None:
+        """Closes the agent and stops its thread"""
+        await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(self.__agent.close(), self.__loop)
+        )
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+
+    async def __start(self) -> tuple[str, int]:
+        simulation = CyberPowerPDUSimulation(number_of_outlets=self.__number_of_outlets)
+        await simulation.initialize()
+
+        # The agent delays its responses, so the simulated round trip time is the whole delay
+        self.__agent = SimulatedSNMPAgent(simulation, latency=self.__latency)
+        await self.__agent.start()
+        return self.__agent.address
+
+
+def _get_operation(
+    name: str, pdu: CyberPowerPDU, create_pdu: Callable[[], CyberPowerPDU]
+) -> Callable[[int], Awaitable[Any]]:
+    """Returns a function making the `call`th call of the named operation. Calls are spread over
+    the outlets so that concurrent calls of the same outlet stay representative of real use.
+    """
+    number_of_outlets = pdu.number_of_outlets
+
+    async def initialize(call: int) -> None:
+        # Initialization is measured on a fresh PDU each call, as it would be on a process start
+        new_pdu = create_pdu()
+        await new_pdu.initialize()
+        await new_pdu.close()
+
+    async def get_outlet_state(call: int) -> bool:
+        return await pdu.get_outlet_state(call % number_of_outlets + 1)
+
+    async def get_all_outlet_states(call: int) -> OutletStates:
+        return await pdu.get_all_outlet_states()
+
+    async def send_outlet_command(call: int) -> None:
+        command = OutletCommand.IMMEDIATE_ON if call % 2 else OutletCommand.IMMEDIATE_OFF
+        await pdu.send_outlet_command(call % number_of_outlets + 1, command)
+
+    async def send_outlet_commands(call: int) -> None:
+        command = OutletCommand.IMMEDIATE_ON if call % 2 else OutletCommand.IMMEDIATE_OFF
+        await pdu.send_outlet_commands(
+            {outlet: command for outlet in range(1, number_of_outlets + 1)}
+        )
+
+    operations: dict[str, Callable[[int], Awaitable[Any]]] = {
+        "initialize": initialize,
+        "get_outlet_state": get_outlet_state,
+        "get_all_outlet_states": get_all_outlet_states,
+        "send_outlet_command": send_outlet_command,
+        "send_outlet_commands": send_outlet_commands,
+    }
+    return operations[name]
+
+
+async def _measure(
+    operation: Callable[[int], Awaitable[Any]], calls: int, concurrency: int
+) -> tuple[list[float], int, float, float]:
+    """Makes the calls from `concurrency` concurrent callers and returns the latency of each
+    successful call, the number of failed calls, the total duration, and the CPU time used by the
+    calling thread
+    """
+    latencies: list[float] = []
+    errors = 0
+    next_call = 0
+
+    async def caller() -> None:
+        nonlocal errors, next_call
+
+        while next_call < calls:
+            call = next_call
+            next_call += 1
+
+            start_time = time.perf_counter()
+            try:
+                await operation(call)
+            except Exception:  # pylint: disable=broad-exception-caught
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start_time)
+
+    start_time = time.perf_counter()
+    start_cpu_time = time.thread_time()
+    await asyncio.gather(*(caller() for _ in range(concurrency)))
+    return (
+        latencies,
+        errors,
+        time.perf_counter() - start_time,
+        time.thread_time() - start_cpu_time,
+    )
+
+
+def _format_result(result: BenchmarkResult) -> str:
+    """Formats the result as a single human readable line"""
+    case = result.case
+    return (
+        f"{case.backend:<10} {case.snmp_stack:<8} {case.operation:<22} "
+        f"outlets={case.number_of_outlets:<3} "
+        f"concurrency={case.concurrency:<3} rtt={1000 * case.round_trip_time:5.1f}ms  "
+        f"p50={_format_optional(result.latency_p50, 8, 3)}ms "
+        f"p99={_format_optional(result.latency_p99, 8, 3)}ms "
+        f"throughput={_format_optional(result.throughput, 9, 1)}/s "
+        f"cpu={result.cpu_per_call:7.1f}us "
+        f"errors={result.errors}"
+    )
+
+
+def _format_optional(value: float | None, width: int, precision: int) -> str:
+    """Formats the measurement, or a dash of the same width if it is missing"""
+    if value is None:
+        return "-".rjust(width)
+
+    return f"{value:{width}.{precision}f}"
+
+
+############################################################
+#### Command line ##########################################
+############################################################
+
+
+def main() -> None:
+    """Runs the benchmark suite from the command line and writes the results as JSON"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--backends", nargs="+", choices=BACKENDS, default=list(BACKENDS))
+    parser.add_argument("--snmp-stacks", nargs="+", choices=SNMP_STACKS, default=list(SNMP_STACKS))
+    parser.add_argument("--operations", nargs="+", choices=OPERATIONS, default=list(OPERATIONS))
+    parser.add_argument("--outlets", nargs="+", type=int, default=[16, 48])
+    parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 8])
+    parser.add_argument(
+        "--rtt", nargs="+", type=float, default=[0.0, 5.0], help="round trip times in milliseconds"
+    )
+    parser.add_argument("--calls", type=int, default=200, help="calls per benchmark case")
+    parser.add_argument("--output", help="JSON output path, which defaults to standard output")
+    arguments = parser.parse_args()
+
+    results = asyncio.run(
+        run_suite(
+            backends=arguments.backends,
+            snmp_stacks=arguments.snmp_stacks,
+            operations=arguments.operations,
+            outlet_counts=arguments.outlets,
+            concurrencies=arguments.concurrency,
+            round_trip_times=[rtt / 1000 for rtt in arguments.rtt],
+            calls=arguments.calls,
+        )
+    )
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "calls": arguments.calls,
+        },
+        "results": [asdict(result) for result in results],
+    }
+
+    if arguments.output is None:
+        json.dump(report, sys.stdout, indent=2, allow_nan=False)
+        print()
+    else:
+        with open(arguments.output, "w", encoding="utf-8") as file:
+            json.dump(report, file, indent=2, allow_nan=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,379 @@
+"""Minimal BER (basic encoding rules) encoding and decoding of SNMPv2c messages. Only the value
+types used by CyberPower PDUs and the library are supported, which keeps the codec small enough to
+serve as a fast path for the handful of requests the library sends.
+"""
+
+# Core dependencies
+from dataclasses import dataclass
+from enum import Enum, IntEnum
+
+
+############################################################
+#### Data types ############################################
+############################################################
+
+type OID = tuple[int, ...]
+"""An object identifier as a tuple of its arcs, such as `(1, 3, 6, 1)` for `.1.3.6.1`"""
+
+
+class PDUType(IntEnum):
+    """The BER tags of the SNMPv2c PDU types"""
+
+    GET_REQUEST = 0xA0
+    GET_NEXT_REQUEST = 0xA1
+    RESPONSE = 0xA2
+    SET_REQUEST = 0xA3
+    GET_BULK_REQUEST = 0xA5
+    INFORM_REQUEST = 0xA6
+    TRAP = 0xA7
+    REPORT = 0xA8
+
+
+class ErrorStatus(IntEnum):
+    """The error status of an SNMP response as defined in RFC 3416"""
+
+    NO_ERROR = 0
+    TOO_BIG = 1
+    NO_SUCH_NAME = 2
+    BAD_VALUE = 3
+    READ_ONLY = 4
+    GEN_ERR = 5
+    NO_ACCESS = 6
+    WRONG_TYPE = 7
+    WRONG_LENGTH = 8
+    WRONG_ENCODING = 9
+    WRONG_VALUE = 10
+    NO_CREATION = 11
+    INCONSISTENT_VALUE = 12
+    RESOURCE_UNAVAILABLE = 13
+    COMMIT_FAILED = 14
+    UNDO_FAILED = 15
+    AUTHORIZATION_ERROR = 16
+    NOT_WRITABLE = 17
+    INCONSISTENT_NAME = 18
+
+
+class VarBindException(Enum):
+    """The exception values an agent returns in place of a varbind's value"""
+
+    NO_SUCH_OBJECT = 0x80
+    NO_SUCH_INSTANCE = 0x81
+    END_OF_MIB_VIEW = 0x82
+
+
+@dataclass(frozen=True)
+class TimeTicks:
+    """An SNMP TimeTicks value in hundredths of a second, such as the `sysUpTime` of a trap"""
+
+    value: int
+
+
+type Value = int | bytes | OID | TimeTicks | VarBindException | None
+"""A varbind value. `int` is an INTEGER (or a counter or gauge when decoding), `bytes` is an
+OCTET STRING, a tuple is an OBJECT IDENTIFIER, and `None` is NULL.
+"""
+
+
+@dataclass(frozen=True)
+class Message:
+    """An SNMPv2c message"""
+
+    community: bytes
+    pdu_type: PDUType
+    request_id: int
+    error_status: int = 0
+    """The error status of a response. For GETBULK requests, this is the non-repeaters count."""
+
+    error_index: int = 0
+    """The 1-indexed varbind that caused the error of a response. For GETBULK requests, this is the
+    max-repetitions count.
+    """
+
+    varbinds: tuple[tuple[OID, Value], ...] = ()
+    version: int = 1
+    """The SNMP version field, which is 1 for SNMPv2c"""
+
+
+############################################################
+#### Encoding ##############################################
+############################################################
+
+_INTEGER = 0x02
+_OCTET_STRING = 0x04
+_OBJECT_IDENTIFIER = 0x06
+_SEQUENCE = 0x30
+_TIME_TICKS = 0x43
+
+
+def parse_oid(oid: str) -> OID:
+    """Converts a dotted OID string, with or without a leading dot, to an `OID`"""
+    return tuple(int(arc) for arc in oid.strip(".").split("."))
+
+
+def format_oid(oid: OID) -> str:
+    """Converts an `OID` to a dotted OID string with a leading dot"""
+    return "." + ".".join(str(arc) for arc in oid)
+
+
+def encode_length(length: int) -> bytes:
+    """Encodes a BER length in the short form when possible and the long form otherwise"""
+    if length < 0x80:
+        return bytes((length,))
+
+    length_bytes = length.to_bytes((length.bit_length() + 7) // 8, "big")
+    return bytes((0x80 | len(length_bytes),)) + length_bytes
+
+
+def encode_tlv(tag: int, content: bytes) -> bytes:
+    """Encodes a BER tag, length, and value"""
+    return bytes((tag,)) + encode_length(len(content)) + content
+
+
+def encode_integer(value: int, tag: int = _INTEGER) -> bytes:
+    """Encodes an integer in the fewest two's complement bytes"""
+    size = (value + (value < 0)).bit_length() // 8 + 1
+    return encode_tlv(tag, value.to_bytes(size, "big", signed=True))
+
+
+def encode_oid(oid: OID) -> bytes:
+    """Encodes an OID, where the first two arcs are packed into one base 128 sub-identifier"""
+    content = bytearray()
+
+    for sub_identifier in (40 * oid[0] + oid[1], *oid[2:]):
+        chunk = [sub_identifier & 0x7F]
+        sub_identifier >>= 7
+        while sub_identifier:
+            chunk.append(0x80 | (sub_identifier & 0x7F))
+            sub_identifier >>= 7
+        content.extend(reversed(chunk))
+
+    return encode_tlv(_OBJECT_IDENTIFIER, bytes(content))
+
+
+def encode_value(value: Value) -> bytes:
+    """Encodes a varbind value"""
+    match value:
+        case None:
+            return b"\x05\x00"
+        case int():
+            return encode_integer(value)
+        case bytes():
+            return encode_tlv(_OCTET_STRING, value)
+        case tuple():
+            return encode_oid(value)
+        case TimeTicks():
+            return encode_integer(value.value, tag=_TIME_TICKS)
+        case VarBindException():
+            return bytes((value.value, 0))
+
+
+def encode_varbind(oid: OID, value: Value = None) -> bytes:
+    """Encodes a varbind. These can be cached and passed to `encode_message_from_varbinds`."""
+    return encode_tlv(_SEQUENCE, encode_oid(oid) + encode_value(value))
+
+
+def encode_message_from_varbinds(
+    community: bytes,
+    pdu_type: PDUType,
+    request_id: int,
+    encoded_varbinds: bytes,
+    error_status: int = 0,
+    error_index: int = 0,
+    version: int = 1,
+) -> bytes:
+    """Encodes a message from already encoded varbinds, which lets callers reuse the encoding of
+    varbinds that are sent repeatedly
+    """
+    pdu = (
+        encode_integer(request_id)
+        + encode_integer(error_status)
+        + encode_integer(error_index)
+        + encode_tlv(_SEQUENCE, encoded_varbinds)
+    )
+    return encode_tlv(
+        _SEQUENCE,
+        encode_integer(version) + encode_tlv(_OCTET_STRING, community) + encode_tlv(pdu_type, pdu),
+    )
+
+
+def encode_message(message: Message) -> bytes:
+    """Encodes an SNMPv2c message"""
+    return encode_message_from_varbinds(
+        community=message.community,
+        pdu_type=message.pdu_type,
+        request_id=message.request_id,
+        encoded_varbinds=b"".join(encode_varbind(oid, value) for oid, value in message.varbinds),
+        error_status=message.error_status,
+        error_index=message.error_index,
+        version=message.version,
+    )
+
+
+############################################################
+#### Decoding ##############################################
+############################################################
+
+
+def _decode_header(data: bytes, position: int) -> tuple[int, int, int]:
+    """Decodes the tag and length at the position and returns the tag, the position of the
+    content, and the position after the content
+    """
+    try:
+        tag = data[position]
+        length = data[position + 1]
+        position += 2
+
+        if length & 0x80:
+            size = length & 0x7F
+            length = int.from_bytes(data[position : position + size], "big")
+            position += size
+
+    except IndexError:
+        raise ValueError("Truncated BER data") from None
+
+    end = position + length
+    if end > len(data):
+        raise ValueError("Truncated BER data")
+
+    return tag, position, end
+
+
+def _decode_expected(data: bytes, position: int, expected_tag: int) -> tuple[int, int]:
+    """Decodes the header of the expected tag and returns the position of the content and the
+    position after the content
+    """
+    tag, start, end = _decode_header(data, position)
+
+    if tag != expected_tag:
+        raise ValueError(f"Expected BER tag 0x{expected_tag:02x} but found 0x{tag:02x}")
+
+    return start, end
+
+
+def _decode_oid(content: bytes) -> OID:
+    """Decodes the content of an OBJECT IDENTIFIER"""
+    sub_identifiers = []
+    sub_identifier = 0
+
+    for byte in content:
+        sub_identifier = (sub_identifier << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            sub_identifiers.append(sub_identifier)
+            sub_identifier = 0
+
+    if not sub_identifiers:
+        raise ValueError("Empty OBJECT IDENTIFIER")
+
+    first = sub_identifiers[0]
+    if first < 80:
+        return (first // 40, first % 40, *sub_identifiers[1:])
+    return (2, first - 80, *sub_identifiers[1:])
+
+
+def _decode_value(tag: int, content: bytes) -> Value:
+    """Decodes the content of a varbind value"""
+    match tag:
+        # INTEGER
+        case 0x02:
+            return int.from_bytes(content, "big", signed=True)
+        # Counter32, Gauge32, and Counter64
+        case 0x41 | 0x42 | 0x46:
+            return int.from_bytes(content, "big")
+        # TimeTicks
+        case 0x43:
+            return TimeTicks(int.from_bytes(content, "big"))
+        # OCTET STRING, IpAddress, and Opaque
+        case 0x04 | 0x40 | 0x44:
+            return bytes(content)
+        # NULL
+        case 0x05:
+            return None
+        # OBJECT IDENTIFIER
+        case 0x06:
+            return _decode_oid(content)
+        # noSuchObject, noSuchInstance, and endOfMibView
+        case 0x80 | 0x81 | 0x82:
+            return VarBindException(tag)
+        case _:
+            raise ValueError(f"Unsupported BER value tag 0x{tag:02x}")
+
+
+def decode_message(data: bytes) -> Message:
+    """Decodes an SNMPv2c message. A `ValueError` is raised for malformed or unsupported
+    messages.
+    """
+    start, _ = _decode_expected(data, 0, _SEQUENCE)
+
+    start, position = _decode_expected(data, start, _INTEGER)
+    version = int.from_bytes(data[start:position], "big", signed=True)
+
+    start, position = _decode_expected(data, position, _OCTET_STRING)
+    community = data[start:position]
+
+    tag, position, _ = _decode_header(data, position)
+    try:
+        pdu_type = PDUType(tag)
+    except ValueError:
+        raise ValueError(f"Unsupported PDU type 0x{tag:02x}") from None
+
+    integers = []
+    for _ in range(3):
+        start, position = _decode_expected(data, position, _INTEGER)
+        integers.append(int.from_bytes(data[start:position], "big", signed=True))
+
+    varbinds = []
+    position, varbinds_end = _decode_expected(data, position, _SEQUENCE)
+    while position < varbinds_end:
+        position, varbind_end = _decode_expected(data, position, _SEQUENCE)
+
+        start, position = _decode_expected(data, position, _OBJECT_IDENTIFIER)
+        oid = _decode_oid(data[start:position])
+
+        tag, start, position = _decode_header(data, position)
+        varbinds.append((oid, _decode_value(tag, data[start:position])))
+
+        position = varbind_end
+
+    return Message(
+        community=bytes(community),
+        pdu_type=pdu_type,
+        request_id=integers[0],
+        error_status=integers[1],
+        error_index=integers[2],
+        varbinds=tuple(varbinds),
+        version=version,
+    )
+
+
+def _locate_request_id(data: bytes) -> tuple[int, int, int, int, int]:
+    """Locates the request ID of a message and returns the position of the message's content, the
+    position of the PDU, the position of the request ID, the position after the request ID, and
+    the position after the PDU
+    """
+    content_start, _ = _decode_expected(data, 0, _SEQUENCE)
+    _, position = _decode_expected(data, content_start, _INTEGER)
+    _, pdu_position = _decode_expected(data, position, _OCTET_STRING)
+    _, request_id_position, pdu_end = _decode_header(data, pdu_position)
+    _, request_id_end = _decode_expected(data, request_id_position, _INTEGER)
+
+    return content_start, pdu_position, request_id_position, request_id_end, pdu_end
+
+
+def decode_request_id(data: bytes) -> int:
+    """Decodes only the request ID of a message, which is enough to match a response to its request.
+    A `ValueError` is raised for malformed messages.
+    """
+    _, _, request_id_position, request_id_end, _ = _locate_request_id(data)
+    _, start, _ = _decode_header(data, request_id_position)
+    return int.from_bytes(data[start:request_id_end], "big", signed=True)
+
+
+def replace_request_id(data: bytes, request_id: int) -> bytes:
+    """Returns the message with its request ID replaced. The rest of the message is copied as is,
+    so value types that `decode_message` does not preserve, such as counters, are kept intact.
+    """
+    content_start, pdu_position, _, request_id_end, pdu_end = _locate_request_id(data)
+
+    # Only the lengths of the message and the PDU change along with the request ID
+    pdu = encode_tlv(data[pdu_position], encode_integer(request_id) + data[request_id_end:pdu_end])
+    return encode_tlv(_SEQUENCE, data[content_start:pdu_position] + pdu)
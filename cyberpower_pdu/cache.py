@@ -0,0 +1,70 @@
+"""A time-to-live cache of outlet states, used by `CyberPowerPDU` to answer repeated reads of the
+same outlets without sending new SNMP requests to the PDU
+"""
+
+# Core dependencies
+from collections.abc import Sequence
+import time
+
+
+class OutletStateCache:
+    """Caches the state of each outlet for `ttl` seconds after it was last read or set. Outlet
+    numbers are 1-indexed, matching the rest of the library.
+    """
+
+    def __init__(self, ttl: float) -> None:
+        self.__ttl = ttl
+
+        # Maps an outlet number to its state and the monotonic time at which the state expires
+        self.__entries: dict[int, tuple[bool, float]] = {}
+
+    @property
+    def ttl(self) -> float:
+        """The time, in seconds, that an outlet state is cached for"""
+        return self.__ttl
+
+    def get(self, outlet: int) -> bool | None:
+        """Returns the cached state of the outlet or `None` if it is not cached or has expired"""
+        entry = self.__entries.get(outlet)
+
+        if entry is None:
+            return None
+
+        state, expiration_time = entry
+        if time.monotonic() >= expiration_time:
+            del self.__entries[outlet]
+            return None
+
+        return state
+
+    def get_all(self, number_of_outlets: int) -> list[bool] | None:
+        """Returns the cached states of outlets 1 to `number_of_outlets` or `None` if any of them
+        are not cached or have expired
+        """
+        outlet_states = []
+
+        for outlet in range(1, number_of_outlets + 1):
+            state = self.get(outlet)
+            if state is None:
+                return None
+            outlet_states.append(state)
+
+        return outlet_states
+
+    def set(self, outlet: int, state: bool) -> None:
+        """Caches the state of the outlet"""
+        self.__entries[outlet] = (state, time.monotonic() + self.__ttl)
+
+    def set_all(self, outlet_states: Sequence[bool]) -> None:
+        """Caches the states of all outlets, where index 0 corresponds to outlet 1"""
+        expiration_time = time.monotonic() + self.__ttl
+
+        for index, state in enumerate(outlet_states):
+            self.__entries[index + 1] = (state, expiration_time)
+
+    def invalidate(self, outlet: int | None = None) -> None:
+        """Removes the outlet from the cache, or every outlet if `outlet` is `None`"""
+        if outlet is None:
+            self.__entries.clear()
+        else:
+            self.__entries.pop(outlet, None)
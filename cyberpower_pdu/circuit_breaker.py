@@ -0,0 +1,166 @@
+"""A circuit breaker for the requests sent to a single PDU. A PDU that has stopped answering makes
+every request wait out its full timeout and retries, so after enough consecutive failures the
+breaker opens and requests fail immediately instead. Once the reset timeout has passed, a single
+probe request is let through, and the breaker closes again if the PDU answers it.
+"""
+
+# Core dependencies
+from dataclasses import dataclass
+from enum import Enum
+import time
+
+
+class CircuitState(Enum):
+    """The state of a circuit breaker"""
+
+    CLOSED = "closed"
+    """Requests are sent to the PDU as usual"""
+
+    OPEN = "open"
+    """The PDU is considered down and requests fail immediately"""
+
+    HALF_OPEN = "half_open"
+    """The reset timeout has passed and a single probe request may be sent to the PDU"""
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised instead of sending a request to a PDU whose circuit breaker is open"""
+
+
+@dataclass(frozen=True)
+class CircuitBreakerPolicy:
+    """The configuration of a circuit breaker. A policy holds no state, so one policy can be shared
+    by many PDUs, each of which has its own breaker.
+    """
+
+    failure_threshold: int = 5
+    """The number of consecutive failed requests that opens the breaker"""
+
+    reset_timeout: float = 30.0
+    """The time, in seconds, that the breaker stays open before a probe request is let through"""
+
+    def __post_init__(self) -> None:
+        if self.failure_threshold < 1:
+            raise ValueError(
+                f"The failure threshold must be at least 1, but is {self.failure_threshold}"
+            )
+        if self.reset_timeout < 0:
+            raise ValueError(f"The reset timeout can't be negative, but is {self.reset_timeout}")
+
+
+class CircuitBreaker:
+    """Tracks the consecutive failures of a PDU's requests and decides whether a request may be
+    sent. A request is started with `begin_request` and its outcome is reported with
+    `record_success` or `record_failure`, or with `release_probe` if it was abandoned.
+
+    A request that gets any response from the PDU, including an SNMP error, is a success. Only
+    requests that time out or can't be sent are failures.
+    """
+
+    def __init__(self, policy: CircuitBreakerPolicy) -> None:
+        self.__policy = policy
+        self.__state = CircuitState.CLOSED
+        self.__consecutive_failures = 0
+        self.__opened_time = 0.0
+        self.__probe_in_flight = False
+        self.__trips = 0
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def policy(self) -> CircuitBreakerPolicy:
+        return self.__policy
+
+    @property
+    def state(self) -> CircuitState:
+        """The state of the breaker. An open breaker whose reset timeout has passed is half open."""
+        if self.__state is CircuitState.OPEN and self.retry_after == 0:
+            return CircuitState.HALF_OPEN
+        return self.__state
+
+    @property
+    def retry_after(self) -> float:
+        """The time, in seconds, until an open breaker lets a probe request through, or 0 if the
+        breaker is not open
+        """
+        if self.__state is not CircuitState.OPEN:
+            return 0.0
+        elapsed = time.monotonic() - self.__opened_time
+        return max(0.0, self.__policy.reset_timeout - elapsed)
+
+    @property
+    def consecutive_failures(self) -> int:
+        """The number of requests that failed since the last success"""
+        return self.__consecutive_failures
+
+    @property
+    def trips(self) -> int:
+        """The number of times the breaker has opened"""
+        return self.__trips
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    def check(self) -> None:
+        """Raises a `CircuitOpenError` if a request would currently be refused"""
+        match self.state:
+            case CircuitState.OPEN:
+                raise CircuitOpenError(
+                    f"The circuit breaker is open after {self.__consecutive_failures} consecutive "
+                    f"failures, and a probe is sent in {self.retry_after:.1f} seconds"
+                )
+
+            case CircuitState.HALF_OPEN if self.__probe_in_flight:
+                raise CircuitOpenError("The circuit breaker is waiting for its probe request")
+
+    def begin_request(self) -> bool:
+        """Raises a `CircuitOpenError` if the request must not be sent. Otherwise, returns whether
+        the request is the breaker's probe, which must be reported even if it is abandoned.
+        """
+        self.check()
+        if self.state is CircuitState.HALF_OPEN:
+            self.__state = CircuitState.HALF_OPEN
+            self.__probe_in_flight = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Records that the PDU answered a request, which closes the breaker"""
+        self.__state = CircuitState.CLOSED
+        self.__consecutive_failures = 0
+        self.__probe_in_flight = False
+
+    def record_failure(self) -> None:
+        """Records that a request failed, which opens the breaker once enough consecutive requests
+        have failed or if the request was the probe
+        """
+        self.__consecutive_failures += 1
+
+        match self.__state:
+            case CircuitState.HALF_OPEN:
+                self.__open()
+
+            case CircuitState.CLOSED if (
+                self.__consecutive_failures >= self.__policy.failure_threshold
+            ):
+                self.__open()
+
+    def release_probe(self) -> None:
+        """Records that the probe request was abandoned without an outcome, so that the next
+        request is sent as the probe instead
+        """
+        self.__probe_in_flight = False
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __open(self) -> None:
+        """Opens the breaker and starts its reset timeout"""
+        self.__state = CircuitState.OPEN
+        self.__opened_time = time.monotonic()
+        self.__probe_in_flight = False
+        self.__trips += 1
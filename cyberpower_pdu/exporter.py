@@ -0,0 +1,434 @@
+"""A Prometheus exporter for the outlet states and bank loads of many CyberPower PDUs. A background
+collector polls every PDU at a fixed interval and renders the metrics once per sweep, and scrapes of
+`/metrics` are answered from that rendered snapshot. Scrapes therefore never send SNMP requests, so
+however often and however concurrently Prometheus scrapes, the load on the PDUs stays at one sweep
+per interval. PDUs whose circuit breaker is open are skipped and reported as down without waiting
+for them to time out.
+
+Run the exporter with:
+
+```bash
+poetry run python -m cyberpower_pdu.exporter 192.168.1.132 192.168.1.133 --port 9870
+```
+"""
+
+# Core dependencies
+import argparse
+import asyncio
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import time
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU, logger
+from cyberpower_pdu.circuit_breaker import CircuitBreakerPolicy, CircuitState
+from cyberpower_pdu.history import FleetHistory
+from cyberpower_pdu.outlet_states import OutletStates
+from cyberpower_pdu.scheduler import Priority, request_priority
+
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+"""The content type of the Prometheus text exposition format"""
+
+
+@dataclass(frozen=True)
+class PDUSample:
+    """The values collected from a single PDU during one sweep"""
+
+    up: bool
+    """Whether the PDU was read successfully"""
+
+    duration: float
+    """How long reading the PDU took, in seconds"""
+
+    outlet_states: OutletStates = OutletStates(0, 0)
+    """The state of each outlet, where index 0 corresponds to outlet 1"""
+
+    bank_loads: tuple[float, ...] = ()
+    """The load of each bank in amps, where index 0 corresponds to bank 1"""
+
+    circuit_open: bool = False
+    """Whether the PDU was skipped because its circuit breaker is open"""
+
+
+class MetricsCollector:
+    """Polls a fixed set of named PDUs every `interval` seconds and keeps the rendered metrics of
+    the latest sweep. Only the latest sample of each PDU is kept, so memory does not grow with the
+    number of sweeps. At most `max_concurrent_devices` PDUs are read at once, and reading a PDU
+    that takes longer than `timeout` seconds is abandoned and reported with `cyberpower_pdu_up`
+    set to 0.
+
+    The PDUs must already be initialized, unless `initialize_pdus` is `True`, in which case the
+    collector owns them. It then initializes each PDU the first time it is read, so a PDU that is
+    down when the collector starts is picked up once it responds, and closes them when it is
+    closed. If a `history` is given, the samples of the PDUs that were read successfully are also
+    recorded in it.
+    """
+
+    def __init__(
+        self,
+        pdus: Mapping[str, CyberPowerPDU],
+        interval: float = 15.0,
+        timeout: float = 10.0,
+        max_concurrent_devices: int = 64,
+        history: FleetHistory | None = None,
+        initialize_pdus: bool = False,
+    ) -> None:
+        """Initializes the collector from PDUs keyed by name, which is used as the `pdu` label"""
+        self.__pdus = dict(pdus)
+        self.__initialize_pdus = initialize_pdus
+        self.__history = history
+        self.__interval = interval
+        self.__timeout = timeout
+        self.__device_semaphore = asyncio.Semaphore(max_concurrent_devices)
+
+        self.__initialized: set[str] = set()
+        self.__samples: dict[str, PDUSample] = {}
+        self.__sweep_duration = 0.0
+        self.__metrics = b""
+        self.__task: asyncio.Task[None] | None = None
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def metrics(self) -> bytes:
+        """The metrics of the latest sweep in the Prometheus text exposition format. This is empty
+        until the first sweep completes.
+        """
+        return self.__metrics
+
+    @property
+    def samples(self) -> dict[str, PDUSample]:
+        """The latest sample of each PDU keyed by name"""
+        return dict(self.__samples)
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    async def start(self) -> None:
+        """Starts the collection loop"""
+        if self.__task is not None and not self.__task.done():
+            raise RuntimeError("The collector is already running")
+
+        self.__task = asyncio.create_task(self.__run())
+
+    async def close(self) -> None:
+        """Stops the collection loop and closes the connections to the PDUs it initialized"""
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+        await asyncio.gather(
+            *(self.__pdus[name].close() for name in self.__initialized), return_exceptions=True
+        )
+        self.__initialized.clear()
+
+    async def collect(self) -> None:
+        """Reads every PDU once and renders the metrics"""
+        start_time = time.perf_counter()
+        samples = await asyncio.gather(*(self.__collect_pdu(name) for name in self.__pdus))
+
+        self.__samples = dict(zip(self.__pdus, samples))
+        self.__sweep_duration = time.perf_counter() - start_time
+        self.__metrics = self.__render().encode()
+
+        if self.__history is not None:
+            timestamp = time.time()
+            for name, sample in self.__samples.items():
+                if sample.up:
+                    self.__history.record(
+                        name, sample.outlet_states, sample.bank_loads, timestamp=timestamp
+                    )
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    async def __run(self) -> None:
+        """Collects the metrics at a fixed rate"""
+        loop = asyncio.get_running_loop()
+        next_sweep_time = loop.time()
+
+        while True:
+            await self.collect()
+
+            # Sweeps are scheduled at a fixed rate, and sweeps that were missed entirely are skipped
+            next_sweep_time += self.__interval
+            if next_sweep_time < loop.time():
+                next_sweep_time = loop.time()
+            await asyncio.sleep(next_sweep_time - loop.time())
+
+    async def __collect_pdu(self, name: str) -> PDUSample:
+        """Reads a single PDU within the collector's concurrency limit and timeout"""
+        # A PDU whose circuit breaker is open is known to be down, so it doesn't take up a slot
+        circuit_breaker = self.__pdus[name].circuit_breaker
+        if circuit_breaker is not None and circuit_breaker.state is CircuitState.OPEN:
+            return PDUSample(up=False, duration=0.0, circuit_open=True)
+
+        async with self.__device_semaphore:
+            start_time = time.perf_counter()
+            try:
+                outlet_states, bank_loads = await asyncio.wait_for(
+                    self.__read_pdu(name), timeout=self.__timeout
+                )
+            except Exception as exception:  # pylint: disable=broad-exception-caught
+                logger.warning(f"Collecting the metrics of PDU {name} failed: {exception!r}")
+                return PDUSample(up=False, duration=time.perf_counter() - start_time)
+
+            return PDUSample(
+                up=True,
+                duration=time.perf_counter() - start_time,
+                outlet_states=outlet_states,
+                bank_loads=bank_loads,
+            )
+
+    async def __read_pdu(self, name: str) -> tuple[OutletStates, tuple[float, ...]]:
+        """Returns the outlet states and bank loads of the PDU, initializing it first if the
+        collector owns it
+        """
+        pdu = self.__pdus[name]
+        if self.__initialize_pdus and name not in self.__initialized:
+            await pdu.initialize()
+            self.__initialized.add(name)
+
+        # Scrapes are background requests, so they don't hold up commands to the PDU
+        with request_priority(Priority.BACKGROUND):
+            outlet_states = await pdu.get_all_outlet_states()
+            bank_loads = await pdu.get_all_bank_loads()
+        return outlet_states, tuple(bank_loads)
+
+    def __render(self) -> str:
+        """Renders the latest samples in the Prometheus text exposition format, where all samples
+        of a metric are grouped under its help and type lines
+        """
+        labels = {name: _escape_label_value(name) for name in self.__samples}
+        lines: list[str] = []
+
+        _add_metric_family(
+            lines,
+            "cyberpower_pdu_up",
+            "Whether the PDU was read successfully in the latest sweep",
+            (
+                f'{{pdu="{labels[name]}"}} {int(sample.up)}'
+                for name, sample in self.__samples.items()
+            ),
+        )
+        _add_metric_family(
+            lines,
+            "cyberpower_pdu_scrape_duration_seconds",
+            "How long reading the PDU took in the latest sweep",
+            (
+                f'{{pdu="{labels[name]}"}} {sample.duration:.6f}'
+                for name, sample in self.__samples.items()
+            ),
+        )
+        _add_metric_family(
+            lines,
+            "cyberpower_pdu_circuit_open",
+            "Whether the PDU was skipped in the latest sweep because its circuit breaker is open",
+            (
+                f'{{pdu="{labels[name]}"}} {int(sample.circuit_open)}'
+                for name, sample in self.__samples.items()
+            ),
+        )
+        _add_metric_family(
+            lines,
+            "cyberpower_pdu_outlet_state",
+            "Whether the outlet is on (1) or off (0)",
+            (
+                f'{{pdu="{labels[name]}",outlet="{outlet}"}} {int(state)}'
+                for name, sample in self.__samples.items()
+                for outlet, state in enumerate(sample.outlet_states, start=1)
+            ),
+        )
+        _add_metric_family(
+            lines,
+            "cyberpower_pdu_bank_load_amps",
+            "The electrical load of the bank in amps",
+            (
+                f'{{pdu="{labels[name]}",bank="{bank}"}} {load}'
+                for name, sample in self.__samples.items()
+                for bank, load in enumerate(sample.bank_loads, start=1)
+            ),
+        )
+        _add_metric_family(
+            lines,
+            "cyberpower_pdu_exporter_sweep_duration_seconds",
+            "How long reading all PDUs took in the latest sweep",
+            (f" {self.__sweep_duration:.6f}",),
+        )
+
+        return "".join(lines)
+
+
+class MetricsServer:
+    """A minimal HTTP server that answers `GET /metrics` with the collector's latest metrics. Each
+    request is answered from memory and the connection is then closed.
+    """
+
+    def __init__(self, collector: MetricsCollector, request_timeout: float = 5.0) -> None:
+        self.__collector = collector
+        self.__request_timeout = request_timeout
+        self.__server: asyncio.Server | None = None
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The host and port that the server is listening on"""
+        if self.__server is None:
+            raise RuntimeError("The server must be started before it has an address")
+
+        host, port = self.__server.sockets[0].getsockname()[:2]
+        return host, port
+
+    async def start(self, host: str = "0.0.0.0", port: int = 9870) -> None:
+        """Starts listening on the host and port. A port of 0 selects a free port."""
+        self.__server = await asyncio.start_server(self.__handle, host, port)
+        logger.info(f"Serving metrics on http://{self.address[0]}:{self.address[1]}/metrics")
+
+    async def close(self) -> None:
+        """Stops listening"""
+        if self.__server is not None:
+            self.__server.close()
+            await self.__server.wait_closed()
+            self.__server = None
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answers a single HTTP request"""
+        try:
+            request_line = await asyncio.wait_for(
+                self.__read_request(reader), timeout=self.__request_timeout
+            )
+            method, path = (request_line.split() + ["", ""])[:2]
+
+            if method not in ("GET", "HEAD"):
+                status, content_type, body = "405 Method Not Allowed", "text/plain", b""
+            elif path.split("?")[0] != "/metrics":
+                status, content_type, body = "404 Not Found", "text/plain", b""
+            else:
+                status, content_type, body = "200 OK", CONTENT_TYPE, self.__collector.metrics
+
+            writer.write(
+                f"HTTP/1.1 {status}\r\n"
+                f"Content-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                "Connection: close\r\n\r\n".encode()
+            )
+            if method != "HEAD":
+                writer.write(body)
+            await writer.drain()
+
+        except (TimeoutError, ConnectionError, ValueError) as exception:
+            logger.debug(f"Dropping metrics request: {exception!r}")
+
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def __read_request(reader: asyncio.StreamReader) -> str:
+        """Reads the request's headers and returns the request line"""
+        request_line = (await reader.readline()).decode("latin-1")
+
+        # The headers are read and ignored so that the client doesn't see the connection reset
+        while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+            pass
+
+        return request_line
+
+
+async def serve(
+    pdus: Mapping[str, CyberPowerPDU],
+    host: str = "0.0.0.0",
+    port: int = 9870,
+    interval: float = 15.0,
+    timeout: float = 10.0,
+    max_concurrent_devices: int = 64,
+    initialize_pdus: bool = False,
+) -> None:
+    """Collects the PDUs' metrics and serves them on `/metrics` until cancelled. See
+    `MetricsCollector` for `initialize_pdus`.
+    """
+    collector = MetricsCollector(
+        pdus,
+        interval=interval,
+        timeout=timeout,
+        max_concurrent_devices=max_concurrent_devices,
+        initialize_pdus=initialize_pdus,
+    )
+    server = MetricsServer(collector)
+
+    await collector.start()
+    try:
+        await server.start(host, port)
+        await asyncio.Event().wait()
+    finally:
+        await server.close()
+        await collector.close()
+
+
+def main() -> None:
+    """Runs the exporter from the command line"""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("ip_addresses", nargs="+", help="IP addresses of the PDUs")
+    parser.add_argument("--host", default="0.0.0.0", help="address to listen on")
+    parser.add_argument("--port", type=int, default=9870, help="port to listen on")
+    parser.add_argument("--interval", type=float, default=15.0, help="seconds between sweeps")
+    parser.add_argument("--timeout", type=float, default=10.0, help="seconds allowed per PDU")
+    parser.add_argument("--max-concurrent-devices", type=int, default=64)
+    parser.add_argument("--simulate", action="store_true", help="simulate the PDUs")
+    arguments = parser.parse_args()
+
+    # The PDUs fail fast while they are down, so a dead PDU doesn't hold up every sweep
+    pdus = {
+        ip_address: CyberPowerPDU(
+            ip_address=ip_address,
+            simulate=arguments.simulate,
+            circuit_breaker_policy=CircuitBreakerPolicy(),
+        )
+        for ip_address in arguments.ip_addresses
+    }
+
+    try:
+        asyncio.run(
+            serve(
+                pdus,
+                host=arguments.host,
+                port=arguments.port,
+                interval=arguments.interval,
+                timeout=arguments.timeout,
+                max_concurrent_devices=arguments.max_concurrent_devices,
+                initialize_pdus=True,
+            )
+        )
+    except KeyboardInterrupt:
+        pass
+
+
+############################################################
+#### Private functions #####################################
+############################################################
+
+
+def _add_metric_family(
+    lines: list[str], name: str, description: str, samples: Iterable[str]
+) -> None:
+    """Adds the help and type lines of a gauge followed by its samples, which are the labels and
+    value that follow the metric's name
+    """
+    lines.append(f"# HELP {name} {description}\n# TYPE {name} gauge\n")
+    lines.extend(f"{name}{sample}\n" for sample in samples)
+
+
+def _escape_label_value(value: str) -> str:
+    """Escapes a label value for the Prometheus text exposition format"""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+if __name__ == "__main__":
+    main()
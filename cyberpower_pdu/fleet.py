@@ -0,0 +1,200 @@
+"""Concurrent control of many CyberPower PDUs from a single event loop. Every fleet-wide operation
+returns the results of the PDUs that succeeded alongside the errors of the PDUs that did not, so a
+single unresponsive PDU does not fail or stall the whole fleet. PDUs whose circuit breaker is open
+are skipped without waiting for a concurrency slot and reported with a `CircuitOpenError`.
+"""
+
+# Core dependencies
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Mapping
+from dataclasses import dataclass, field
+from typing import Any
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU, OutletCommand, OutletMetrics, logger
+from cyberpower_pdu.outlet_states import OutletStates
+
+
+@dataclass
+class FleetResult[T]:
+    """The outcome of an operation run across the fleet. Each PDU's name is found in exactly one
+    of `results` or `errors`.
+    """
+
+    results: dict[str, T] = field(default_factory=dict)
+    """The results of the PDUs for which the operation succeeded"""
+
+    errors: dict[str, Exception] = field(default_factory=dict)
+    """The exceptions of the PDUs for which the operation failed or timed out"""
+
+    @property
+    def ok(self) -> bool:
+        """Whether the operation succeeded on every PDU"""
+        return not self.errors
+
+
+class PDUFleet:
+    """A collection of named `CyberPowerPDU` instances that are operated on concurrently. The
+    number of PDUs being operated on at once is limited by `max_concurrent_devices`, and the
+    number of operations in flight to any single host is limited by `max_concurrent_per_host`.
+    PDUs that share an IP address and port share the host's limit, and each simulated PDU is a
+    host of its own.
+    """
+
+    def __init__(
+        self,
+        pdus: Mapping[str, CyberPowerPDU],
+        max_concurrent_devices: int = 64,
+        max_concurrent_per_host: int = 1,
+        timeout: float | None = 10.0,
+    ) -> None:
+        """Initializes the fleet from PDUs keyed by name, which is typically their IP address.
+        `timeout` is the time, in seconds, after which an operation on a single PDU is abandoned
+        and reported as an error. `None` disables the timeout.
+        """
+        self.__pdus = dict(pdus)
+        self.__timeout = timeout
+        self.__device_semaphore = asyncio.Semaphore(max_concurrent_devices)
+
+        # PDUs are grouped into hosts by their address, and a simulated PDU, which has no address,
+        # is grouped by its name
+        self.__host_keys: dict[str, Hashable] = {
+            name: name if pdu.address is None else pdu.address for name, pdu in self.__pdus.items()
+        }
+        self.__host_semaphores = {
+            key: asyncio.Semaphore(max_concurrent_per_host) for key in self.__host_keys.values()
+        }
+
+    @classmethod
+    def from_ip_addresses(
+        cls,
+        ip_addresses: Iterable[str],
+        max_concurrent_devices: int = 64,
+        max_concurrent_per_host: int = 1,
+        timeout: float | None = 10.0,
+        **pdu_arguments: Any,
+    ) -> "PDUFleet":
+        """Creates a fleet with a `CyberPowerPDU` for each IP address, which is also used as the
+        PDU's name. The remaining keyword arguments are passed to each `CyberPowerPDU`.
+        """
+        return cls(
+            {
+                ip_address: CyberPowerPDU(ip_address=ip_address, **pdu_arguments)
+                for ip_address in ip_addresses
+            },
+            max_concurrent_devices=max_concurrent_devices,
+            max_concurrent_per_host=max_concurrent_per_host,
+            timeout=timeout,
+        )
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def pdus(self) -> dict[str, CyberPowerPDU]:
+        """The PDUs of the fleet keyed by name"""
+        return dict(self.__pdus)
+
+    ############################################################
+    #### Fleet operations ######################################
+    ############################################################
+
+    async def initialize(self, names: Iterable[str] | None = None) -> FleetResult[None]:
+        """Initializes the connection to the PDUs"""
+        return await self.__run(lambda pdu: pdu.initialize(), names)
+
+    async def close(self, names: Iterable[str] | None = None) -> FleetResult[None]:
+        """Closes the connection to the PDUs"""
+        return await self.__run(lambda pdu: pdu.close(), names, skip_open_circuits=False)
+
+    async def get_all_outlet_states(
+        self, names: Iterable[str] | None = None
+    ) -> FleetResult[OutletStates]:
+        """Get the state of all outlets of the PDUs. See `CyberPowerPDU.get_all_outlet_states`."""
+        return await self.__run(lambda pdu: pdu.get_all_outlet_states(), names)
+
+    async def get_all_bank_loads(
+        self, names: Iterable[str] | None = None
+    ) -> FleetResult[list[float]]:
+        """Get the load of all banks of the PDUs in amps. See `CyberPowerPDU.get_all_bank_loads`."""
+        return await self.__run(lambda pdu: pdu.get_all_bank_loads(), names)
+
+    async def get_outlet_metrics(
+        self, names: Iterable[str] | None = None
+    ) -> FleetResult[OutletMetrics]:
+        """Get the current, power, and energy of all outlets of the PDUs. See
+        `CyberPowerPDU.get_outlet_metrics`.
+        """
+        return await self.__run(lambda pdu: pdu.get_outlet_metrics(), names)
+
+    async def send_outlet_command(
+        self, outlet: int, command: OutletCommand, names: Iterable[str] | None = None
+    ) -> FleetResult[None]:
+        """Send a command to the given outlet of the PDUs"""
+        return await self.__run(lambda pdu: pdu.send_outlet_command(outlet, command), names)
+
+    async def send_outlet_commands(
+        self, commands: Mapping[int, OutletCommand], names: Iterable[str] | None = None
+    ) -> FleetResult[None]:
+        """Send the commands, which map outlet numbers to commands, to each of the PDUs"""
+        return await self.__run(lambda pdu: pdu.send_outlet_commands(commands), names)
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    async def __run[
+        T
+    ](
+        self,
+        operation: Callable[[CyberPowerPDU], Awaitable[T]],
+        names: Iterable[str] | None,
+        skip_open_circuits: bool = True,
+    ) -> FleetResult[T]:
+        """Runs the operation on the named PDUs, or all PDUs if `names` is `None`, and collects
+        the results and errors. Unless `skip_open_circuits` is `False`, PDUs whose circuit breaker
+        is open fail with a `CircuitOpenError` without running the operation.
+        """
+        selected_names = list(self.__pdus if names is None else names)
+
+        for name in selected_names:
+            if name not in self.__pdus:
+                raise KeyError(f"No PDU named {name} exists in the fleet")
+
+        outcomes = await asyncio.gather(
+            *(self.__run_on_pdu(name, operation, skip_open_circuits) for name in selected_names),
+            return_exceptions=True,
+        )
+
+        fleet_result: FleetResult[T] = FleetResult()
+        for name, outcome in zip(selected_names, outcomes):
+            if isinstance(outcome, Exception):
+                logger.warning(f"Operation on PDU {name} failed: {outcome!r}")
+                fleet_result.errors[name] = outcome
+            elif isinstance(outcome, BaseException):
+                # Cancellation and other non-`Exception` errors are not a per-device failure
+                raise outcome
+            else:
+                fleet_result.results[name] = outcome
+
+        return fleet_result
+
+    async def __run_on_pdu[
+        T
+    ](
+        self,
+        name: str,
+        operation: Callable[[CyberPowerPDU], Awaitable[T]],
+        skip_open_circuits: bool,
+    ) -> T:
+        """Runs the operation on a single PDU within the fleet's concurrency limits and timeout"""
+        # A dead PDU is skipped before it takes up one of the fleet's concurrency slots
+        circuit_breaker = self.__pdus[name].circuit_breaker
+        if skip_open_circuits and circuit_breaker is not None:
+            circuit_breaker.check()
+
+        # The host's slot is taken first, so a PDU waiting for its busy host doesn't hold one of
+        # the device slots that other hosts' PDUs could use
+        async with self.__host_semaphores[self.__host_keys[name]], self.__device_semaphore:
+            return await asyncio.wait_for(operation(self.__pdus[name]), timeout=self.__timeout)
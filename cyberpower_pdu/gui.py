@@ -147,16 +147,17 @@ class MainWindow(QWidget):  # type: ignore[misc]
     @no_type_check
     async def get_outlet_statuses(self) -> None:
         """Retrieves the status of all outlets by setting the outlet controls' LED indicators
-        directly. This can take up to 1.2 seconds or so, so use it carefully since it could
-        potentially lock up the GUI or thread that it is running on.
+        directly. The outlet states are requested in as few SNMP requests as the PDU allows,
+        which is usually a single round trip.
         """
 
+        outlet_states = await self.__pdu.get_all_outlet_states()
+
         # We index here because we create a total of 16 outlet controls, but the PDU may
         # support less than that.
 
         for index in range(0, self.__number_of_outlets):
-            outlet_control = self.__outlet_controls[index]
-            outlet_control.checked = await self.__pdu.get_outlet_state(outlet_control.outlet)
+            self.__outlet_controls[index].checked = outlet_states[index]
 
     @Slot(OutletControl)
     @no_type_check
@@ -170,8 +171,8 @@ class MainWindow(QWidget):  # type: ignore[misc]
 
         await self.__pdu.send_outlet_command(outlet_control.outlet, command)
 
-        # Since it takes a long time (approximately 1.2 seconds) to query the state of up to
-        # 16 outlets, we simply fire off two state checks for the outlet that was commanded.
+        # Rather than refreshing every outlet, we simply fire off two state checks for the outlet
+        # that was commanded.
         # The state checks are sent 0.5 seconds and 1 second after the command is sent, as it
         # can take the PDU some time to actually physically toggle the state and return the
         # state correctly in the SNMP response. This of course leaves open the possibility of
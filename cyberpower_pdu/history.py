@@ -0,0 +1,319 @@
+"""Fixed-size, in-process history of polled PDU telemetry. Each PDU's history is a set of ring
+buffers preallocated as `array`s and `bytearray`s, so recording a sample is O(1) and never
+allocates, and memory stays constant however long the PDUs are polled. The outlet states of a sample
+are stored as bits, and the samples of a bank or outlet within a time window are read back as
+strided slices of the buffers, so that window queries run over contiguous machine values rather than
+Python objects.
+"""
+
+# Core dependencies
+from array import array
+from bisect import bisect_left
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass
+import math
+import time
+
+# Project dependencies
+from cyberpower_pdu.outlet_states import OutletStates
+from cyberpower_pdu.percentile import nearest_rank
+
+
+@dataclass(frozen=True)
+class WindowSummary:
+    """Statistics of the samples of a value within a time window"""
+
+    samples: int
+    """The number of samples within the window"""
+
+    min: float
+    max: float
+    mean: float
+
+    percentiles: dict[float, float]
+    """The requested percentiles, keyed by percentile, using the nearest-rank method"""
+
+
+class PDUHistory:
+    """The latest `capacity` samples of a single PDU's outlet states and bank loads. Once full, each
+    new sample overwrites the oldest. Samples must be recorded in timestamp order.
+
+    ```python
+    history = PDUHistory(number_of_outlets=16, number_of_banks=2, capacity=3600)
+    history.append(await pdu.get_all_outlet_states(), await pdu.get_all_bank_loads())
+
+    summary = history.bank_load_summary(1, seconds=300)
+    print(summary.mean, summary.percentiles[99])
+    ```
+    """
+
+    def __init__(self, number_of_outlets: int, number_of_banks: int, capacity: int = 3600) -> None:
+        if capacity < 1:
+            raise ValueError(f"The capacity must be at least 1, but is {capacity}")
+
+        self.__number_of_outlets = number_of_outlets
+        self.__number_of_banks = number_of_banks
+        self.__capacity = capacity
+
+        # Each sample's outlet states are packed into `__state_width` bytes with outlet 1 in the
+        # lowest bit, and its bank loads are `number_of_banks` consecutive values
+        self.__state_width = (number_of_outlets + 7) // 8
+        self.__timestamps = array("d", [0.0]) * capacity
+        self.__outlet_states = bytearray(self.__state_width * capacity)
+        self.__bank_loads = array("d", [math.nan]) * (number_of_banks * capacity)
+
+        # The slot that the next sample is written to and the number of samples held
+        self.__next_slot = 0
+        self.__size = 0
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def number_of_outlets(self) -> int:
+        return self.__number_of_outlets
+
+    @property
+    def number_of_banks(self) -> int:
+        return self.__number_of_banks
+
+    @property
+    def capacity(self) -> int:
+        """The number of samples held before the oldest are overwritten"""
+        return self.__capacity
+
+    def __len__(self) -> int:
+        return self.__size
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    def append(
+        self,
+        outlet_states: Sequence[bool],
+        bank_loads: Sequence[float] = (),
+        timestamp: float | None = None,
+    ) -> None:
+        """Records a sample. `timestamp` is in seconds since the epoch and defaults to now. Bank
+        loads that are not given are recorded as `nan`.
+        """
+        if len(outlet_states) != self.__number_of_outlets:
+            raise ValueError(
+                f"Expected {self.__number_of_outlets} outlet states, but got {len(outlet_states)}"
+            )
+        if len(bank_loads) not in (0, self.__number_of_banks):
+            raise ValueError(
+                f"Expected {self.__number_of_banks} bank loads, but got {len(bank_loads)}"
+            )
+
+        if timestamp is None:
+            timestamp = time.time()
+        if self.__size > 0 and timestamp < self.__timestamps[self.__next_slot - 1]:
+            raise ValueError("Samples must be appended in timestamp order")
+
+        slot = self.__next_slot
+        self.__timestamps[slot] = timestamp
+
+        mask = OutletStates.from_states(outlet_states).mask
+        width = self.__state_width
+        self.__outlet_states[slot * width : (slot + 1) * width] = mask.to_bytes(width, "little")
+
+        banks = self.__number_of_banks
+        for bank in range(banks):
+            self.__bank_loads[slot * banks + bank] = bank_loads[bank] if bank_loads else math.nan
+
+        self.__next_slot = (slot + 1) % self.__capacity
+        self.__size = min(self.__size + 1, self.__capacity)
+
+    def add_banks(self, number_of_banks: int) -> None:
+        """Adds the bank load buffers to a history created without banks, such as one whose first
+        samples had no bank loads. The samples already recorded are kept, with loads of `nan`.
+        """
+        if self.__number_of_banks != 0:
+            raise ValueError(f"The history already has {self.__number_of_banks} banks")
+
+        self.__number_of_banks = number_of_banks
+        self.__bank_loads = array("d", [math.nan]) * (number_of_banks * self.__capacity)
+
+    def timestamps(self, seconds: float, now: float | None = None) -> array[float]:
+        """Returns the timestamps of the samples within the last `seconds` seconds, oldest first"""
+        return self.__gather(self.__timestamps, 1, 0, self.__window(seconds, now))
+
+    def bank_loads(self, bank: int, seconds: float, now: float | None = None) -> array[float]:
+        """Returns the bank's loads, in amps, within the last `seconds` seconds, oldest first"""
+        self.__check_bank(bank)
+        return self.__gather(
+            self.__bank_loads, self.__number_of_banks, bank - 1, self.__window(seconds, now)
+        )
+
+    def bank_load_summary(
+        self,
+        bank: int,
+        seconds: float,
+        percentiles: Iterable[float] = (50, 90, 99),
+        now: float | None = None,
+    ) -> WindowSummary | None:
+        """Returns the statistics of the bank's load within the last `seconds` seconds, or `None`
+        if there are no samples of the bank's load within the window. The window's loads are read
+        as one strided slice and then copied and sorted for the percentiles, so a summary takes
+        O(n log n) time in the number of samples in the window.
+        """
+        loads = [load for load in self.bank_loads(bank, seconds, now) if not math.isnan(load)]
+        if not loads:
+            return None
+
+        loads.sort()
+        return WindowSummary(
+            samples=len(loads),
+            min=loads[0],
+            max=loads[-1],
+            mean=math.fsum(loads) / len(loads),
+            percentiles={
+                percentile: nearest_rank(loads, percentile / 100) for percentile in percentiles
+            },
+        )
+
+    def outlet_states(self, outlet: int, seconds: float, now: float | None = None) -> list[bool]:
+        """Returns the outlet's states within the last `seconds` seconds, oldest first"""
+        byte, bit = self.__locate_outlet(outlet)
+        states = self.__gather_states(byte, self.__window(seconds, now))
+        return [bool(value >> bit & 1) for value in states]
+
+    def outlet_on_fraction(
+        self, outlet: int, seconds: float, now: float | None = None
+    ) -> float | None:
+        """Returns the fraction of the samples within the last `seconds` seconds in which the
+        outlet was on, or `None` if there are no samples within the window
+        """
+        byte, bit = self.__locate_outlet(outlet)
+        states = self.__gather_states(byte, self.__window(seconds, now))
+        if not states:
+            return None
+
+        # Mapping each byte to its bit turns the count into a single pass in C
+        return states.translate(_BIT_TABLES[bit]).count(1) / len(states)
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __window(self, seconds: float, now: float | None) -> list[tuple[int, int]]:
+        """Returns the ranges of slots, oldest first, holding the samples of the last `seconds`
+        seconds. The window wraps around the end of the buffers at most once, so there are at most
+        two ranges.
+        """
+        if now is None:
+            now = time.time()
+
+        oldest_slot = (self.__next_slot - self.__size) % self.__capacity
+
+        # The samples are in timestamp order, so the start of the window is found by bisecting
+        # the samples in their logical order
+        first = bisect_left(
+            range(self.__size),
+            now - seconds,
+            key=lambda index: self.__timestamps[(oldest_slot + index) % self.__capacity],
+        )
+
+        start = (oldest_slot + first) % self.__capacity
+        count = self.__size - first
+        if start + count <= self.__capacity:
+            return [(start, start + count)]
+        return [(start, self.__capacity), (0, start + count - self.__capacity)]
+
+    @staticmethod
+    def __gather(
+        values: array[float], stride: int, offset: int, ranges: list[tuple[int, int]]
+    ) -> array[float]:
+        """Returns the strided column at `offset` of the slot ranges"""
+        column = array("d")
+        for start, end in ranges:
+            column.extend(values[start * stride + offset : end * stride : stride])
+        return column
+
+    def __gather_states(self, byte: int, ranges: list[tuple[int, int]]) -> bytes:
+        """Returns the byte holding an outlet's state from each sample in the slot ranges"""
+        width = self.__state_width
+        return b"".join(
+            self.__outlet_states[start * width + byte : end * width : width]
+            for start, end in ranges
+        )
+
+    def __locate_outlet(self, outlet: int) -> tuple[int, int]:
+        """Returns the byte and bit holding the outlet's state within a sample"""
+        if not 0 < outlet <= self.__number_of_outlets:
+            raise ValueError(
+                f"Invalid outlet value of: {outlet}. Valid outlet values "
+                f"are 1 to {self.__number_of_outlets}"
+            )
+        return divmod(outlet - 1, 8)
+
+    def __check_bank(self, bank: int) -> None:
+        """Raises a `ValueError` if the bank is out of range"""
+        if not 0 < bank <= self.__number_of_banks:
+            raise ValueError(
+                f"Invalid bank value of: {bank}. Valid bank values "
+                f"are 1 to {self.__number_of_banks}"
+            )
+
+
+class FleetHistory:
+    """The `PDUHistory` of each of many named PDUs. A PDU's history is created with `capacity`
+    samples when its first sample is recorded, so the memory used is fixed per PDU.
+    """
+
+    def __init__(self, capacity: int = 3600) -> None:
+        self.__capacity = capacity
+        self.__histories: dict[str, PDUHistory] = {}
+
+    def __getitem__(self, name: str) -> PDUHistory:
+        return self.__histories[name]
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.__histories
+
+    @property
+    def names(self) -> list[str]:
+        """The names of the PDUs with a history"""
+        return list(self.__histories)
+
+    def record(
+        self,
+        name: str,
+        outlet_states: Sequence[bool],
+        bank_loads: Sequence[float] = (),
+        timestamp: float | None = None,
+    ) -> None:
+        """Records a sample of the named PDU. If the PDU's number of outlets or banks changed, its
+        history is started over. Bank loads that first show up after samples without them are
+        added to the existing history instead.
+        """
+        history = self.__histories.get(name)
+        if history is not None and bank_loads and history.number_of_banks == 0:
+            history.add_banks(len(bank_loads))
+
+        if (
+            history is None
+            or history.number_of_outlets != len(outlet_states)
+            or (bank_loads and history.number_of_banks != len(bank_loads))
+        ):
+            history = self.__histories[name] = PDUHistory(
+                len(outlet_states), len(bank_loads), self.__capacity
+            )
+
+        history.append(outlet_states, bank_loads, timestamp)
+
+    def remove(self, name: str) -> None:
+        """Drops the named PDU's history"""
+        self.__histories.pop(name, None)
+
+
+############################################################
+#### Private functions #####################################
+############################################################
+
+
+# For each bit, a translation table mapping a byte to 1 if that bit is set and 0 otherwise
+_BIT_TABLES = [bytes(value >> bit & 1 for value in range(256)) for bit in range(8)]
@@ -0,0 +1,234 @@
+"""An opt-in, on-disk cache of the metadata of PDUs, such as their number of outlets and banks,
+model, firmware, and outlet names. Metadata rarely changes, so with the cache, `initialize` loads it
+from disk instead of querying the PDU, and short-lived processes skip the round trips of
+initialization. Each PDU's metadata is kept in its own JSON file, which is replaced atomically, so
+any number of processes can share the cache.
+"""
+
+# Core dependencies
+from dataclasses import dataclass
+import json
+import logging
+import math
+import os
+from pathlib import Path
+import re
+import tempfile
+import time
+from typing import Any
+
+
+# This is the package's logger, which can't be imported from the package since the package imports
+# this module
+logger = logging.getLogger("CyberPowerPDU")
+
+# The version of the cache files' format, which is bumped whenever the format changes so that files
+# written by other versions of the library are ignored
+_FORMAT_VERSION = 1
+
+
+@dataclass(frozen=True)
+class DeviceMetadata:
+    """The metadata of a PDU that is read when it is initialized"""
+
+    number_of_outlets: int
+    number_of_banks: int
+
+    model: str = ""
+    """The model number, or an empty string if the PDU doesn't report it"""
+
+    firmware: str = ""
+    """The firmware revision, or an empty string if the PDU doesn't report it"""
+
+    serial_number: str = ""
+    """The serial number, or an empty string if the PDU doesn't report it"""
+
+    outlet_names: tuple[str, ...] = ()
+    """The name of each outlet, where index 0 corresponds to outlet 1"""
+
+
+@dataclass(frozen=True)
+class CachedMetadata:
+    """A PDU's metadata loaded from the cache"""
+
+    metadata: DeviceMetadata
+
+    age: float
+    """The time, in seconds, since the metadata was read from the PDU"""
+
+    expired: bool
+    """Whether the metadata is older than the cache's TTL and should be refreshed"""
+
+
+class MetadataCache:
+    """Stores the metadata of PDUs, keyed by host and port, as files in `directory`, which defaults
+    to `cyberpower_pdu` in the user's cache directory. Metadata older than `ttl` seconds is still
+    loaded but marked as expired.
+
+    ```python
+    cache = MetadataCache(ttl=24 * 60 * 60)
+    pdu = CyberPowerPDU(ip_address="192.168.1.132", metadata_cache=cache)
+    await pdu.initialize()
+    ```
+    """
+
+    def __init__(
+        self, directory: str | os.PathLike[str] | None = None, ttl: float = 86400.0
+    ) -> None:
+        if ttl < 0:
+            raise ValueError(f"The TTL can't be negative, but is {ttl}")
+
+        if directory is None:
+            cache_home = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+            directory = Path(cache_home) / "cyberpower_pdu"
+
+        self.__directory = Path(directory)
+        self.__ttl = ttl
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def directory(self) -> Path:
+        """The directory holding the cache files"""
+        return self.__directory
+
+    @property
+    def ttl(self) -> float:
+        """The time, in seconds, after which cached metadata is refreshed"""
+        return self.__ttl
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    def load(self, host: str, port: int) -> CachedMetadata | None:
+        """Returns the PDU's cached metadata, or `None` if there is none or it is invalid"""
+        path = self.__get_path(host, port)
+        try:
+            with open(path, encoding="utf-8") as file:
+                document = json.load(file)
+            metadata, stored_time = _parse_document(document, host, port)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as exception:
+            logger.debug(f"Ignoring the cached metadata in {path}: {exception}")
+            return None
+
+        # Metadata stored in the future, such as after the clock was set back, is refreshed
+        age = time.time() - stored_time
+        return CachedMetadata(metadata=metadata, age=age, expired=not 0 <= age <= self.__ttl)
+
+    def store(self, host: str, port: int, metadata: DeviceMetadata) -> None:
+        """Stores the PDU's metadata. Failing to write the cache is logged rather than raised, since
+        the cache only saves requests.
+        """
+        document = {
+            "version": _FORMAT_VERSION,
+            "host": host,
+            "port": port,
+            "stored_time": time.time(),
+            "number_of_outlets": metadata.number_of_outlets,
+            "number_of_banks": metadata.number_of_banks,
+            "model": metadata.model,
+            "firmware": metadata.firmware,
+            "serial_number": metadata.serial_number,
+            "outlet_names": list(metadata.outlet_names),
+        }
+
+        path = self.__get_path(host, port)
+        try:
+            self.__directory.mkdir(parents=True, exist_ok=True)
+
+            # The file is written next to its final path and then renamed over it, so concurrent
+            # readers see either the old or the new metadata, never a partial file
+            file = tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.__directory, suffix=".tmp", delete=False
+            )
+        except OSError as exception:
+            logger.warning(f"Failed to write the cached metadata to {path}: {exception}")
+            return
+
+        try:
+            with file:
+                json.dump(document, file)
+            os.replace(file.name, path)
+        except BaseException as exception:
+            # The temporary file is removed whatever went wrong, so failed writes don't leave
+            # stray files in the cache directory
+            try:
+                os.remove(file.name)
+            except OSError:
+                pass
+
+            if not isinstance(exception, OSError):
+                raise
+            logger.warning(f"Failed to write the cached metadata to {path}: {exception}")
+
+    def invalidate(self, host: str, port: int) -> None:
+        """Removes the PDU's cached metadata"""
+        try:
+            os.remove(self.__get_path(host, port))
+        except FileNotFoundError:
+            pass
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __get_path(self, host: str, port: int) -> Path:
+        """Returns the path of the PDU's cache file"""
+        # Characters that aren't safe in file names, such as the colons of IPv6 addresses, are
+        # replaced. The host and port stored in the file tell apart hosts that end up the same.
+        return self.__directory / f"{re.sub(r'[^A-Za-z0-9.-]', '_', host)}_{port}.json"
+
+
+############################################################
+#### Private functions #####################################
+############################################################
+
+
+def _parse_document(document: Any, host: str, port: int) -> tuple[DeviceMetadata, float]:
+    """Validates a cache file's contents and returns the metadata and the time it was stored. A
+    `ValueError` is raised if the contents are not valid metadata of the PDU.
+    """
+    if not isinstance(document, dict) or document.get("version") != _FORMAT_VERSION:
+        raise ValueError("The file is not in the current format")
+    if document.get("host") != host or document.get("port") != port:
+        raise ValueError(f"The file holds the metadata of {document.get('host')}")
+
+    number_of_outlets = document.get("number_of_outlets")
+    number_of_banks = document.get("number_of_banks")
+    stored_time = document.get("stored_time")
+    outlet_names = document.get("outlet_names")
+    model = document.get("model")
+    firmware = document.get("firmware")
+    serial_number = document.get("serial_number")
+
+    if not isinstance(number_of_outlets, int) or number_of_outlets < 1:
+        raise ValueError(f"Invalid number of outlets: {number_of_outlets!r}")
+    if not isinstance(number_of_banks, int) or number_of_banks < 0:
+        raise ValueError(f"Invalid number of banks: {number_of_banks!r}")
+    if not isinstance(stored_time, (int, float)) or not math.isfinite(stored_time):
+        raise ValueError(f"Invalid stored time: {stored_time!r}")
+    if not (
+        isinstance(model, str) and isinstance(firmware, str) and isinstance(serial_number, str)
+    ):
+        raise ValueError("The model, firmware, and serial number must be strings")
+    if (
+        not isinstance(outlet_names, list)
+        or not all(isinstance(name, str) for name in outlet_names)
+        or len(outlet_names) not in (0, number_of_outlets)
+    ):
+        raise ValueError("The outlet names don't match the number of outlets")
+
+    metadata = DeviceMetadata(
+        number_of_outlets=number_of_outlets,
+        number_of_banks=number_of_banks,
+        model=model,
+        firmware=firmware,
+        serial_number=serial_number,
+        outlet_names=tuple(outlet_names),
+    )
+    return metadata, float(stored_time)
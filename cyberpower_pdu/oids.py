@@ -0,0 +1,44 @@
+"""The CyberPower OIDs used by the library, which correspond to the CyberPower_MIB_v2.11.mib file.
+The hardware backend, the local SNMP agent, and the trap receiver all import them from here, so
+that the client and the agent can't disagree about an OID. See the README for their descriptions.
+"""
+
+# Project dependencies
+from cyberpower_pdu.ber import parse_oid
+
+
+OUTLET_COUNT_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.3.1.3.0")
+"""ePDUOutletDevNumCntrlOutlets"""
+
+BANK_COUNT_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.2.1.4.0")
+"""ePDULoadDevNumBanks"""
+
+MODEL_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.1.5.0")
+"""ePDUIdentModelNumber"""
+
+FIRMWARE_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.1.3.0")
+"""ePDUIdentFirmwareRev"""
+
+SERIAL_NUMBER_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.1.6.0")
+"""ePDUIdentSerialNumber"""
+
+OUTLET_NAME_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.3.3.1.1.2")
+"""ePDUOutletControlOutletName, a display string of at most 32 characters, indexed by outlet"""
+
+OUTLET_STATE_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.3.5.1.1.4")
+"""ePDUOutletStatusOutletState, indexed by outlet"""
+
+OUTLET_COMMAND_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.3.3.3.1.1.4")
+"""ePDUOutletControlOutletCommand, indexed by outlet"""
+
+BANK_LOAD_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.6.5.4.1.5")
+"""ePDU2BankStatusLoad, in tenths of amps, indexed by bank"""
+
+OUTLET_CURRENT_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.6.6.1.4.1.6")
+"""ePDU2OutletMeteredStatusLoad, in tenths of amps, indexed by outlet"""
+
+OUTLET_POWER_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.6.6.1.4.1.7")
+"""ePDU2OutletMeteredStatusActivePower, in watts, indexed by outlet"""
+
+OUTLET_ENERGY_OID = parse_oid(".1.3.6.1.4.1.3808.1.1.6.6.1.4.1.11")
+"""ePDU2OutletMeteredStatusEnergy, in tenths of kilowatt hours, indexed by outlet"""
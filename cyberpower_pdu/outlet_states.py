@@ -0,0 +1,183 @@
+"""An immutable, bitmask-backed representation of the state of all outlets of a PDU. It is returned
+by `CyberPowerPDU.get_all_outlet_states` and behaves like the read-only `list[bool]` the library
+used to return, while comparing, diffing, and counting outlet states with single integer operations.
+"""
+
+# Core dependencies
+from collections.abc import Iterable, Iterator, Sequence
+from typing import overload, override
+
+
+class OutletStates(Sequence[bool]):
+    """The states of outlets 1 to `len(states)`, where bit `n - 1` of `mask` is set if outlet `n` is
+    on. Indexing, iteration, and slicing follow the list convention, so index 0 corresponds to
+    outlet 1, while `on_outlets` and `changed_outlets` return outlet numbers.
+
+    ```python
+    previous = await pdu.get_all_outlet_states()
+    current = await pdu.get_all_outlet_states()
+    if current != previous:
+        print(f"Outlets {(current ^ previous).on_outlets} changed, {current.count_on()} are on")
+    ```
+    """
+
+    __slots__ = ("__mask", "__length")
+
+    def __init__(self, mask: int, number_of_outlets: int) -> None:
+        if number_of_outlets < 0:
+            raise ValueError(f"The number of outlets can't be negative, but is {number_of_outlets}")
+        if mask < 0 or mask.bit_length() > number_of_outlets:
+            raise ValueError(f"The mask {mask:#x} has bits beyond {number_of_outlets} outlets")
+
+        self.__mask = mask
+        self.__length = number_of_outlets
+
+    @classmethod
+    def from_states(cls, states: Iterable[bool]) -> "OutletStates":
+        """Creates the outlet states from a state per outlet, starting at outlet 1"""
+        if isinstance(states, OutletStates):
+            return states
+
+        mask = 0
+        length = 0
+        for index, state in enumerate(states):
+            if state:
+                mask |= 1 << index
+            length = index + 1
+
+        return cls(mask, length)
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def mask(self) -> int:
+        """The bitmask of the outlets that are on, where bit 0 corresponds to outlet 1"""
+        return self.__mask
+
+    @property
+    def on_outlets(self) -> list[int]:
+        """The numbers of the outlets that are on"""
+        mask = self.__mask
+        outlets = []
+        while mask:
+            lowest_bit = mask & -mask
+            outlets.append(lowest_bit.bit_length())
+            mask ^= lowest_bit
+
+        return outlets
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    def count_on(self) -> int:
+        """Returns the number of outlets that are on"""
+        return self.__mask.bit_count()
+
+    def changed_outlets(self, other: "OutletStates") -> list[int]:
+        """Returns the numbers of the outlets whose state differs from `other`"""
+        return (self ^ other).on_outlets
+
+    def replace(self, outlet: int, state: bool) -> "OutletStates":
+        """Returns a copy of the states with the outlet's state replaced"""
+        if not 0 < outlet <= self.__length:
+            raise ValueError(
+                f"Invalid outlet value of: {outlet}. Valid outlet values are 1 to {self.__length}"
+            )
+
+        bit = 1 << (outlet - 1)
+        return OutletStates(self.__mask | bit if state else self.__mask & ~bit, self.__length)
+
+    ############################################################
+    #### Sequence methods ######################################
+    ############################################################
+
+    @override
+    def __len__(self) -> int:
+        return self.__length
+
+    @overload
+    def __getitem__(self, index: int) -> bool: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[bool]: ...
+
+    @override
+    def __getitem__(self, index: int | slice) -> bool | list[bool]:
+        # Like a list, slicing returns a list and negative indices count from the end
+        if isinstance(index, slice):
+            return [self.__mask >> bit & 1 == 1 for bit in range(*index.indices(self.__length))]
+
+        if index < 0:
+            index += self.__length
+        if not 0 <= index < self.__length:
+            raise IndexError("Outlet state index out of range")
+
+        return self.__mask >> index & 1 == 1
+
+    @override
+    def __iter__(self) -> Iterator[bool]:
+        mask = self.__mask
+        for bit in range(self.__length):
+            yield mask >> bit & 1 == 1
+
+    @override
+    def __contains__(self, value: object) -> bool:
+        if value == 1:
+            return self.__mask != 0
+        if value == 0:
+            return self.__mask != (1 << self.__length) - 1
+        return False
+
+    @override
+    def count(self, value: object) -> int:
+        if value == 1:
+            return self.count_on()
+        if value == 0:
+            return self.__length - self.count_on()
+        return 0
+
+    ############################################################
+    #### Comparison and bitwise operators ######################
+    ############################################################
+
+    @override
+    def __eq__(self, other: object) -> bool:
+        # Only other outlet states compare equal, so that equal states always hash equally
+        if isinstance(other, OutletStates):
+            return self.__mask == other.__mask and self.__length == other.__length
+
+        return NotImplemented
+
+    @override
+    def __hash__(self) -> int:
+        return hash((self.__mask, self.__length))
+
+    def __xor__(self, other: "OutletStates") -> "OutletStates":
+        """Returns the outlets whose state differs, as the outlets that are on"""
+        self.__check_length(other)
+        return OutletStates(self.__mask ^ other.__mask, self.__length)
+
+    def __and__(self, other: "OutletStates") -> "OutletStates":
+        self.__check_length(other)
+        return OutletStates(self.__mask & other.__mask, self.__length)
+
+    def __or__(self, other: "OutletStates") -> "OutletStates":
+        self.__check_length(other)
+        return OutletStates(self.__mask | other.__mask, self.__length)
+
+    def __invert__(self) -> "OutletStates":
+        return OutletStates(~self.__mask & ((1 << self.__length) - 1), self.__length)
+
+    @override
+    def __repr__(self) -> str:
+        return f"OutletStates({''.join('1' if state else '0' for state in self)})"
+
+    def __check_length(self, other: "OutletStates") -> None:
+        """Raises a `ValueError` if the states are of different numbers of outlets"""
+        if len(other) != self.__length:
+            raise ValueError(
+                f"Can't combine the states of {self.__length} and {len(other)} outlets"
+            )
@@ -0,0 +1,16 @@
+"""The percentile calculation shared by the telemetry history and the benchmark suite"""
+
+# Core dependencies
+from collections.abc import Sequence
+import math
+
+
+def nearest_rank(sorted_values: Sequence[float], fraction: float) -> float:
+    """Returns the nearest-rank percentile of the sorted values, where `fraction` is the percentile
+    divided by 100, or `nan` if there are no values
+    """
+    if not sorted_values:
+        return math.nan
+
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
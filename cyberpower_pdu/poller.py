@@ -0,0 +1,274 @@
+"""A shared poller that owns a single polling loop for a PDU and broadcasts the outlet states it
+reads to any number of subscribers, so that the SNMP load on the PDU does not grow with the number
+of consumers
+"""
+
+# Core dependencies
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from types import TracebackType
+from typing import Self
+
+# Package dependencies
+from puresnmp.exc import SnmpError  # type: ignore[import-not-found]
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU, OutletChange, logger
+from cyberpower_pdu.outlet_states import OutletStates
+from cyberpower_pdu.scheduler import Priority, request_priority
+
+
+@dataclass(frozen=True)
+class OutletSnapshot:
+    """The state of all outlets at a point in time"""
+
+    timestamp: datetime
+    """When the outlet states were received, in UTC"""
+
+    outlet_states: OutletStates
+    """The state of each outlet, where index 0 corresponds to outlet 1. `True` means the outlet is
+    enabled.
+    """
+
+
+class OutletSubscription:
+    """A subscriber's bounded queue of snapshots from an `OutletPoller`. When the queue is full, the
+    oldest snapshot is dropped to make room for the newest, so a slow subscriber only ever misses
+    snapshots and never holds up the poller or the other subscribers. Iterate over the
+    subscription to receive the snapshots, and close it to unsubscribe.
+    """
+
+    def __init__(self, poller: "OutletPoller", max_queue_size: int) -> None:
+        self.__poller = poller
+
+        # `None` marks the end of the subscription and has a slot of its own, so that closing the
+        # subscription doesn't drop a snapshot
+        self.__max_queue_size = max_queue_size
+        self.__queue: asyncio.Queue[OutletSnapshot | None] = asyncio.Queue(max_queue_size + 1)
+        self.__dropped = 0
+        self.__closed = False
+
+    @property
+    def dropped(self) -> int:
+        """The number of snapshots dropped because the queue was full"""
+        return self.__dropped
+
+    @property
+    def closed(self) -> bool:
+        """Whether the subscription has been closed"""
+        return self.__closed
+
+    def put(self, snapshot: OutletSnapshot | None) -> None:
+        """Queues the snapshot, dropping the oldest queued snapshot if the queue is full. This is
+        called by the poller.
+        """
+        if snapshot is not None and self.__queue.qsize() >= self.__max_queue_size:
+            self.__queue.get_nowait()
+            self.__dropped += 1
+
+        self.__queue.put_nowait(snapshot)
+
+    def close(self) -> None:
+        """Unsubscribes from the poller. Iteration ends once the queued snapshots are consumed."""
+        if not self.__closed:
+            self.__closed = True
+            self.__poller.unsubscribe(self)
+            self.put(None)
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> OutletSnapshot:
+        snapshot = await self.__queue.get()
+        if snapshot is None:
+            raise StopAsyncIteration
+
+        return snapshot
+
+
+class OutletPoller:
+    """Polls the state of all outlets of a PDU every `interval` seconds from a single task and
+    broadcasts each snapshot to every subscription. Changes published with the PDU's
+    `publish_outlet_changes`, such as by a `TrapReceiver`, are broadcast as soon as they are
+    published. If `reconciliation_interval` is given, the PDU is then only polled every
+    `reconciliation_interval` seconds to catch changes whose trap was lost, and a poll that finds
+    such a change returns to polling every `interval` seconds.
+
+    ```python
+    poller = OutletPoller(pdu, interval=1.0)
+    await poller.start()
+
+    with poller.subscribe() as subscription:
+        async for snapshot in subscription:
+            print(snapshot.outlet_states)
+    ```
+    """
+
+    def __init__(
+        self,
+        pdu: CyberPowerPDU,
+        interval: float = 1.0,
+        max_queue_size: int = 8,
+        reconciliation_interval: float | None = None,
+    ) -> None:
+        """Initializes the poller of an initialized PDU. `max_queue_size` is the default number of
+        snapshots a subscription queues before dropping the oldest.
+        """
+        self.__pdu = pdu
+        self.__interval = interval
+        self.__reconciliation_interval = reconciliation_interval
+        self.__is_published = False
+        self.__max_queue_size = max_queue_size
+        self.__subscriptions: set[OutletSubscription] = set()
+        self.__latest: OutletSnapshot | None = None
+        self.__task: asyncio.Task[None] | None = None
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def latest(self) -> OutletSnapshot | None:
+        """The most recent snapshot, or `None` if no poll has succeeded yet"""
+        return self.__latest
+
+    @property
+    def subscribers(self) -> int:
+        """The number of open subscriptions"""
+        return len(self.__subscriptions)
+
+    @property
+    def is_running(self) -> bool:
+        """Whether the polling loop is running"""
+        return self.__task is not None and not self.__task.done()
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    async def start(self) -> None:
+        """Starts the polling loop"""
+        if self.is_running:
+            raise RuntimeError("The poller is already running")
+
+        self.__pdu.add_outlet_change_listener(self.__handle_published_changes)
+        self.__task = asyncio.create_task(self.__run())
+        self.__task.add_done_callback(self.__handle_stop)
+
+    async def close(self) -> None:
+        """Stops the polling loop and ends every subscription"""
+        self.__pdu.remove_outlet_change_listener(self.__handle_published_changes)
+        if self.__task is not None:
+            self.__task.cancel()
+            try:
+                await self.__task
+            except asyncio.CancelledError:
+                pass
+            self.__task = None
+
+        for subscription in list(self.__subscriptions):
+            subscription.close()
+
+    def subscribe(self, max_queue_size: int | None = None) -> OutletSubscription:
+        """Returns a new subscription to the snapshots. The latest snapshot, if any, is queued
+        right away so that a new subscriber does not wait a whole interval for the first one.
+        """
+        subscription = OutletSubscription(self, max_queue_size or self.__max_queue_size)
+        self.__subscriptions.add(subscription)
+
+        if self.__latest is not None:
+            subscription.put(self.__latest)
+
+        return subscription
+
+    def unsubscribe(self, subscription: OutletSubscription) -> None:
+        """Removes the subscription. This is called when a subscription is closed."""
+        self.__subscriptions.discard(subscription)
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __handle_stop(self, task: asyncio.Task[None]) -> None:
+        """Ends the subscriptions if the polling loop stopped because of a bug rather than being
+        closed, so that the subscribers aren't left waiting for snapshots forever
+        """
+        if task.cancelled() or task.exception() is None:
+            return
+
+        logger.error(f"The outlet poller stopped: {task.exception()!r}")
+        self.__pdu.remove_outlet_change_listener(self.__handle_published_changes)
+        for subscription in list(self.__subscriptions):
+            subscription.close()
+
+    def __handle_published_changes(self, changes: Sequence[OutletChange]) -> None:
+        """Applies changes published to the PDU to the latest states and broadcasts them right
+        away. Changes published before the first poll are left for that poll to pick up.
+        """
+        self.__is_published = True
+        if self.__latest is None:
+            return
+
+        outlet_states = self.__latest.outlet_states
+        for change in changes:
+            if 0 < change.outlet <= len(outlet_states):
+                outlet_states = outlet_states.replace(change.outlet, change.state)
+
+        if outlet_states != self.__latest.outlet_states:
+            self.__broadcast(outlet_states)
+
+    def __broadcast(self, outlet_states: OutletStates) -> None:
+        """Makes the states the latest snapshot and puts it in every subscription's queue"""
+        self.__latest = OutletSnapshot(
+            timestamp=datetime.now(timezone.utc), outlet_states=outlet_states
+        )
+
+        # Putting a snapshot never waits, so a slow subscriber can't hold up the others
+        for subscription in self.__subscriptions:
+            subscription.put(self.__latest)
+
+    async def __run(self) -> None:
+        """Polls the PDU at a fixed rate and broadcasts the snapshots"""
+        loop = asyncio.get_running_loop()
+        next_poll_time = loop.time()
+
+        while True:
+            try:
+                # Each poll reads the PDU rather than the cache, whose TTL may be longer than the
+                # interval, and refreshes the cache for the PDU's other readers. Polls are
+                # background requests, so they don't hold up commands to the PDU.
+                with request_priority(Priority.BACKGROUND):
+                    outlet_states = await self.__pdu.refresh_all_outlet_states()
+            except (SnmpError, TimeoutError, OSError) as exception:
+                # Only failures that a later poll can recover from are retried. Anything else is a
+                # bug, which stops the poller rather than being logged every interval.
+                logger.warning(f"Polling the outlet states failed: {exception!r}")
+            else:
+                # The latest states include the published changes, so a poll that differs from them
+                # found a change that wasn't published
+                if self.__latest is not None and outlet_states != self.__latest.outlet_states:
+                    self.__is_published = False
+
+                self.__broadcast(outlet_states)
+
+            # Polls are scheduled at a fixed rate, and polls that were missed entirely are skipped
+            if self.__is_published and self.__reconciliation_interval is not None:
+                next_poll_time += self.__reconciliation_interval
+            else:
+                next_poll_time += self.__interval
+            if next_poll_time < loop.time():
+                next_poll_time = loop.time()
+            await asyncio.sleep(next_poll_time - loop.time())
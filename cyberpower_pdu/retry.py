@@ -0,0 +1,152 @@
+"""Adaptive timeouts and retries for the SNMP requests sent to a single PDU. The round trip time of
+the PDU is tracked as a smoothed mean and mean deviation, as TCP does (RFC 6298), and the timeout of
+each request is derived from them. Requests to a PDU that answers quickly are resent and abandoned
+quickly, while a PDU on a slow or congested link is given more time.
+"""
+
+# Core dependencies
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """The configuration of the adaptive timeouts. A policy holds no state, so one policy can be
+    shared by many PDUs, each of which tracks its own round trip time.
+    """
+
+    initial_timeout: float = 1.0
+    """The timeout, in seconds, before the first round trip time has been measured"""
+
+    min_timeout: float = 0.1
+    """The smallest timeout, in seconds, that a request is given"""
+
+    max_timeout: float = 10.0
+    """The largest timeout, in seconds, that a request is given, including backoff"""
+
+    max_retries: int = 3
+    """The number of times a request is resent before it fails with a timeout"""
+
+    def __post_init__(self) -> None:
+        if not 0 < self.min_timeout <= self.max_timeout:
+            raise ValueError("The timeouts must satisfy 0 < min_timeout <= max_timeout")
+        if self.max_retries < 0:
+            raise ValueError(f"The number of retries can't be negative, but is {self.max_retries}")
+
+
+class RTTEstimator:
+    """Estimates the round trip time of a PDU and derives the timeout of each attempt of a request
+    from it, following RFC 6298. Each attempt of a request doubles the previous attempt's timeout,
+    and a request that fails entirely doubles the timeout of later requests until a response is
+    measured again.
+
+    Only requests answered on their first attempt are measured, since a response to a resent
+    request can't be matched to the attempt that it answers (Karn's algorithm).
+    """
+
+    # The gains of the smoothed round trip time and its mean deviation and the number of mean
+    # deviations added to the timeout, all from RFC 6298
+    __ALPHA = 1 / 8
+    __BETA = 1 / 4
+    __K = 4
+
+    def __init__(self, policy: RetryPolicy) -> None:
+        self.__policy = policy
+        self.__smoothed_rtt: float | None = None
+        self.__rtt_variance = 0.0
+        self.__timeout = self.__clamp(policy.initial_timeout)
+
+        self.__requests = 0
+        self.__responses = 0
+        self.__retransmissions = 0
+        self.__timeouts = 0
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def policy(self) -> RetryPolicy:
+        return self.__policy
+
+    @property
+    def smoothed_rtt(self) -> float | None:
+        """The smoothed round trip time in seconds, or `None` before the first measurement"""
+        return self.__smoothed_rtt
+
+    @property
+    def rtt_variance(self) -> float:
+        """The smoothed mean deviation of the round trip time in seconds"""
+        return self.__rtt_variance
+
+    @property
+    def timeout(self) -> float:
+        """The timeout, in seconds, of the first attempt of the next request"""
+        return self.__timeout
+
+    @property
+    def requests(self) -> int:
+        """The number of requests sent, not counting resends"""
+        return self.__requests
+
+    @property
+    def responses(self) -> int:
+        """The number of requests that were answered"""
+        return self.__responses
+
+    @property
+    def retransmissions(self) -> int:
+        """The number of times a request was resent after a timeout"""
+        return self.__retransmissions
+
+    @property
+    def timeouts(self) -> int:
+        """The number of requests that failed because every attempt timed out"""
+        return self.__timeouts
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    def get_attempt_timeout(self, attempt: int) -> float:
+        """Returns the timeout, in seconds, of the attempt, which starts at 1"""
+        return self.__clamp(self.__timeout * 2 ** (attempt - 1))
+
+    def record_request(self) -> None:
+        """Records that a new request is being sent"""
+        self.__requests += 1
+
+    def record_retransmission(self) -> None:
+        """Records that a request is being resent"""
+        self.__retransmissions += 1
+
+    def record_response(self, rtt: float | None) -> None:
+        """Records that a request was answered. `rtt` is the round trip time in seconds, or
+        `None` if the request was resent and its round trip time is ambiguous.
+        """
+        self.__responses += 1
+        if rtt is None:
+            return
+
+        if self.__smoothed_rtt is None:
+            self.__smoothed_rtt = rtt
+            self.__rtt_variance = rtt / 2
+        else:
+            self.__rtt_variance += self.__BETA * (
+                abs(self.__smoothed_rtt - rtt) - self.__rtt_variance
+            )
+            self.__smoothed_rtt += self.__ALPHA * (rtt - self.__smoothed_rtt)
+
+        self.__timeout = self.__clamp(self.__smoothed_rtt + self.__K * self.__rtt_variance)
+
+    def record_timeout(self) -> None:
+        """Records that every attempt of a request timed out, which backs off the timeout"""
+        self.__timeouts += 1
+        self.__timeout = self.__clamp(2 * self.__timeout)
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __clamp(self, timeout: float) -> float:
+        """Limits the timeout to the policy's bounds"""
+        return min(max(timeout, self.__policy.min_timeout), self.__policy.max_timeout)
@@ -0,0 +1,186 @@
+"""A per-PDU request scheduler. A PDU's SNMP agent is a slow embedded device, so the scheduler
+limits both the number of requests in flight to it and the rate at which requests are started, and
+hands out request slots by priority, so that outlet commands never queue behind background
+telemetry reads.
+
+The priority of a request comes from the context it is sent from. Requests default to
+`Priority.INTERACTIVE`, outlet commands are always sent as `Priority.COMMAND`, and background loops
+such as pollers mark their reads with `request_priority(Priority.BACKGROUND)`.
+"""
+
+# Core dependencies
+import asyncio
+from collections.abc import AsyncIterator, Iterator
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+import heapq
+import itertools
+
+
+class Priority(IntEnum):
+    """The priority classes of requests, from the most to the least urgent"""
+
+    COMMAND = 0
+    """Outlet commands, which a user is waiting to see take effect"""
+
+    INTERACTIVE = 1
+    """Reads that a caller is waiting on, which is the default"""
+
+    BACKGROUND = 2
+    """Polling and telemetry reads that can wait for the other classes"""
+
+
+_request_priority: ContextVar[Priority] = ContextVar(
+    "cyberpower_pdu_request_priority", default=Priority.INTERACTIVE
+)
+
+
+@contextmanager
+def request_priority(priority: Priority) -> Iterator[None]:
+    """Sends the requests made within the block, including those of tasks created within it, with
+    the given priority
+
+    ```python
+    with request_priority(Priority.BACKGROUND):
+        outlet_states = await pdu.get_all_outlet_states()
+    ```
+    """
+    token = _request_priority.set(priority)
+    try:
+        yield
+    finally:
+        _request_priority.reset(token)
+
+
+def get_request_priority() -> Priority:
+    """Returns the priority of requests made from the current context"""
+    return _request_priority.get()
+
+
+class RequestScheduler:
+    """Hands out request slots to a single PDU. At most `max_in_flight` slots are held at once, and
+    if `max_requests_per_second` is given, slots are handed out at that average rate with bursts of
+    up to `burst` slots. Waiting requests are served in priority order and, within a priority, in
+    the order they arrived.
+    """
+
+    def __init__(
+        self,
+        max_in_flight: int = 4,
+        max_requests_per_second: float | None = None,
+        burst: int | None = None,
+    ) -> None:
+        if max_in_flight < 1:
+            raise ValueError(f"At least one request must be allowed in flight, not {max_in_flight}")
+        if max_requests_per_second is not None and max_requests_per_second <= 0:
+            raise ValueError("The request rate must be positive")
+
+        self.__max_in_flight = max_in_flight
+        self.__rate = max_requests_per_second
+        self.__burst = float(burst if burst is not None else max_in_flight)
+
+        self.__in_flight = 0
+        self.__tokens = self.__burst
+        self.__token_time: float | None = None
+        self.__wakeup: asyncio.TimerHandle | None = None
+
+        # Waiters are ordered by priority and then arrival, which the counter breaks ties with
+        self.__waiters: list[tuple[int, int, asyncio.Future[None]]] = []
+        self.__arrivals = itertools.count()
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def in_flight(self) -> int:
+        """The number of slots currently held"""
+        return self.__in_flight
+
+    @property
+    def queued(self) -> int:
+        """The number of requests waiting for a slot"""
+        return sum(1 for _, _, future in self.__waiters if not future.done())
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority | None = None) -> AsyncIterator[None]:
+        """Waits for a request slot and holds it for the duration of the block. The priority
+        defaults to the priority of the current context.
+        """
+        await self.__acquire(get_request_priority() if priority is None else priority)
+        try:
+            yield
+        finally:
+            self.__release()
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    async def __acquire(self, priority: Priority) -> None:
+        """Waits until a slot is handed to the request"""
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[None] = loop.create_future()
+        heapq.heappush(self.__waiters, (priority, next(self.__arrivals), future))
+        self.__dispatch()
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            # A slot that was handed out just as the request was cancelled is passed on
+            if future.done() and not future.cancelled():
+                self.__release()
+            raise
+
+    def __release(self) -> None:
+        """Returns a slot and hands it to the next waiting request"""
+        self.__in_flight -= 1
+        self.__dispatch()
+
+    def __dispatch(self) -> None:
+        """Hands slots to waiting requests, in priority order, while the limits allow"""
+        while self.__waiters and self.__in_flight < self.__max_in_flight:
+            # Requests that were cancelled while waiting are dropped
+            if self.__waiters[0][2].done():
+                heapq.heappop(self.__waiters)
+                continue
+
+            if not self.__take_token():
+                return
+
+            _, _, future = heapq.heappop(self.__waiters)
+            self.__in_flight += 1
+            future.set_result(None)
+
+    def __take_token(self) -> bool:
+        """Takes a token from the rate limiter's bucket, or schedules another dispatch for when the
+        next token is available and returns `False`
+        """
+        if self.__rate is None:
+            return True
+
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        if self.__token_time is not None:
+            self.__tokens = min(
+                self.__burst, self.__tokens + (now - self.__token_time) * self.__rate
+            )
+        self.__token_time = now
+
+        if self.__tokens >= 1:
+            self.__tokens -= 1
+            return True
+
+        if self.__wakeup is None or self.__wakeup.cancelled():
+            self.__wakeup = loop.call_later((1 - self.__tokens) / self.__rate, self.__wake)
+        return False
+
+    def __wake(self) -> None:
+        """Dispatches the waiting requests once a token is available"""
+        self.__wakeup = None
+        self.__dispatch()
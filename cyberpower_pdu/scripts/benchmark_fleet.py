@@ -0,0 +1,51 @@
+# Core dependencies
+import asyncio
+import time
+
+# Project dependencies
+from cyberpower_pdu import OutletCommand
+from cyberpower_pdu.fleet import PDUFleet
+
+
+# Script settings
+NUMBER_OF_PDUS = 500
+SWEEPS = 20
+SIMULATE = True
+
+
+async def main() -> None:
+    fleet = PDUFleet.from_ip_addresses(
+        [f"10.0.{index // 256}.{index % 256}" for index in range(NUMBER_OF_PDUS)],
+        simulate=SIMULATE,
+    )
+
+    try:
+        start_time = time.monotonic()
+        result = await fleet.initialize()
+        print(
+            f"Initialized {len(result.results)} PDUs ({len(result.errors)} errors) in "
+            f"{time.monotonic() - start_time:.3f} seconds"
+        )
+
+        start_time = time.monotonic()
+        for _ in range(SWEEPS):
+            await fleet.get_all_outlet_states()
+        duration = time.monotonic() - start_time
+        print(
+            f"Swept {NUMBER_OF_PDUS} PDUs {SWEEPS} times in {duration:.3f} seconds "
+            f"({NUMBER_OF_PDUS * SWEEPS / duration:.0f} PDU reads per second)"
+        )
+
+        start_time = time.monotonic()
+        result = await fleet.send_outlet_command(1, OutletCommand.IMMEDIATE_ON)
+        print(
+            f"Commanded outlet 1 of {len(result.results)} PDUs ({len(result.errors)} errors) in "
+            f"{time.monotonic() - start_time:.3f} seconds"
+        )
+
+    finally:
+        await fleet.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
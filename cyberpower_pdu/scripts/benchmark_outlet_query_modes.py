@@ -0,0 +1,48 @@
+# Core dependencies
+import asyncio
+import statistics
+import time
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU, OutletQueryMode
+
+
+# Script settings
+IP_ADDRESS = "192.168.1.132"
+ITERATIONS = 20
+
+
+async def benchmark(mode: OutletQueryMode) -> list[float]:
+    """Returns the duration, in seconds, of each `get_all_outlet_states` call using the mode"""
+    pdu = CyberPowerPDU(ip_address=IP_ADDRESS, simulate=False, outlet_query_mode=mode)
+    durations = []
+
+    try:
+        await pdu.initialize()
+
+        for _ in range(ITERATIONS):
+            start_time = time.monotonic()
+            await pdu.get_all_outlet_states()
+            durations.append(time.monotonic() - start_time)
+
+    finally:
+        await pdu.close()
+
+    return durations
+
+
+async def main() -> None:
+    for mode in OutletQueryMode:
+        durations = await benchmark(mode)
+
+        print(
+            f"{mode.name:<10} "
+            f"mean: {1000 * statistics.mean(durations):8.1f} ms  "
+            f"median: {1000 * statistics.median(durations):8.1f} ms  "
+            f"min: {1000 * min(durations):8.1f} ms  "
+            f"max: {1000 * max(durations):8.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
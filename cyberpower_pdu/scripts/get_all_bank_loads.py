@@ -0,0 +1,27 @@
+# Core dependencies
+import asyncio
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU
+
+
+IP_ADDRESS = "192.168.1.132"
+
+
+async def main() -> None:
+    pdu = CyberPowerPDU(ip_address=IP_ADDRESS, simulate=False)
+
+    try:
+        await pdu.initialize()
+
+        bank_loads = await pdu.get_all_bank_loads()
+
+        for index, bank_load in enumerate(bank_loads):
+            print(f"Bank {index + 1} load: {bank_load:.1f} A")
+
+    finally:
+        await pdu.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
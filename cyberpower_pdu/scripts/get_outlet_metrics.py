@@ -0,0 +1,29 @@
+# Core dependencies
+import asyncio
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU
+
+
+IP_ADDRESS = "192.168.1.132"
+
+
+async def main() -> None:
+    pdu = CyberPowerPDU(ip_address=IP_ADDRESS, simulate=False)
+
+    try:
+        await pdu.initialize()
+
+        metrics = await pdu.get_outlet_metrics()
+
+        for index, (current, power, energy) in enumerate(
+            zip(metrics.current, metrics.power, metrics.energy)
+        ):
+            print(f"Outlet {index + 1}: {current:.1f} A, {power:.0f} W, {energy:.1f} kWh")
+
+    finally:
+        await pdu.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,49 @@
+# Core dependencies
+import asyncio
+import socket
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU
+from cyberpower_pdu.ber import parse_oid
+from cyberpower_pdu.oids import OUTLET_STATE_OID
+from cyberpower_pdu.traps import TrapReceiver, encode_trap
+
+
+# Script settings
+HOST = "127.0.0.1"
+TRAP_OID = parse_oid(".1.3.6.1.4.1.3808.0.1")
+OUTLET = 7
+
+
+async def main() -> None:
+    # The receiver listens on a free port, so no privileges or PDU are needed
+    pdu = CyberPowerPDU(ip_address=HOST, simulate=True, cache_ttl=60.0)
+    await pdu.initialize()
+
+    receiver = TrapReceiver()
+    receiver.register(HOST, pdu)
+    await receiver.start(HOST, 0)
+
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for state in (1, 2):
+                trap = encode_trap(TRAP_OID, [((*OUTLET_STATE_OID, OUTLET), state)], uptime=100)
+                sender.sendto(trap, receiver.address)
+
+                received_trap = await anext(receiver)
+                for change in received_trap.outlet_changes:
+                    print(
+                        f"Trap from {received_trap.source}: "
+                        f"Outlet {change.outlet} -> {change.state}"
+                    )
+
+                assert pdu.cache is not None
+                print(f"Cached state of outlet {OUTLET}: {pdu.cache.get(OUTLET)}")
+
+    finally:
+        await receiver.close()
+        await pdu.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+# Core dependencies
+import asyncio
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDUSimulation
+from cyberpower_pdu.agent import SimulatedSNMPAgent
+
+
+# Script settings
+HOST = "127.0.0.1"
+BASE_PORT = 16100
+NUMBER_OF_AGENTS = 10
+NUMBER_OF_OUTLETS = 16
+LATENCY = 0.020
+JITTER = 0.005
+PACKET_LOSS = 0.0
+
+
+async def main() -> None:
+    agents = []
+
+    try:
+        for index in range(NUMBER_OF_AGENTS):
+            simulation = CyberPowerPDUSimulation(number_of_outlets=NUMBER_OF_OUTLETS)
+            await simulation.initialize()
+
+            agent = SimulatedSNMPAgent(
+                simulation, latency=LATENCY, jitter=JITTER, packet_loss=PACKET_LOSS
+            )
+            await agent.start(HOST, BASE_PORT + index)
+            agents.append(agent)
+
+            print(f"Simulated PDU agent listening on {HOST}:{BASE_PORT + index}")
+
+        # Serve until the script is interrupted
+        await asyncio.Event().wait()
+
+    finally:
+        for agent in agents:
+            await agent.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
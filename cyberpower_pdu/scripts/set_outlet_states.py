@@ -0,0 +1,40 @@
+# Core dependencies
+import asyncio
+import time
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU, OutletCommand
+
+
+# Script settings
+IP_ADDRESS = "192.168.1.132"
+OUTLETS = [1, 2, 3, 4, 5, 6, 7, 8]
+COMMAND = OutletCommand.IMMEDIATE_OFF
+
+
+async def main() -> None:
+    pdu = CyberPowerPDU(ip_address=IP_ADDRESS, simulate=False)
+
+    try:
+        await pdu.initialize()
+
+        start_time = time.monotonic()
+
+        print(f"Setting outlets {OUTLETS} to {COMMAND}")
+        await pdu.send_outlet_commands({outlet: COMMAND for outlet in OUTLETS})
+
+        print("Waiting for 3 seconds ...")
+        await asyncio.sleep(3)
+
+        outlet_states = await pdu.get_all_outlet_states()
+        for outlet in OUTLETS:
+            print(f"Outlet {outlet} state: {outlet_states[outlet - 1]}")
+
+    finally:
+        print(f"Script execution time: {time.monotonic() - start_time:.3f} seconds")
+
+        await pdu.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,29 @@
+# Core dependencies
+import asyncio
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU
+
+
+# Script settings
+IP_ADDRESS = "192.168.1.132"
+INTERVAL = 1.0
+
+
+async def main() -> None:
+    pdu = CyberPowerPDU(ip_address=IP_ADDRESS, simulate=False)
+
+    try:
+        await pdu.initialize()
+
+        print(f"Watching {pdu.number_of_outlets} outlets every {INTERVAL} seconds ...")
+        async for change in pdu.watch_outlets(interval=INTERVAL):
+            state = "on" if change.state else "off"
+            print(f"{change.timestamp.isoformat()}: Outlet {change.outlet} turned {state}")
+
+    finally:
+        await pdu.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,44 @@
+"""Deduplication of concurrent, identical asynchronous calls"""
+
+# Core dependencies
+import asyncio
+from collections.abc import Awaitable, Callable, Hashable
+
+
+class SingleFlight[K: Hashable, V]:
+    """Shares a single in-flight call between all callers that request the same key at the same
+    time. Unlike a cache, a result is only shared with callers that arrived while the call was in
+    flight, so a caller never receives a result that was produced before it asked for it.
+    """
+
+    def __init__(self) -> None:
+        self.__in_flight: dict[K, asyncio.Task[V]] = {}
+
+    @property
+    def in_flight(self) -> int:
+        """The number of calls currently in flight"""
+        return len(self.__in_flight)
+
+    async def run(self, key: K, function: Callable[[], Awaitable[V]]) -> V:
+        """Awaits the call in flight for `key`, or, if there is none, starts `function` as the call
+        for `key` and awaits it. Cancelling a caller does not cancel the shared call for the other
+        callers.
+        """
+        task = self.__in_flight.get(key)
+
+        if task is None or task.done():
+            task = asyncio.ensure_future(function())
+            self.__in_flight[key] = task
+            task.add_done_callback(lambda finished_task: self.__remove(key, finished_task))
+
+        return await asyncio.shield(task)
+
+    def __remove(self, key: K, task: asyncio.Task[V]) -> None:
+        """Removes the finished task from the in-flight table"""
+        if self.__in_flight.get(key) is task:
+            del self.__in_flight[key]
+
+        # Mark the exception as retrieved, since every caller may have been cancelled before the
+        # call finished, in which case the exception would otherwise be reported as never retrieved
+        if not task.cancelled():
+            task.exception()
@@ -0,0 +1,274 @@
+"""The SNMP clients used by `CyberPowerPDUHardware`. `PuresnmpClient` uses puresnmp's generic
+client, while `RawSNMPClient` is a minimal client that only encodes and decodes the GET, GETBULK,
+and SET requests the library sends using the package's BER codec, which avoids most of the
+per-request CPU overhead of puresnmp. Both send their requests over an `SNMPTransport`, raise the
+same puresnmp exceptions, and cache the encoding of the OIDs they are given, so the library's fixed
+OIDs are only encoded once.
+"""
+
+# Core dependencies
+from abc import ABC, abstractmethod
+from collections.abc import Sequence
+from typing import Any, override
+
+# Package dependencies
+from puresnmp import V2C, Client, ObjectIdentifier  # type: ignore[import-not-found]
+from puresnmp.exc import ErrorResponse, NoSuchOID, SnmpError  # type: ignore[import-not-found]
+from puresnmp.types import Integer  # type: ignore[import-not-found]
+
+# Project dependencies
+from cyberpower_pdu.ber import (
+    OID,
+    Message,
+    PDUType,
+    VarBindException,
+    decode_message,
+    encode_message_from_varbinds,
+    encode_varbind,
+    format_oid,
+)
+from cyberpower_pdu.transport import SNMPTransport
+
+
+class SNMPClient(ABC):
+    """The SNMP operations that `CyberPowerPDUHardware` sends to a PDU. OIDs are given as `OID`
+    tuples and values are returned as Python values.
+    """
+
+    @abstractmethod
+    async def get(self, oid: OID) -> Any:
+        """Gets the value of the OID. A puresnmp `NoSuchOID` is raised if the OID does not exist."""
+
+    @abstractmethod
+    async def multiget(self, oids: Sequence[OID]) -> list[Any]:
+        """Gets the values of the OIDs in a single request"""
+
+    @abstractmethod
+    async def bulkwalk(self, oid: OID, max_repetitions: int) -> list[Any]:
+        """Gets the values below the OID, in order, with GETBULK requests"""
+
+    @abstractmethod
+    async def bulkget(self, oids: Sequence[OID], max_repetitions: int) -> list[tuple[OID, Any]]:
+        """Sends a single GETBULK request that repeats every OID and returns the varbinds up to the
+        end of the MIB view. The varbinds are interleaved, so each group of `len(oids)` varbinds
+        holds the successors of the OIDs of the previous group.
+        """
+
+    @abstractmethod
+    async def set(self, oid: OID, value: int) -> None:
+        """Sets the OID to the integer value"""
+
+    @abstractmethod
+    async def multiset(self, varbinds: Sequence[tuple[OID, int]]) -> None:
+        """Sets each OID to its integer value in a single request. The agent applies either all or
+        none of the values.
+        """
+
+
+class PuresnmpClient(SNMPClient):
+    """An `SNMPClient` using puresnmp's generic client"""
+
+    def __init__(self, host: str, port: int, transport: SNMPTransport, community: str) -> None:
+        self.__client = Client(
+            ip=host, port=port, credentials=V2C(community), sender=transport.send
+        )
+
+        # An `ObjectIdentifier` caches its encoding once it is first sent, so reusing them skips
+        # parsing and encoding the OIDs on every request
+        self.__object_identifiers: dict[OID, ObjectIdentifier] = {}
+        self.__integers: dict[int, Integer] = {}
+
+    @override
+    async def get(self, oid: OID) -> Any:
+        return (await self.__client.get(self.__object_identifier(oid))).pythonize()
+
+    @override
+    async def multiget(self, oids: Sequence[OID]) -> list[Any]:
+        values = await self.__client.multiget([self.__object_identifier(oid) for oid in oids])
+        return [value.pythonize() for value in values]
+
+    @override
+    async def bulkwalk(self, oid: OID, max_repetitions: int) -> list[Any]:
+        return [
+            varbind.value.pythonize()
+            async for varbind in self.__client.bulkwalk(
+                [self.__object_identifier(oid)], bulk_size=max_repetitions
+            )
+        ]
+
+    @override
+    async def bulkget(self, oids: Sequence[OID], max_repetitions: int) -> list[tuple[OID, Any]]:
+        result = await self.__client.bulkget(
+            [], [self.__object_identifier(oid) for oid in oids], max_list_size=max_repetitions
+        )
+        return [
+            (tuple(object_identifier.nodes), value.pythonize())
+            for object_identifier, value in result.listing.items()
+        ]
+
+    @override
+    async def set(self, oid: OID, value: int) -> None:
+        await self.__client.set(self.__object_identifier(oid), self.__integer(value))
+
+    @override
+    async def multiset(self, varbinds: Sequence[tuple[OID, int]]) -> None:
+        await self.__client.multiset(
+            {self.__object_identifier(oid): self.__integer(value) for oid, value in varbinds}
+        )
+
+    def __integer(self, value: int) -> Integer:
+        """Returns the cached `Integer` of the value"""
+        integer = self.__integers.get(value)
+        if integer is None:
+            integer = self.__integers[value] = Integer(value)
+
+        return integer
+
+    def __object_identifier(self, oid: OID) -> ObjectIdentifier:
+        """Returns the cached `ObjectIdentifier` of the OID"""
+        object_identifier = self.__object_identifiers.get(oid)
+        if object_identifier is None:
+            object_identifier = self.__object_identifiers[oid] = ObjectIdentifier(format_oid(oid))
+
+        return object_identifier
+
+
+class RawSNMPClient(SNMPClient):
+    """A minimal `SNMPClient` that encodes and decodes its messages with the package's BER codec.
+    Each request is sent up to `retries` times, waiting `timeout` seconds for a response each time,
+    which are the same defaults as puresnmp's.
+    """
+
+    def __init__(
+        self, transport: SNMPTransport, community: str, timeout: float = 6, retries: int = 10
+    ) -> None:
+        self.__transport = transport
+        self.__community = community.encode()
+        self.__timeout = timeout
+        self.__retries = retries
+
+        # The encoded varbinds of the OIDs are cached, since the library requests the same OIDs,
+        # and sends the same commands, over and over
+        self.__varbinds: dict[tuple[OID, int | None], bytes] = {}
+
+    @override
+    async def get(self, oid: OID) -> Any:
+        value = (await self.__request(PDUType.GET_REQUEST, [(oid, None)])).varbinds[0][1]
+
+        if value in (VarBindException.NO_SUCH_OBJECT, VarBindException.NO_SUCH_INSTANCE):
+            raise NoSuchOID(ObjectIdentifier(format_oid(oid)))
+
+        return value
+
+    @override
+    async def multiget(self, oids: Sequence[OID]) -> list[Any]:
+        response = await self.__request(PDUType.GET_REQUEST, [(oid, None) for oid in oids])
+
+        if len(response.varbinds) != len(oids):
+            raise SnmpError(
+                f"Unexpected response. Expected {len(oids)} varbinds, "
+                f"but got {len(response.varbinds)}!"
+            )
+
+        # Like puresnmp, the exception values of missing OIDs are returned as `None`
+        return [
+            None if isinstance(value, VarBindException) else value for _, value in response.varbinds
+        ]
+
+    @override
+    async def bulkwalk(self, oid: OID, max_repetitions: int) -> list[Any]:
+        values: list[Any] = []
+        next_oid = oid
+
+        while True:
+            # For GETBULK requests, the error index holds the max-repetitions value
+            response = await self.__request(
+                PDUType.GET_BULK_REQUEST, [(next_oid, None)], error_index=max_repetitions
+            )
+            if not response.varbinds:
+                return values
+
+            for varbind_oid, value in response.varbinds:
+                if value is VarBindException.END_OF_MIB_VIEW or varbind_oid[: len(oid)] != oid:
+                    return values
+
+                # An agent that doesn't move forward would otherwise be walked forever
+                if varbind_oid <= next_oid:
+                    raise SnmpError(
+                        f"The agent returned the OID {format_oid(varbind_oid)} out of order"
+                    )
+
+                values.append(value)
+                next_oid = varbind_oid
+
+    @override
+    async def bulkget(self, oids: Sequence[OID], max_repetitions: int) -> list[tuple[OID, Any]]:
+        response = await self.__request(
+            PDUType.GET_BULK_REQUEST, [(oid, None) for oid in oids], error_index=max_repetitions
+        )
+
+        varbinds: list[tuple[OID, Any]] = []
+        for oid, value in response.varbinds:
+            # Like puresnmp, the listing ends at the first varbind past the end of the MIB view
+            if value is VarBindException.END_OF_MIB_VIEW:
+                break
+            varbinds.append((oid, None if isinstance(value, VarBindException) else value))
+
+        return varbinds
+
+    @override
+    async def set(self, oid: OID, value: int) -> None:
+        await self.__request(PDUType.SET_REQUEST, [(oid, value)])
+
+    @override
+    async def multiset(self, varbinds: Sequence[tuple[OID, int]]) -> None:
+        await self.__request(PDUType.SET_REQUEST, varbinds)
+
+    async def __request(
+        self,
+        pdu_type: PDUType,
+        varbinds: Sequence[tuple[OID, int | None]],
+        error_status: int = 0,
+        error_index: int = 0,
+    ) -> Message:
+        """Sends the request and returns the response. A puresnmp `ErrorResponse` is raised if the
+        agent responds with an error.
+        """
+        encoded_varbinds = b"".join(self.__encode_varbind(varbind) for varbind in varbinds)
+        data = await self.__transport.request(
+            lambda request_id: encode_message_from_varbinds(
+                community=self.__community,
+                pdu_type=pdu_type,
+                request_id=request_id,
+                encoded_varbinds=encoded_varbinds,
+                error_status=error_status,
+                error_index=error_index,
+            ),
+            timeout=self.__timeout,
+            retries=self.__retries,
+        )
+
+        try:
+            response = decode_message(data)
+        except ValueError as exception:
+            raise SnmpError(f"Received a malformed response: {exception}") from exception
+
+        if response.pdu_type != PDUType.RESPONSE:
+            raise SnmpError(f"Expected a response but received a {response.pdu_type.name}")
+
+        if response.error_status != 0:
+            offending_oid = None
+            if 0 < response.error_index <= len(varbinds):
+                offending_oid = ObjectIdentifier(format_oid(varbinds[response.error_index - 1][0]))
+
+            raise ErrorResponse.construct(response.error_status, offending_oid)
+
+        return response
+
+    def __encode_varbind(self, varbind: tuple[OID, int | None]) -> bytes:
+        """Returns the cached encoding of the varbind"""
+        encoded_varbind = self.__varbinds.get(varbind)
+        if encoded_varbind is None:
+            encoded_varbind = self.__varbinds[varbind] = encode_varbind(*varbind)
+
+        return encoded_varbind
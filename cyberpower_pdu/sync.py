@@ -0,0 +1,314 @@
+"""A synchronous interface to a CyberPower PDU for code that doesn't run an event loop, such as
+Ansible modules and Flask handlers. Every `SyncCyberPowerPDU` in a process runs its requests on a
+single event loop in a background thread, so a call costs a round trip to the PDU rather than
+starting an event loop and initializing the PDU each time. Calls may be made from any number of
+threads at once.
+
+```python
+pdu = SyncCyberPowerPDU.shared("192.168.1.132")
+pdu.send_outlet_command(3, OutletCommand.IMMEDIATE_ON)
+print(pdu.get_all_outlet_states())
+```
+"""
+
+# Core dependencies
+import asyncio
+import atexit
+from collections.abc import Callable, Coroutine, Hashable, Mapping
+from functools import partial
+import os
+import threading
+from types import TracebackType
+from typing import Any, Self
+
+# Project dependencies
+from cyberpower_pdu import CyberPowerPDU, OutletCommand, OutletMetrics, logger
+from cyberpower_pdu.outlet_states import OutletStates
+
+
+class SyncCyberPowerPDU:
+    """A blocking wrapper around a `CyberPowerPDU` that runs on the process's shared event loop
+    thread. The PDU is initialized by the first call that needs it and stays initialized for later
+    calls, from any thread, until `close` is called. `timeout` limits how long, in seconds, a call
+    waits before it is cancelled and raises a `TimeoutError`. `None` waits indefinitely.
+
+    The remaining keyword arguments are passed to the `CyberPowerPDU`.
+    """
+
+    def __init__(
+        self,
+        ip_address: str,
+        port: int = 161,
+        timeout: float | None = 30.0,
+        **pdu_arguments: Any,
+    ) -> None:
+        self.__create_pdu = partial(
+            CyberPowerPDU, ip_address=ip_address, port=port, **pdu_arguments
+        )
+        self.__timeout = timeout
+        self.__reset_lock = threading.Lock()
+        self.__reset()
+
+    @classmethod
+    def shared(
+        cls,
+        ip_address: str,
+        port: int = 161,
+        timeout: float | None = 30.0,
+        **pdu_arguments: Hashable,
+    ) -> "SyncCyberPowerPDU":
+        """Returns the process's `SyncCyberPowerPDU` for the PDU and arguments, creating it on the
+        first call. Handlers that each ask for the same PDU therefore share one initialized PDU.
+        The arguments must be hashable.
+        """
+        key = (ip_address, port, timeout, tuple(sorted(pdu_arguments.items())))
+        with _lock:
+            pdu = _shared_pdus.get(key)
+            if pdu is None:
+                pdu = _shared_pdus[key] = cls(ip_address, port, timeout, **pdu_arguments)
+            return pdu
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exception_type: type[BaseException] | None,
+        exception: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def pdu(self) -> CyberPowerPDU:
+        """The wrapped PDU, which must only be used from the shared event loop thread, such as
+        within operations passed to `run`
+        """
+        return self.__pdu
+
+    @property
+    def number_of_outlets(self) -> int:
+        """The total number of controllable outlets on the PDU"""
+        return self.__run(self.__get_number_of_outlets())
+
+    @property
+    def number_of_banks(self) -> int:
+        """The number of banks on the PDU"""
+        return self.__run(self.__get_number_of_banks())
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    def initialize(self) -> None:
+        """Initializes the connection to the PDU, reconnecting if it is already initialized. Other
+        calls initialize the PDU themselves if needed, so this is only required to reconnect or to
+        fail early.
+        """
+        self.__run(self.__initialize())
+
+    def close(self) -> None:
+        """Closes the connection to the PDU. A later call initializes it again."""
+        self.__run(self.__close())
+
+    def run[T](self, operation: Callable[[CyberPowerPDU], Coroutine[Any, Any, T]]) -> T:
+        """Runs the operation, which is given the initialized PDU, on the shared event loop and
+        returns its result, so that several steps run without returning to the calling thread
+
+        ```python
+        async def reboot_and_check(async_pdu: CyberPowerPDU) -> bool:
+            await async_pdu.send_outlet_command(3, OutletCommand.IMMEDIATE_REBOOT)
+            await asyncio.sleep(10)
+            return await async_pdu.get_outlet_state(3)
+
+        state = pdu.run(reboot_and_check)
+        ```
+        """
+        return self.__run(self.__call(operation))
+
+    def get_all_outlet_states(self) -> OutletStates:
+        """Get the state of all outlets. See `CyberPowerPDU.get_all_outlet_states`."""
+        return self.run(lambda pdu: pdu.get_all_outlet_states())
+
+    def get_outlet_state(self, outlet: int) -> bool:
+        """Get the outlet's state. See `CyberPowerPDU.get_outlet_state`."""
+        return self.run(lambda pdu: pdu.get_outlet_state(outlet))
+
+    def get_bank_load(self, bank: int) -> float:
+        """Get the bank's load in amps. See `CyberPowerPDU.get_bank_load`."""
+        return self.run(lambda pdu: pdu.get_bank_load(bank))
+
+    def get_all_bank_loads(self) -> list[float]:
+        """Get the load of all banks in amps. See `CyberPowerPDU.get_all_bank_loads`."""
+        return self.run(lambda pdu: pdu.get_all_bank_loads())
+
+    def get_outlet_metrics(self) -> OutletMetrics:
+        """Get the current, power, and energy of all outlets. See
+        `CyberPowerPDU.get_outlet_metrics`.
+        """
+        return self.run(lambda pdu: pdu.get_outlet_metrics())
+
+    def send_outlet_command(self, outlet: int, command: OutletCommand) -> None:
+        """Send a command to the outlet. See `CyberPowerPDU.send_outlet_command`."""
+        self.run(lambda pdu: pdu.send_outlet_command(outlet, command))
+
+    def send_outlet_commands(self, commands: Mapping[int, OutletCommand]) -> None:
+        """Send a command to each of several outlets at once. See
+        `CyberPowerPDU.send_outlet_commands`.
+        """
+        self.run(lambda pdu: pdu.send_outlet_commands(commands))
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __run[T](self, coroutine: Coroutine[Any, Any, T]) -> T:
+        """Runs the coroutine on the shared event loop and waits for its result"""
+        # A PDU created before the process forked belongs to the parent's event loop, so the
+        # child starts over with a new one
+        if self.__generation != _fork_generation:
+            with self.__reset_lock:
+                if self.__generation != _fork_generation:
+                    self.__reset()
+
+        return _get_event_loop_thread().run(coroutine, self.__timeout)
+
+    def __reset(self) -> None:
+        """Creates a new, uninitialized PDU"""
+        self.__pdu = self.__create_pdu()
+        self.__generation = _fork_generation
+
+        # Only touched on the event loop thread, which serializes concurrent first calls
+        self.__initialized = False
+        self.__initialize_lock = asyncio.Lock()
+
+    async def __ensure_initialized(self) -> None:
+        """Initializes the PDU unless it already is"""
+        if self.__initialized:
+            return
+
+        async with self.__initialize_lock:
+            if not self.__initialized:
+                await self.__pdu.initialize()
+                self.__initialized = True
+
+    async def __initialize(self) -> None:
+        async with self.__initialize_lock:
+            self.__initialized = False
+            await self.__pdu.initialize()
+            self.__initialized = True
+
+    async def __close(self) -> None:
+        async with self.__initialize_lock:
+            self.__initialized = False
+            await self.__pdu.close()
+
+    async def __call[T](self, operation: Callable[[CyberPowerPDU], Coroutine[Any, Any, T]]) -> T:
+        """Runs the operation on the PDU once it is initialized"""
+        await self.__ensure_initialized()
+        return await operation(self.__pdu)
+
+    async def __get_number_of_outlets(self) -> int:
+        await self.__ensure_initialized()
+        return self.__pdu.number_of_outlets
+
+    async def __get_number_of_banks(self) -> int:
+        await self.__ensure_initialized()
+        return self.__pdu.number_of_banks
+
+
+############################################################
+#### Private functions #####################################
+############################################################
+
+
+class _EventLoopThread:
+    """An event loop running forever in a daemon thread, on which coroutines are run from other
+    threads
+    """
+
+    def __init__(self) -> None:
+        self.__loop = asyncio.new_event_loop()
+        self.__thread = threading.Thread(
+            target=self.__loop.run_forever, name="cyberpower-pdu-event-loop", daemon=True
+        )
+        self.__thread.start()
+
+    def run[T](self, coroutine: Coroutine[Any, Any, T], timeout: float | None) -> T:
+        """Runs the coroutine on the loop and waits up to `timeout` seconds for its result"""
+        if threading.current_thread() is self.__thread:
+            coroutine.close()
+            raise RuntimeError("A SyncCyberPowerPDU can't be called from its own event loop")
+
+        future = asyncio.run_coroutine_threadsafe(coroutine, self.__loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise TimeoutError(f"The PDU call didn't complete within {timeout} seconds") from None
+
+    def stop(self) -> None:
+        """Stops the loop and waits for its thread to finish"""
+        self.__loop.call_soon_threadsafe(self.__loop.stop)
+        self.__thread.join()
+        self.__loop.close()
+
+
+_lock = threading.Lock()
+_event_loop_thread: _EventLoopThread | None = None
+_shared_pdus: dict[Hashable, SyncCyberPowerPDU] = {}
+
+# Counts the forks that this process descends from, so that PDUs created before a fork are replaced
+_fork_generation = 0
+
+
+def _get_event_loop_thread() -> _EventLoopThread:
+    """Returns the process's event loop thread, starting it on first use"""
+    global _event_loop_thread  # pylint: disable=global-statement
+    with _lock:
+        if _event_loop_thread is None:
+            _event_loop_thread = _EventLoopThread()
+        return _event_loop_thread
+
+
+def _shutdown() -> None:
+    """Closes the shared PDUs and stops the event loop thread when the process exits"""
+    global _event_loop_thread  # pylint: disable=global-statement
+    with _lock:
+        event_loop_thread = _event_loop_thread
+        shared_pdus = list(_shared_pdus.values())
+        _shared_pdus.clear()
+
+    if event_loop_thread is None:
+        return
+
+    # The PDUs are closed on the running loop before it is stopped
+    for pdu in shared_pdus:
+        try:
+            pdu.close()
+        except Exception as exception:  # pylint: disable=broad-exception-caught
+            logger.debug(f"Closing a shared PDU at exit failed: {exception!r}")
+
+    with _lock:
+        _event_loop_thread = None
+    event_loop_thread.stop()
+
+
+def _reset_after_fork() -> None:
+    """Forgets the parent's event loop thread and shared PDUs in a forked child, since the thread
+    doesn't exist in the child and the PDUs' sockets belong to the parent's loop
+    """
+    global _lock, _event_loop_thread, _fork_generation  # pylint: disable=global-statement
+    _lock = threading.Lock()
+    _event_loop_thread = None
+    _shared_pdus.clear()
+    _fork_generation += 1
+
+
+atexit.register(_shutdown)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_after_fork)
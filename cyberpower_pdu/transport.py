@@ -0,0 +1,211 @@
+"""A persistent UDP transport for SNMP requests to a single PDU. Rather than opening a datagram
+endpoint for every request, as puresnmp's default sender does, one connected socket is kept open
+for the lifetime of the PDU connection and any number of requests can be in flight on it. Responses
+are matched to their requests by request ID.
+"""
+
+# Core dependencies
+import asyncio
+from asyncio.events import AbstractEventLoop
+from collections.abc import Callable
+import logging
+import random
+from typing import Any, override
+
+# Package dependencies
+from puresnmp.exc import Timeout  # type: ignore[import-not-found]
+
+# Project dependencies
+from cyberpower_pdu.ber import decode_request_id, replace_request_id
+from cyberpower_pdu.retry import RTTEstimator
+
+
+# This is the package's logger, which can't be imported from the package since the package imports
+# this module
+logger = logging.getLogger("CyberPowerPDU")
+
+
+class SNMPTransport(asyncio.DatagramProtocol):
+    """A long-lived UDP transport to a single SNMP agent. `send` has the signature of a puresnmp
+    sender, so the transport can be passed to a puresnmp `Client` as its `sender`.
+
+    puresnmp derives request IDs from the current time in seconds, so concurrent requests share the
+    same request ID. The transport therefore replaces each request's ID with one from its own
+    counter and restores the original ID in the response.
+
+    If an `RTTEstimator` is given, it measures the agent's round trip time, and the timeout and
+    number of attempts of every request come from it rather than from the request's arguments.
+    """
+
+    def __init__(self, rtt_estimator: RTTEstimator | None = None) -> None:
+        self.__rtt_estimator = rtt_estimator
+        self.__transport: asyncio.DatagramTransport | None = None
+        self.__closed: asyncio.Future[None] | None = None
+
+        # Request IDs are 32 bit signed integers, and starting at a random ID makes it unlikely
+        # that late responses to a previous transport are mistaken for responses to this one
+        self.__next_request_id = random.randrange(2**31)
+        self.__pending: dict[int, asyncio.Future[bytes]] = {}
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def is_open(self) -> bool:
+        """Whether the transport is open"""
+        return self.__transport is not None
+
+    @property
+    def in_flight(self) -> int:
+        """The number of requests waiting for a response"""
+        return len(self.__pending)
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    async def open(self, host: str, port: int = 161) -> None:
+        """Opens the transport to the agent at `host` and `port`"""
+        if self.__transport is not None:
+            raise RuntimeError("The transport is already open")
+
+        loop = asyncio.get_running_loop()
+        self.__closed = loop.create_future()
+        await loop.create_datagram_endpoint(lambda: self, remote_addr=(host, port))
+
+    async def close(self) -> None:
+        """Closes the transport and waits for the socket to be closed. Requests still in flight
+        fail with a `ConnectionError`.
+        """
+        if self.__transport is None or self.__closed is None:
+            return
+
+        self.__transport.close()
+        await self.__closed
+
+    async def send(
+        self,
+        endpoint: Any,
+        packet: bytes,
+        timeout: int = 1,
+        loop: AbstractEventLoop | None = None,
+        retries: int = 10,
+    ) -> bytes:
+        """Sends the encoded SNMP message and returns the encoded response. This is a puresnmp
+        sender, and the transport is connected to a single agent, so `endpoint` and `loop` are only
+        accepted for compatibility. See `request` for the retry behavior.
+        """
+        original_request_id = decode_request_id(packet)
+        response = await self.request(
+            lambda request_id: replace_request_id(packet, request_id), timeout, retries
+        )
+        return replace_request_id(response, original_request_id)
+
+    async def request(
+        self, encode: Callable[[int], bytes], timeout: float = 1, retries: int = 10
+    ) -> bytes:
+        """Sends the SNMP message that `encode` encodes for the given request ID and returns the
+        encoded response. The message is sent up to `retries` times, waiting `timeout` seconds for
+        a response each time, before a puresnmp `Timeout` is raised.
+        """
+        if self.__transport is None:
+            raise ConnectionError("The transport is not open")
+
+        estimator = self.__rtt_estimator
+        if estimator is not None:
+            retries = estimator.policy.max_retries + 1
+            estimator.record_request()
+
+        request_id = self.__next_request_id
+        self.__next_request_id = (self.__next_request_id + 1) % 2**31
+        packet = encode(request_id)
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[bytes] = loop.create_future()
+        self.__pending[request_id] = future
+
+        try:
+            for attempt in range(1, retries + 1):
+                if estimator is not None:
+                    timeout = estimator.get_attempt_timeout(attempt)
+                    if attempt > 1:
+                        estimator.record_retransmission()
+
+                send_time = loop.time()
+                self.__transport.sendto(packet)
+
+                # The future is shielded so that it survives a timeout and a response to an
+                # earlier attempt still completes it
+                try:
+                    response = await asyncio.wait_for(asyncio.shield(future), timeout)
+                    if estimator is not None:
+                        # A response to a resent request may answer any of its attempts, so only
+                        # responses to the first attempt are measured
+                        estimator.record_response(loop.time() - send_time if attempt == 1 else None)
+                    break
+                except TimeoutError:
+                    if attempt == retries:
+                        if estimator is not None:
+                            estimator.record_timeout()
+                        raise Timeout(
+                            f"{timeout} second timeout exceeded on UDP transport"
+                        ) from None
+                    logger.debug(
+                        f"Resending request {request_id}, {retries - attempt} retries left"
+                    )
+
+        finally:
+            del self.__pending[request_id]
+
+        return response
+
+    ############################################################
+    #### Protocol methods ######################################
+    ############################################################
+
+    @override
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.DatagramTransport)
+        self.__transport = transport
+
+    @override
+    def connection_lost(self, exc: Exception | None) -> None:
+        self.__transport = None
+        self.__fail_pending(exc or ConnectionError("The transport was closed"))
+
+        if self.__closed is not None and not self.__closed.done():
+            self.__closed.set_result(None)
+
+    @override
+    def datagram_received(self, data: bytes, addr: tuple[str | Any, int]) -> None:
+        try:
+            request_id = decode_request_id(data)
+        except ValueError as exception:
+            logger.debug(f"Dropping malformed response from {addr}: {exception}")
+            return
+
+        # Responses to requests that already timed out, or duplicates of a response caused by a
+        # resent request, no longer have a pending request
+        future = self.__pending.get(request_id)
+        if future is None or future.done():
+            logger.debug(f"Dropping response to unknown request {request_id}")
+            return
+
+        future.set_result(data)
+
+    @override
+    def error_received(self, exc: Exception) -> None:
+        # The socket is connected to a single agent, so an error, such as an ICMP port unreachable,
+        # applies to every pending request
+        self.__fail_pending(exc)
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    def __fail_pending(self, exception: Exception) -> None:
+        """Fails every pending request with the exception"""
+        for future in self.__pending.values():
+            if not future.done():
+                future.set_exception(exception)
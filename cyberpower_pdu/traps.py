@@ -0,0 +1,259 @@
+"""An SNMP trap receiver for push-based outlet state changes. CyberPower PDUs can be configured to
+send SNMPv2c traps or informs to a trap receiver when an outlet changes state or a load threshold
+is crossed. The receiver decodes them, publishes the outlet changes they report to the PDU that
+sent them, which updates its cache, `watch_outlets` streams, and `OutletPoller`s, and queues them
+for consumers, so that polling can back off to a slow reconciliation interval.
+"""
+
+# Core dependencies
+import asyncio
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Self, override
+
+# Project dependencies
+from cyberpower_pdu import SNMP_COMMUNITY, CyberPowerPDU, OutletChange, logger
+from cyberpower_pdu.ber import (
+    OID,
+    Message,
+    PDUType,
+    TimeTicks,
+    Value,
+    decode_message,
+    encode_message,
+    parse_oid,
+)
+from cyberpower_pdu.oids import OUTLET_STATE_OID
+
+
+SYS_UP_TIME_OID = parse_oid(".1.3.6.1.2.1.1.3.0")
+"""sysUpTime.0, the first varbind of every SNMPv2c trap"""
+
+SNMP_TRAP_OID = parse_oid(".1.3.6.1.6.3.1.1.4.1.0")
+"""snmpTrapOID.0, the second varbind of every SNMPv2c trap, which identifies the trap"""
+
+
+@dataclass(frozen=True)
+class Trap:
+    """An SNMPv2c trap or inform received from a PDU"""
+
+    source: tuple[str, int]
+    """The host and port that sent the trap"""
+
+    timestamp: datetime
+    """When the trap was received, in UTC"""
+
+    trap_oid: OID | None
+    """The value of snmpTrapOID.0, which identifies the kind of trap"""
+
+    uptime: TimeTicks | None
+    """The value of sysUpTime.0, which is the sender's uptime when it sent the trap"""
+
+    varbinds: tuple[tuple[OID, Value], ...]
+    """All of the trap's varbinds, including sysUpTime.0 and snmpTrapOID.0"""
+
+    outlet_changes: tuple[OutletChange, ...]
+    """The outlet states reported by the trap's ePDUOutletStatusOutletState varbinds"""
+
+
+class TrapReceiver(asyncio.DatagramProtocol):
+    """An asyncio UDP receiver of SNMPv2c traps and informs. Informs are acknowledged as SNMPv2c
+    requires. Traps are queued for iteration in a bounded queue that drops the oldest trap when it
+    is full, and the outlet changes they report are published to the PDU registered for the
+    sender's address with `CyberPowerPDU.publish_outlet_changes`.
+
+    Trap OIDs vary between PDU firmware versions, so outlet state changes are recognized by their
+    ePDUOutletStatusOutletState varbinds rather than by the trap OID. Any other trap, such as a
+    load threshold alarm, is still queued with its varbinds.
+
+    ```python
+    receiver = TrapReceiver()
+    receiver.register("192.168.1.132", pdu)
+    await receiver.start(port=162)
+
+    async for trap in receiver:
+        for change in trap.outlet_changes:
+            print(f"Outlet {change.outlet} turned {'on' if change.state else 'off'}")
+    ```
+    """
+
+    def __init__(self, community: str = SNMP_COMMUNITY, max_queue_size: int = 256) -> None:
+        """Initializes the receiver. Traps whose community is not `community` are dropped."""
+        self.__community = community.encode()
+        self.__max_queue_size = max_queue_size
+        self.__pdus: dict[str, CyberPowerPDU] = {}
+
+        # `None` marks the end of the traps once the receiver is closed
+        self.__queue: asyncio.Queue[Trap | None] = asyncio.Queue(max_queue_size + 1)
+        self.__transport: asyncio.DatagramTransport | None = None
+
+        self.__traps_received = 0
+        self.__traps_dropped = 0
+
+    ############################################################
+    #### Properties ############################################
+    ############################################################
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """The host and port that the receiver is listening on"""
+        if self.__transport is None:
+            raise RuntimeError("The receiver must be started before it has an address")
+
+        host, port = self.__transport.get_extra_info("sockname")[:2]
+        return host, port
+
+    @property
+    def traps_received(self) -> int:
+        """The number of valid traps and informs received"""
+        return self.__traps_received
+
+    @property
+    def traps_dropped(self) -> int:
+        """The number of traps dropped from the queue because it was full"""
+        return self.__traps_dropped
+
+    ############################################################
+    #### Public methods ########################################
+    ############################################################
+
+    def register(self, host: str, pdu: CyberPowerPDU) -> None:
+        """Registers the PDU whose traps are sent from `host`, so that the outlet changes the traps
+        report are published to the PDU
+        """
+        self.__pdus[host] = pdu
+
+    async def start(self, host: str = "0.0.0.0", port: int = 162) -> None:
+        """Starts listening on the host and port. Port 162 is the standard SNMP trap port and
+        usually needs elevated privileges, and a port of 0 selects a free port.
+        """
+        loop = asyncio.get_running_loop()
+        await loop.create_datagram_endpoint(lambda: self, local_addr=(host, port))
+        logger.debug(f"SNMP trap receiver listening on {self.address}")
+
+    async def close(self) -> None:
+        """Stops listening. Iteration ends once the queued traps are consumed."""
+        if self.__transport is not None:
+            self.__transport.close()
+            self.__transport = None
+            self.__queue.put_nowait(None)
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> Trap:
+        trap = await self.__queue.get()
+        if trap is None:
+            raise StopAsyncIteration
+
+        return trap
+
+    ############################################################
+    #### Protocol methods ######################################
+    ############################################################
+
+    @override
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        assert isinstance(transport, asyncio.DatagramTransport)
+        self.__transport = transport
+
+    @override
+    def datagram_received(self, data: bytes, addr: tuple[str | int, int]) -> None:
+        try:
+            message = decode_message(data)
+        except ValueError as exception:
+            logger.debug(f"Dropping malformed trap from {addr}: {exception}")
+            return
+
+        if message.community != self.__community:
+            logger.debug(f"Dropping trap from {addr} with an unknown community")
+            return
+
+        if message.pdu_type not in (PDUType.TRAP, PDUType.INFORM_REQUEST):
+            logger.debug(f"Dropping unexpected {message.pdu_type.name} from {addr}")
+            return
+
+        self.__traps_received += 1
+        source = (str(addr[0]), int(addr[1]))
+
+        # Informs are retransmitted by the sender until they are acknowledged with a response
+        # holding the same request ID and varbinds
+        if message.pdu_type == PDUType.INFORM_REQUEST and self.__transport is not None:
+            response = Message(
+                community=message.community,
+                pdu_type=PDUType.RESPONSE,
+                request_id=message.request_id,
+                varbinds=message.varbinds,
+            )
+            self.__transport.sendto(encode_message(response), addr)
+
+        trap = self.__parse_trap(source, message)
+        self.__publish_changes(source[0], trap)
+
+        if self.__queue.qsize() >= self.__max_queue_size:
+            self.__queue.get_nowait()
+            self.__traps_dropped += 1
+        self.__queue.put_nowait(trap)
+
+    ############################################################
+    #### Private methods #######################################
+    ############################################################
+
+    @staticmethod
+    def __parse_trap(source: tuple[str, int], message: Message) -> Trap:
+        """Converts a trap message to a `Trap`"""
+        timestamp = datetime.now(timezone.utc)
+        varbinds = dict(message.varbinds)
+
+        uptime = varbinds.get(SYS_UP_TIME_OID)
+        trap_oid = varbinds.get(SNMP_TRAP_OID)
+
+        outlet_changes = []
+        for oid, value in message.varbinds:
+            if len(oid) == len(OUTLET_STATE_OID) + 1 and oid[:-1] == OUTLET_STATE_OID:
+                # ePDUOutletStatusOutletState is 1 for on and 2 for off
+                if value in (1, 2):
+                    outlet_changes.append(
+                        OutletChange(outlet=oid[-1], state=value == 1, timestamp=timestamp)
+                    )
+
+        return Trap(
+            source=source,
+            timestamp=timestamp,
+            trap_oid=trap_oid if isinstance(trap_oid, tuple) else None,
+            uptime=uptime if isinstance(uptime, TimeTicks) else None,
+            varbinds=message.varbinds,
+            outlet_changes=tuple(outlet_changes),
+        )
+
+    def __publish_changes(self, host: str, trap: Trap) -> None:
+        """Publishes the trap's outlet changes to the PDU registered for the host"""
+        pdu = self.__pdus.get(host)
+        if pdu is not None and trap.outlet_changes:
+            pdu.publish_outlet_changes(trap.outlet_changes)
+
+
+def encode_trap(
+    trap_oid: OID,
+    varbinds: Sequence[tuple[OID, Value]] = (),
+    uptime: int = 0,
+    community: str = SNMP_COMMUNITY,
+    request_id: int = 0,
+    inform: bool = False,
+) -> bytes:
+    """Encodes an SNMPv2c trap, or an inform if `inform` is `True`, the way a PDU sends it. This
+    allows traps to be injected into a `TrapReceiver` without a PDU.
+    """
+    return encode_message(
+        Message(
+            community=community.encode(),
+            pdu_type=PDUType.INFORM_REQUEST if inform else PDUType.TRAP,
+            request_id=request_id,
+            varbinds=(
+                (SYS_UP_TIME_OID, TimeTicks(uptime)),
+                (SNMP_TRAP_OID, trap_oid),
+                *varbinds,
+            ),
+        )
+    )